@@ -0,0 +1,270 @@
+import os
+import glob
+import shutil
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
+
+from irekua_organisms.bulk.base import get_id
+from irekua_organisms.utils.iterables import chunked
+from irekua_organisms import statistics
+
+
+DEFAULT_CHUNK_SIZE = 10000
+COOCCURRENCE_BLOCK_BYTES = 64 * 1024 * 1024
+# float32 counts are exact up to 2 ** 24, the most a block can add.
+COOCCURRENCE_MAX_BLOCK_SIZE = 2 ** 24
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+HOURS_PER_DAY = 24
+DAYS_PER_YEAR = 366
+
+
+CaptureArrays = namedtuple('CaptureArrays', [
+    'ids',
+    'timestamps',
+    'organism_ids',
+    'organism_type_ids',
+    'capture_type_ids',
+    'device_ids',
+])
+
+DeviceRates = namedtuple('DeviceRates', [
+    'device_ids',
+    'counts',
+    'first_timestamps',
+    'last_timestamps',
+    'rates',
+])
+
+CAPTURE_FIELDS = (
+    'id',
+    'created_on',
+    'organism_id',
+    'organism__organism_type_id',
+    'organism_capture_type_id',
+    'sampling_event_device_id',
+)
+
+
+def empty_capture_arrays():
+    return CaptureArrays(*(np.empty(0, dtype=np.int64) for unused in CaptureArrays._fields))
+
+
+def load_capture_arrays(collection, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Load the captures of a collection into NumPy arrays.
+
+    Rows are streamed with values_list and converted a chunk at a time.
+    Timestamps are seconds since the epoch (UTC) of the capture creation.
+    """
+    from irekua_organisms.models import OrganismCapture
+
+    rows = (
+        OrganismCapture.objects
+        .filter(collection=get_id(collection))
+        .order_by()
+        .values_list(*CAPTURE_FIELDS)
+        .iterator(chunk_size=chunk_size))
+
+    columns = [[] for unused in CaptureArrays._fields]
+    for chunk in chunked(rows, chunk_size):
+        ids, created_on, organisms, organism_types, capture_types, devices = zip(*chunk)
+
+        columns[0].append(np.array(ids, dtype=np.int64))
+        columns[1].append(np.fromiter(
+            (value.timestamp() for value in created_on),
+            dtype=np.float64,
+            count=len(created_on)).astype(np.int64))
+        columns[2].append(np.array(organisms, dtype=np.int64))
+        columns[3].append(np.array(organism_types, dtype=np.int64))
+        columns[4].append(np.array(capture_types, dtype=np.int64))
+        columns[5].append(np.array(devices, dtype=np.int64))
+
+    if not columns[0]:
+        return empty_capture_arrays()
+
+    return CaptureArrays(*(np.concatenate(parts) for parts in columns))
+
+
+def get_collection_version(collection):
+    """Return a key that changes whenever the captures of a collection may have.
+
+    It combines the change version of the collection, increased with
+    every change recorded for its organisms and captures, with the
+    capture count. Both are read from the statistics row.
+    """
+    summary = statistics.get_collection_statistics(get_id(collection))
+    return '{}-{}'.format(summary.change_version, summary.capture_count)
+
+
+def get_cache_dir():
+    return getattr(settings, 'IREKUA_ORGANISMS_ANALYTICS_CACHE_DIR', None)
+
+
+def save_capture_arrays(arrays, path):
+    # Write to a temporary directory and rename it so readers never see
+    # a partially written cache entry.
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent)
+
+    for field, array in zip(CaptureArrays._fields, arrays):
+        np.save(os.path.join(tmp, field + '.npy'), array)
+
+    try:
+        os.rename(tmp, path)
+    except OSError:
+        # Another process stored the same version first.
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def read_capture_arrays(path, mmap_mode='r'):
+    return CaptureArrays(*(
+        np.load(os.path.join(path, field + '.npy'), mmap_mode=mmap_mode)
+        for field in CaptureArrays._fields))
+
+
+def get_capture_arrays(collection, cache_dir=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return the capture arrays of a collection, using the .npy cache if enabled.
+
+    The cache lives in cache_dir, or the IREKUA_ORGANISMS_ANALYTICS_CACHE_DIR
+    setting, with one directory of memory mapped .npy files per collection
+    version. Older versions of the collection are removed when a new one
+    is stored.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+
+    if cache_dir is None:
+        return load_capture_arrays(collection, chunk_size=chunk_size)
+
+    collection_id = get_id(collection)
+    prefix = os.path.join(cache_dir, 'captures-{}-'.format(collection_id))
+    path = prefix + get_collection_version(collection_id)
+
+    if not os.path.isdir(path):
+        arrays = load_capture_arrays(collection_id, chunk_size=chunk_size)
+        save_capture_arrays(arrays, path)
+
+        for stale in glob.glob(prefix + '*'):
+            if stale != path:
+                shutil.rmtree(stale, ignore_errors=True)
+
+    return read_capture_arrays(path)
+
+
+def select(arrays, organism_type=None, capture_type=None, device=None):
+    mask = np.ones(len(arrays.ids), dtype=bool)
+
+    if organism_type is not None:
+        mask &= arrays.organism_type_ids == get_id(organism_type)
+    if capture_type is not None:
+        mask &= arrays.capture_type_ids == get_id(capture_type)
+    if device is not None:
+        mask &= arrays.device_ids == get_id(device)
+
+    return CaptureArrays(*(array[mask] for array in arrays))
+
+
+def get_hours(arrays, utc_offset=0):
+    return ((arrays.timestamps + utc_offset) // SECONDS_PER_HOUR) % HOURS_PER_DAY
+
+
+def get_days_of_year(arrays, utc_offset=0):
+    days = (arrays.timestamps + utc_offset).astype('datetime64[s]').astype('datetime64[D]')
+    return (days - days.astype('datetime64[Y]')).astype(np.int64)
+
+
+def hour_of_day_histogram(arrays, utc_offset=0):
+    """Count captures per hour of the day.
+
+    utc_offset, in seconds, shifts timestamps to local time.
+    """
+    return np.bincount(get_hours(arrays, utc_offset), minlength=HOURS_PER_DAY)
+
+
+def day_of_year_histogram(arrays, utc_offset=0):
+    """Count captures per day of the year, with January 1st at index 0."""
+    return np.bincount(get_days_of_year(arrays, utc_offset), minlength=DAYS_PER_YEAR)
+
+
+def hour_of_day_by_organism_type(arrays, utc_offset=0):
+    """Return organism type ids and a (types, 24) matrix of capture counts."""
+    type_ids, type_index = np.unique(arrays.organism_type_ids, return_inverse=True)
+    cells = type_index * HOURS_PER_DAY + get_hours(arrays, utc_offset)
+    counts = np.bincount(cells, minlength=len(type_ids) * HOURS_PER_DAY)
+    return type_ids, counts.reshape(len(type_ids), HOURS_PER_DAY)
+
+
+def device_detection_rates(arrays):
+    """Return capture counts and captures per day for each device.
+
+    Rates are taken over the span between the first and last capture of
+    each device, counting at least one day.
+    """
+    if not len(arrays.ids):
+        empty = np.empty(0, dtype=np.int64)
+        return DeviceRates(empty, empty, empty, empty, np.empty(0, dtype=np.float64))
+
+    order = np.argsort(arrays.device_ids, kind='stable')
+    devices = arrays.device_ids[order]
+    timestamps = arrays.timestamps[order]
+
+    starts = np.flatnonzero(np.r_[True, devices[1:] != devices[:-1]])
+    counts = np.diff(np.r_[starts, len(devices)])
+    first = np.minimum.reduceat(timestamps, starts)
+    last = np.maximum.reduceat(timestamps, starts)
+    days = np.maximum((last - first) / SECONDS_PER_DAY, 1.0)
+
+    return DeviceRates(devices[starts], counts, first, last, counts / days)
+
+
+def get_cooccurrence_block_size(num_types):
+    row_bytes = max(num_types, 1) * np.dtype(np.float32).itemsize
+    return int(min(
+        max(COOCCURRENCE_BLOCK_BYTES // row_bytes, 1),
+        COOCCURRENCE_MAX_BLOCK_SIZE))
+
+
+def cooccurrence_matrix(arrays, window=None):
+    """Count how often pairs of organism types are captured together.
+
+    Captures are grouped by sampling event device and, when window is
+    given, by time windows of that many seconds. Entry (i, j) is the
+    number of groups containing both types, and the diagonal the number
+    of groups containing each type. Returns the organism type ids and
+    the matrix.
+    """
+    type_ids, type_index = np.unique(arrays.organism_type_ids, return_inverse=True)
+    num_types = len(type_ids)
+
+    if window is None:
+        unused, group_index = np.unique(arrays.device_ids, return_inverse=True)
+    else:
+        keys = np.stack([arrays.device_ids, arrays.timestamps // window], axis=1)
+        unused, group_index = np.unique(keys, axis=0, return_inverse=True)
+
+    # Each (group, type) pair once, sorted by group.
+    pairs = np.unique(group_index.astype(np.int64) * num_types + type_index)
+    groups = pairs // num_types if num_types else pairs
+    types = pairs % num_types if num_types else pairs
+
+    matrix = np.zeros((num_types, num_types), dtype=np.int64)
+    num_groups = int(groups[-1]) + 1 if len(groups) else 0
+
+    # The incidence matrix is built in blocks of groups sized so that a
+    # block stays within COOCCURRENCE_BLOCK_BYTES whatever the number of
+    # types.
+    block_size = get_cooccurrence_block_size(num_types)
+    for block_start in range(0, num_groups, block_size):
+        block_end = min(block_start + block_size, num_groups)
+        start, end = np.searchsorted(groups, [block_start, block_end])
+
+        incidence = np.zeros((block_end - block_start, num_types), dtype=np.float32)
+        incidence[groups[start:end] - block_start, types[start:end]] = 1
+        matrix += (incidence.T @ incidence).astype(np.int64)
+
+    return type_ids, matrix
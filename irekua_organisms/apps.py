@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class IrekuaOrganismsConfig(AppConfig):
     name = 'irekua_organisms'
     verbose_name = 'irekua-organisms'
+
+    def ready(self):
+        import irekua_organisms.signals  # noqa: F401
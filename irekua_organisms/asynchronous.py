@@ -0,0 +1,123 @@
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from irekua_organisms.bulk import validate_organism_records
+from irekua_organisms.bulk import validate_organism_capture_records
+from irekua_organisms.bulk.base import get_id
+from irekua_organisms.snapshots import get_config_snapshot
+from irekua_organisms.snapshots import get_config_snapshots
+
+
+DEFAULT_ASYNC_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the thread pool shared by all async organism operations.
+
+    The pool size, set by IREKUA_ORGANISMS_ASYNC_WORKERS, bounds the
+    number of database connections used by async callers. Each worker
+    thread keeps its own connection between calls only when CONN_MAX_AGE
+    is greater than 0; with the default of 0 the connection is closed
+    after every call and opened again on the next one.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(
+                    settings,
+                    'IREKUA_ORGANISMS_ASYNC_WORKERS',
+                    DEFAULT_ASYNC_WORKERS),
+                thread_name_prefix='irekua-organisms')
+
+    return _executor
+
+
+def shutdown_executor(wait=True):
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def call_with_connection(func, *args, **kwargs):
+    # Same connection housekeeping Django does around a request, so
+    # CONN_MAX_AGE is honoured and broken connections are replaced.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func, *args, **kwargs):
+    """Run a synchronous, database bound callable in the worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(),
+        partial(call_with_connection, func, *args, **kwargs))
+
+
+def list_organisms(collection, limit=None, **filters):
+    from irekua_organisms.models import Organism
+
+    queryset = (
+        Organism.objects
+        .with_context()
+        .filter(collection=get_id(collection), **filters))
+
+    if limit is not None:
+        queryset = queryset[:limit]
+
+    return list(queryset)
+
+
+def list_organism_captures(collection, limit=None, **filters):
+    from irekua_organisms.models import OrganismCapture
+
+    queryset = (
+        OrganismCapture.objects
+        .with_context()
+        .filter(collection=get_id(collection), **filters))
+
+    if limit is not None:
+        queryset = queryset[:limit]
+
+    return list(queryset)
+
+
+async def aget_organisms(collection, limit=None, **filters):
+    return await run_sync(list_organisms, collection, limit=limit, **filters)
+
+
+async def aget_organism_captures(collection, limit=None, **filters):
+    return await run_sync(list_organism_captures, collection, limit=limit, **filters)
+
+
+async def avalidate_organisms(records, **kwargs):
+    return await run_sync(validate_organism_records, list(records), **kwargs)
+
+
+async def avalidate_organism_captures(records, **kwargs):
+    return await run_sync(validate_organism_capture_records, list(records), **kwargs)
+
+
+async def aget_config_snapshot(collection_type):
+    return await run_sync(get_config_snapshot, get_id(collection_type))
+
+
+async def aget_config_snapshots(collection_types):
+    return await run_sync(
+        get_config_snapshots,
+        [get_id(collection_type) for collection_type in collection_types])
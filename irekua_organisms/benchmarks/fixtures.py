@@ -0,0 +1,186 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from irekua_database.models import DeviceType
+from irekua_database.models import Item
+from irekua_database.models import SamplingEventDevice
+from irekua_database.models import Term
+
+from irekua_organisms.bulk.base import insert_m2m
+from irekua_organisms.utils.iterables import chunked
+
+
+BATCH_SIZE = 5000
+NAME_PREFIX = 'benchmark'
+
+IDENTIFICATION_INFO_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'scientific_name': {'type': 'string'},
+        'confidence': {'type': 'number', 'minimum': 0, 'maximum': 1},
+    },
+    'required': ['scientific_name'],
+}
+
+METADATA_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'count': {'type': 'integer', 'minimum': 0},
+        'notes': {'type': 'string'},
+    },
+}
+
+
+class BenchmarkData:
+    """Synthetic organism data built on top of existing irekua data.
+
+    An existing collection with at least one sampling event device is
+    required, since building collections, devices and items falls
+    outside of this app. All rows are expected to be created inside a
+    transaction that is rolled back once the benchmark finishes.
+    """
+
+    def __init__(self, collection=None, sampling_event_device=None):
+        self.collection_id = collection
+        self.sampling_event_device_id = sampling_event_device
+        self.size = 0
+
+    def setup(self):
+        from irekua_organisms.models import OrganismType
+        from irekua_organisms.models import OrganismCaptureType
+        from irekua_organisms.models import CollectionTypeOrganismConfig
+        from irekua_organisms.models import CollectionTypeOrganismType
+        from irekua_organisms.models import CollectionTypeOrganismCaptureType
+
+        devices = SamplingEventDevice.objects.select_related(
+            'sampling_event__collection__collection_type')
+        if self.collection_id is not None:
+            devices = devices.filter(sampling_event__collection=self.collection_id)
+        if self.sampling_event_device_id is not None:
+            devices = devices.filter(pk=self.sampling_event_device_id)
+
+        self.sampling_event_device = devices.first()
+        if self.sampling_event_device is None:
+            raise ValueError(
+                'Benchmarks need a collection with at least one sampling '
+                'event device')
+
+        self.collection = self.sampling_event_device.sampling_event.collection
+
+        self.term = Term.objects.select_related('term_type').first()
+        self.item = Item.objects.first()
+
+        self.organism_type = OrganismType.objects.create(
+            name='{} organism type'.format(NAME_PREFIX),
+            description='Organism type used in benchmarks',
+            identification_info_schema=IDENTIFICATION_INFO_SCHEMA)
+        self.capture_type = OrganismCaptureType.objects.create(
+            name='{} capture type'.format(NAME_PREFIX),
+            description='Organism capture type used in benchmarks',
+            organism_type=self.organism_type,
+            device_type=DeviceType.objects.first())
+
+        if self.term is not None:
+            self.organism_type.term_types.add(self.term.term_type)
+            self.capture_type.term_types.add(self.term.term_type)
+
+        self.config, unused = CollectionTypeOrganismConfig.objects.update_or_create(
+            collection_type=self.collection.collection_type,
+            defaults={'use_organisms': True})
+        self.type_link = CollectionTypeOrganismType.objects.create(
+            collection_type_organism_config=self.config,
+            organism_type=self.organism_type,
+            metadata_schema=METADATA_SCHEMA)
+        self.capture_type_link = CollectionTypeOrganismCaptureType.objects.create(
+            collection_type_organism_config=self.config,
+            organism_capture_type=self.capture_type,
+            metadata_schema=METADATA_SCHEMA)
+
+        self.grow(1)
+
+    def build_organism(self, index):
+        from irekua_organisms.models import Organism
+
+        return Organism(
+            collection=self.collection,
+            organism_type=self.organism_type,
+            remarks='Benchmark organism {}'.format(index),
+            identification_info={
+                'scientific_name': 'Species {}'.format(index % 100),
+                'confidence': 0.9,
+            },
+            additional_metadata={'count': index % 10})
+
+    def build_capture(self, organism_id, index):
+        from irekua_organisms.models import OrganismCapture
+
+        return OrganismCapture(
+            organism_id=organism_id,
+            organism_capture_type=self.capture_type,
+            sampling_event_device=self.sampling_event_device,
+            collection=self.collection,
+            collection_type=self.collection.collection_type,
+            additional_metadata={'count': index % 10})
+
+    def link_relations(self, model, ids):
+        if self.term is not None:
+            insert_m2m(
+                model._meta.get_field('labels'),
+                [(pk, self.term.pk) for pk in ids],
+                BATCH_SIZE,
+                DEFAULT_DB_ALIAS)
+
+        if self.item is not None:
+            insert_m2m(
+                model._meta.get_field('items'),
+                [(pk, self.item.pk) for pk in ids],
+                BATCH_SIZE,
+                DEFAULT_DB_ALIAS)
+
+    def grow(self, size):
+        """Add organisms, each with one capture, until there are size of them."""
+        from irekua_organisms.models import Organism
+        from irekua_organisms.models import OrganismCapture
+
+        if size <= self.size:
+            return
+
+        organisms = (self.build_organism(index) for index in range(self.size, size))
+        for batch in chunked(organisms, BATCH_SIZE):
+            Organism.objects.bulk_create(batch)
+
+        new_organisms = (
+            Organism.objects
+            .filter(organism_type=self.organism_type, organismcapture__isnull=True)
+            .order_by('id')
+            .values_list('id', flat=True))
+        for batch in chunked(new_organisms.iterator(), BATCH_SIZE):
+            OrganismCapture.objects.bulk_create([
+                self.build_capture(organism_id, index)
+                for index, organism_id in enumerate(batch)])
+
+            self.link_relations(Organism, batch)
+            self.link_relations(
+                OrganismCapture,
+                OrganismCapture.objects
+                .filter(organism__in=batch)
+                .values_list('id', flat=True))
+
+        self.size = size
+
+    def sample_organism(self):
+        from irekua_organisms.models import Organism
+
+        return (
+            Organism.objects
+            .with_context()
+            .filter(organism_type=self.organism_type)
+            .first())
+
+    def sample_capture(self):
+        from irekua_organisms.models import OrganismCapture
+
+        return (
+            OrganismCapture.objects
+            .with_context()
+            .filter(organism_capture_type=self.capture_type)
+            .first())
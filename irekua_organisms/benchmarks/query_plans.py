@@ -0,0 +1,146 @@
+from django.db import connection
+from django.db import transaction
+
+
+ORGANISM_INDEXES = (
+    'organism_created_id_idx',
+    'organism_col_created_idx',
+    'organism_col_type_created_idx',
+    'organism_id_info_gin_idx',
+    'organism_metadata_gin_idx',
+    'capture_created_id_idx',
+    'capture_col_created_idx',
+    'capture_col_type_created_idx',
+    'capture_type_created_idx',
+    'capture_device_created_idx',
+    'capture_metadata_gin_idx',
+)
+
+PLANNER_INDEX_SETTINGS = (
+    'enable_indexscan',
+    'enable_indexonlyscan',
+    'enable_bitmapscan',
+)
+
+PAGE_SIZE = 50
+
+
+class Rollback(Exception):
+    pass
+
+
+def get_sample_values():
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import OrganismCapture
+
+    organism = Organism.objects.order_by().values(
+        'collection_id',
+        'organism_type_id',
+        'identification_info').first() or {}
+    capture = OrganismCapture.objects.order_by().values(
+        'organism_capture_type_id',
+        'sampling_event_device_id',
+        'additional_metadata').first() or {}
+
+    return dict(organism, **capture)
+
+
+def first_item(data):
+    for key, value in (data or {}).items():
+        return {key: value}
+
+    return {}
+
+
+def get_hot_path_queries(values=None):
+    """Return the queries behind the organism dashboards and listings."""
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import OrganismCapture
+
+    if values is None:
+        values = get_sample_values()
+
+    return [
+        (
+            'organisms in collection by type, newest first',
+            Organism.objects.filter(
+                collection=values.get('collection_id'),
+                organism_type=values.get('organism_type_id'))[:PAGE_SIZE]
+        ),
+        (
+            'organisms in collection, newest first',
+            Organism.objects.filter(
+                collection=values.get('collection_id'))[:PAGE_SIZE]
+        ),
+        (
+            'organisms by identification info containment',
+            Organism.objects.filter(
+                identification_info__contains=first_item(
+                    values.get('identification_info')))
+        ),
+        (
+            'captures in collection, newest first',
+            OrganismCapture.objects.filter(
+                collection=values.get('collection_id'))[:PAGE_SIZE]
+        ),
+        (
+            'captures by capture type, newest first',
+            OrganismCapture.objects.filter(
+                organism_capture_type=values.get('organism_capture_type_id'))[:PAGE_SIZE]
+        ),
+        (
+            'captures by device, newest first',
+            OrganismCapture.objects.filter(
+                sampling_event_device=values.get('sampling_event_device_id'))[:PAGE_SIZE]
+        ),
+        (
+            'captures by additional metadata containment',
+            OrganismCapture.objects.filter(
+                additional_metadata__contains=first_item(
+                    values.get('additional_metadata')))
+        ),
+    ]
+
+
+def explain_queries(queries, analyze=False):
+    options = {'analyze': True} if analyze else {}
+    return [
+        (name, queryset.explain(**options))
+        for name, queryset in queries]
+
+
+def explain_without_indexes(
+        queries,
+        indexes=ORGANISM_INDEXES,
+        analyze=False,
+        drop_indexes=False):
+    """Explain queries as if indexes did not exist.
+
+    By default index scans are disabled with planner settings local to a
+    transaction, which takes no locks but disables every index, primary
+    keys included. With drop_indexes, only the given indexes are dropped
+    inside a transaction that is always rolled back. That holds ACCESS
+    EXCLUSIVE locks on the organism tables, blocking all reads and
+    writes until the rollback, so it must only be used on a scratch
+    database. Both need PostgreSQL.
+    """
+    plans = []
+
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if drop_indexes:
+                    for index in indexes:
+                        cursor.execute(
+                            'DROP INDEX IF EXISTS {}'.format(
+                                connection.ops.quote_name(index)))
+                else:
+                    for setting in PLANNER_INDEX_SETTINGS:
+                        cursor.execute('SET LOCAL {} = off'.format(setting))
+
+            plans = explain_queries(queries, analyze=analyze)
+            raise Rollback
+    except Rollback:
+        pass
+
+    return plans
@@ -0,0 +1,125 @@
+import json
+import time
+import tracemalloc
+
+from django.db import connection
+from django.core.exceptions import ValidationError
+from django.test.utils import CaptureQueriesContext
+
+
+DEFAULT_THRESHOLD = 0.25
+
+
+class Workload:
+    def __init__(
+            self,
+            name,
+            func,
+            size=None,
+            iterations=1,
+            constant_queries=False,
+            ignore_validation_errors=False):
+        self.name = name
+        self.func = func
+        self.size = size
+        self.iterations = iterations
+        self.constant_queries = constant_queries
+        self.ignore_validation_errors = ignore_validation_errors
+
+    @property
+    def key(self):
+        if self.size is None:
+            return self.name
+
+        return '{}[{}]'.format(self.name, self.size)
+
+    def __call__(self):
+        try:
+            self.func()
+        except ValidationError:
+            if not self.ignore_validation_errors:
+                raise
+
+
+def measure(workload, repeat=3):
+    """Measure queries, wall time and peak memory of a single workload call.
+
+    Wall time is the best of several runs of the configured number of
+    iterations, divided by the iterations. Memory is traced on a separate
+    run so tracing does not inflate the timings.
+    """
+    workload()
+
+    with CaptureQueriesContext(connection) as context:
+        workload()
+    queries = len(context.captured_queries)
+
+    timings = []
+    for unused in range(repeat):
+        start = time.perf_counter()
+        for iteration in range(workload.iterations):
+            workload()
+        timings.append((time.perf_counter() - start) / workload.iterations)
+
+    tracemalloc.start()
+    try:
+        workload()
+        unused, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'queries': queries,
+        'seconds': min(timings),
+        'peak_memory': peak,
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path) as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, vendor, results):
+    baseline = load_baseline(path)
+    baseline[vendor] = results
+
+    with open(path, 'w') as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """List the tracked metrics that regressed against the baseline.
+
+    Any increase in the number of queries is a regression. Wall time and
+    peak memory regress when they exceed the baseline by more than the
+    threshold fraction.
+    """
+    regressions = []
+
+    for key, result in sorted(results.items()):
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+
+        if result['queries'] > reference['queries']:
+            regressions.append((key, 'queries', reference['queries'], result['queries']))
+
+        for metric in ('seconds', 'peak_memory'):
+            if result[metric] > reference[metric] * (1 + threshold):
+                regressions.append((key, metric, reference[metric], result[metric]))
+
+    return regressions
+
+
+def check_constant_queries(workloads, results):
+    """List workloads whose query count grows with the result size."""
+    counts = {}
+    for workload in workloads:
+        if workload.constant_queries:
+            counts.setdefault(workload.name, set()).add(results[workload.key]['queries'])
+
+    return sorted(name for name, values in counts.items() if len(values) > 1)
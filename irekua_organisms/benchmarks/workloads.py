@@ -0,0 +1,131 @@
+from functools import partial
+
+from irekua_organisms.export import export
+from irekua_organisms.export import ORGANISMS
+from irekua_organisms.export import ORGANISM_CAPTURES
+from irekua_organisms.benchmarks.runner import Workload
+
+
+DEFAULT_ITERATIONS = 100
+DEFAULT_SIZES = (1000, 10000)
+TERMS_PER_RECORD = 20
+
+
+class NullWriter:
+    def write(self, data):
+        return len(data)
+
+
+def list_organisms(data, size):
+    from irekua_organisms.models import Organism
+
+    organisms = (
+        Organism.objects
+        .with_context()
+        .filter(collection=data.collection)[:size])
+
+    for organism in organisms:
+        str(organism)
+        list(organism.labels.all())
+        list(organism.items.all())
+
+
+def list_captures(data, size):
+    from irekua_organisms.models import OrganismCapture
+
+    captures = (
+        OrganismCapture.objects
+        .with_context()
+        .filter(organism_capture_type=data.capture_type)[:size])
+
+    for capture in captures:
+        str(capture)
+        list(capture.labels.all())
+        list(capture.items.all())
+
+
+def clean_cold(instance):
+    # Forget the state of the last validation so clean() validates again.
+    instance.schema_version = ''
+    instance.validation_fingerprint = ''
+    instance.clean()
+
+
+def export_rows(data, kind):
+    export(NullWriter(), kind=kind, collections=[data.collection.pk])
+
+
+def get_write_path_workloads(data, iterations=DEFAULT_ITERATIONS):
+    """Workloads for the code that runs on every organism write.
+
+    clean() is measured twice: cold, validating the record in full, and
+    warm, where the stored validation state lets it skip validation.
+    """
+    organism = data.sample_organism()
+    capture = data.sample_capture()
+
+    workloads = [
+        Workload(
+            'organism.clean.cold',
+            partial(clean_cold, organism),
+            iterations=iterations),
+        Workload('organism.clean.warm', organism.clean, iterations=iterations),
+        Workload(
+            'organism_capture.clean.cold',
+            partial(clean_cold, capture),
+            iterations=iterations),
+        Workload('organism_capture.clean.warm', capture.clean, iterations=iterations),
+        Workload(
+            'collection_type_organism_capture_type.clean',
+            data.capture_type_link.clean,
+            iterations=iterations,
+            ignore_validation_errors=True),
+        Workload(
+            'config.validate_and_get_organism_type',
+            partial(data.config.validate_and_get_organism_type, data.organism_type),
+            iterations=iterations),
+        Workload(
+            'config.validate_and_get_organism_capture_type',
+            partial(data.config.validate_and_get_organism_capture_type, data.capture_type),
+            iterations=iterations),
+    ]
+
+    if data.term is not None:
+        workloads.extend([
+            Workload(
+                'organism_type.validate_term',
+                partial(data.organism_type.validate_term, data.term),
+                iterations=iterations),
+            Workload(
+                'organism_capture_type.validate_terms',
+                partial(
+                    data.capture_type.validate_terms,
+                    [data.term.pk] * TERMS_PER_RECORD),
+                iterations=iterations),
+        ])
+
+    return workloads
+
+
+def get_sized_workloads(data, size):
+    """Workloads whose cost depends on the number of stored rows."""
+    return [
+        Workload(
+            'organisms.list',
+            partial(list_organisms, data, size),
+            size=size,
+            constant_queries=True),
+        Workload(
+            'organism_captures.list',
+            partial(list_captures, data, size),
+            size=size,
+            constant_queries=True),
+        Workload(
+            'organisms.export',
+            partial(export_rows, data, ORGANISMS),
+            size=size),
+        Workload(
+            'organism_captures.export',
+            partial(export_rows, data, ORGANISM_CAPTURES),
+            size=size),
+    ]
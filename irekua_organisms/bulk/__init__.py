@@ -0,0 +1,16 @@
+from irekua_organisms.bulk.base import BulkIngestResult
+from irekua_organisms.bulk.organisms import bulk_ingest_organisms
+from irekua_organisms.bulk.organisms import validate_organism_records
+from irekua_organisms.bulk.captures import bulk_ingest_organism_captures
+from irekua_organisms.bulk.captures import validate_organism_capture_records
+from irekua_organisms.bulk.members import bulk_ingest_organism_members
+
+
+__all__ = [
+    'BulkIngestResult',
+    'bulk_ingest_organisms',
+    'bulk_ingest_organism_captures',
+    'bulk_ingest_organism_members',
+    'validate_organism_records',
+    'validate_organism_capture_records',
+]
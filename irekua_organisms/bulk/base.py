@@ -0,0 +1,207 @@
+from django.db import connections
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models import Term
+from irekua_database.models import Item
+
+from irekua_organisms.utils import get_error_messages
+from irekua_organisms.utils.iterables import chunked
+from irekua_organisms.utils.deferral import deferred_signals
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def get_id(value):
+    return getattr(value, 'pk', value)
+
+
+def get_ids(values):
+    if not values:
+        return []
+
+    return [get_id(value) for value in values]
+
+
+def can_return_bulk_ids(using):
+    return connections[using].features.can_return_rows_from_bulk_insert
+
+
+class BulkIngestResult:
+    def __init__(self):
+        self.created = []
+        self.errors = {}
+
+    def __repr__(self):
+        return '<BulkIngestResult created={} errors={}>'.format(
+            len(self.created),
+            len(self.errors))
+
+    @property
+    def has_errors(self):
+        return bool(self.errors)
+
+    def add_error(self, index, error):
+        self.add_messages(index, get_error_messages(error))
+
+    def add_messages(self, index, messages):
+        errors = self.errors.setdefault(index, {})
+        for field, field_messages in messages.items():
+            errors.setdefault(field, []).extend(field_messages)
+
+
+class BatchRelations:
+    """Labels and items referenced by a batch of records.
+
+    Terms, with their types, items and the term types allowed by each
+    organism or capture type are loaded with one query each, so that
+    rows with unknown or disallowed references can be rejected before
+    the batch is inserted.
+    """
+
+    def __init__(self, records, type_model, type_key, using):
+        label_ids = {
+            label for record in records
+            for label in get_ids(record.get('labels'))}
+        item_ids = {
+            item for record in records
+            for item in get_ids(record.get('items'))}
+        type_ids = {get_id(record.get(type_key)) for record in records}
+
+        self.type_key = type_key
+        self.term_types = dict(
+            Term.objects.using(using)
+            .filter(id__in=label_ids)
+            .values_list('id', 'term_type_id'))
+        self.items = set(
+            Item.objects.using(using)
+            .filter(id__in=item_ids)
+            .values_list('id', flat=True))
+
+        field = type_model._meta.get_field('term_types')
+        self.allowed_term_types = {}
+        for type_id, term_type_id in (
+                field.remote_field.through.objects.using(using)
+                .filter(**{field.m2m_column_name() + '__in': type_ids})
+                .values_list(field.m2m_column_name(), field.m2m_reverse_name())):
+            self.allowed_term_types.setdefault(type_id, set()).add(term_type_id)
+
+    def check(self, record):
+        errors = {}
+
+        labels = get_ids(record.get('labels'))
+        allowed = self.allowed_term_types.get(get_id(record.get(self.type_key)), set())
+
+        label_errors = []
+        for label in labels:
+            if label not in self.term_types:
+                msg = _('Term %(term)s does not exist')
+                label_errors.append(ValidationError(msg % dict(term=label)))
+            elif self.term_types[label] not in allowed:
+                msg = _(
+                    'Terms of type %(term_type)s are not allowed for this '
+                    'type. Term: %(term)s')
+                params = dict(term_type=self.term_types[label], term=label)
+                label_errors.append(ValidationError(msg % params))
+
+        if label_errors:
+            errors['labels'] = label_errors
+
+        item_errors = [
+            ValidationError(_('Item %(item)s does not exist') % dict(item=item))
+            for item in get_ids(record.get('items'))
+            if item not in self.items]
+
+        if item_errors:
+            errors['items'] = item_errors
+
+        if errors:
+            raise ValidationError(errors)
+
+
+def insert_instances(model, instances, batch_size, using):
+    """Insert instances making sure primary keys are set afterwards.
+
+    Backends that cannot return primary keys from a bulk insert fall back
+    to single row inserts, since the keys are needed for M2M rows.
+    """
+    if can_return_bulk_ids(using):
+        return model.objects.using(using).bulk_create(
+            instances,
+            batch_size=batch_size)
+
+    for instance in instances:
+        instance.save(force_insert=True, using=using)
+
+    return instances
+
+
+def insert_m2m(field, pairs, batch_size, using):
+    through = field.remote_field.through
+    source_column = field.m2m_column_name()
+    target_column = field.m2m_reverse_name()
+
+    pairs = list(dict.fromkeys(pairs))
+    rows = [
+        through(**{source_column: source, target_column: target})
+        for source, target in pairs]
+
+    through.objects.using(using).bulk_create(
+        rows,
+        batch_size=batch_size,
+        ignore_conflicts=True)
+
+    return pairs
+
+
+def validate_in_batches(context_class, records, batch_size, workers, using):
+    """Validate records a batch at a time without storing them.
+
+    Returns a BulkIngestResult whose errors are keyed by record position.
+    """
+    from irekua_organisms.bulk.validation import validate_batch
+
+    result = BulkIngestResult()
+
+    offset = 0
+    for batch in chunked(records, batch_size):
+        context = context_class(batch, using=using)
+        validate_batch(context, batch, offset, result, workers=workers)
+        offset += len(batch)
+
+    return result
+
+
+def ingest_in_batches(context_class, records, build, store, batch_size, workers, using):
+    """Validate and insert records a batch at a time.
+
+    build(record, context) returns the unsaved instance of a valid record
+    and store(valid, batch_size, using) inserts the (record, instance)
+    pairs of a batch and returns the stored instances. Each batch is
+    stored in its own transaction with per instance signals deferred.
+    """
+    from irekua_organisms.bulk.validation import validate_batch
+
+    result = BulkIngestResult()
+
+    offset = 0
+    for batch in chunked(records, batch_size):
+        context = context_class(batch, using=using)
+
+        valid = [
+            (record, build(record, context))
+            for record in validate_batch(context, batch, offset, result, workers=workers)]
+
+        offset += len(batch)
+
+        if not valid:
+            continue
+
+        with transaction.atomic(using=using), deferred_signals():
+            instances = store(valid, batch_size, using)
+
+        result.created.extend(instance.pk for instance in instances)
+
+    return result
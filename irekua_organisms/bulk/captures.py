@@ -0,0 +1,205 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models import SamplingEventDevice
+
+from irekua_organisms.bulk.base import DEFAULT_BATCH_SIZE
+from irekua_organisms.bulk.base import BatchRelations
+from irekua_organisms.bulk.base import get_id
+from irekua_organisms.bulk.base import get_ids
+from irekua_organisms.bulk.base import insert_instances
+from irekua_organisms.bulk.base import insert_m2m
+from irekua_organisms.bulk.base import validate_in_batches
+from irekua_organisms.bulk.base import ingest_in_batches
+from irekua_organisms.bulk.validation import OrganismCaptureValidationSnapshot
+from irekua_organisms.bulk.validation import check_organism_capture
+from irekua_organisms.utils import TypeSchema
+from irekua_organisms.utils import get_capture_schema_version
+from irekua_organisms.utils import get_capture_fingerprint
+from irekua_organisms.snapshots import get_config_snapshots
+from irekua_organisms import statistics
+from irekua_organisms import changes
+
+
+class OrganismCaptureBatchContext:
+    """Configuration needed to validate a batch of organism capture records.
+
+    Sampling event device chains are resolved up to the collection type
+    in a single query instead of one query per hop and per capture, and
+    collection type configurations are read from their snapshots.
+    """
+
+    check = staticmethod(check_organism_capture)
+
+    def __init__(self, records, using=DEFAULT_DB_ALIAS):
+        from irekua_organisms.models import Organism
+        from irekua_organisms.models import OrganismCaptureType
+
+        device_ids = {
+            get_id(record.get('sampling_event_device')) for record in records}
+        capture_type_ids = {
+            get_id(record.get('organism_capture_type')) for record in records}
+        organism_ids = {get_id(record.get('organism')) for record in records}
+
+        self.devices = {
+            device_id: (collection_id, collection_type_id)
+            for device_id, collection_id, collection_type_id
+            in SamplingEventDevice.objects.using(using)
+            .filter(id__in=device_ids)
+            .values_list(
+                'id',
+                'sampling_event__collection_id',
+                'sampling_event__collection__collection_type_id')
+        }
+
+        capture_types = {
+            pk: TypeSchema(pk, name, None)
+            for pk, name in OrganismCaptureType.objects.using(using)
+            .filter(id__in=capture_type_ids)
+            .values_list('id', 'name')}
+
+        self.snapshot = OrganismCaptureValidationSnapshot(
+            self.devices,
+            get_config_snapshots(
+                {collection_type_id for unused, collection_type_id in self.devices.values()},
+                using=using),
+            capture_types)
+
+        self.relations = BatchRelations(
+            records,
+            OrganismCaptureType,
+            'organism_capture_type',
+            using)
+        self.schema_versions = {}
+        self.organisms = set(
+            Organism.objects.using(using)
+            .filter(id__in=organism_ids)
+            .values_list('id', flat=True))
+
+    def accept(self, record):
+        if get_id(record.get('organism')) not in self.organisms:
+            raise ValidationError({'organism': _('Organism does not exist')})
+
+        self.relations.check(record)
+
+    def validate(self, record):
+        self.check(record, self.snapshot)
+        self.accept(record)
+
+    def set_validation_state(self, capture):
+        collection_type_id = capture.collection_type_id
+        key = (capture.organism_capture_type_id, collection_type_id)
+
+        try:
+            schema_version = self.schema_versions[key]
+        except KeyError:
+            schema_version = get_capture_schema_version(
+                self.snapshot.configs[collection_type_id],
+                capture.organism_capture_type_id)
+            self.schema_versions[key] = schema_version
+
+        capture.schema_version = schema_version
+        capture.validation_fingerprint = get_capture_fingerprint(
+            capture.organism_capture_type_id,
+            collection_type_id,
+            capture.additional_metadata)
+
+
+def build_organism_capture(record, context, user=None):
+    from irekua_organisms.models import OrganismCapture
+
+    creator = record.get('created_by', user)
+    capture = OrganismCapture(
+        organism_capture_type_id=get_id(record['organism_capture_type']),
+        sampling_event_device_id=get_id(record['sampling_event_device']),
+        organism_id=get_id(record['organism']),
+        created_by_id=get_id(creator),
+        modified_by_id=get_id(creator))
+
+    if 'additional_metadata' in record:
+        capture.additional_metadata = record['additional_metadata']
+
+    capture.set_collection(*context.devices[capture.sampling_event_device_id])
+
+    return capture
+
+
+def validate_organism_capture_records(
+        records,
+        batch_size=DEFAULT_BATCH_SIZE,
+        workers=None,
+        using=DEFAULT_DB_ALIAS):
+    """Validate organism capture records without storing them.
+
+    Uses the same batched lookups and validation engine as the bulk
+    loader and returns a BulkIngestResult whose errors are keyed by
+    record position.
+    """
+    return validate_in_batches(OrganismCaptureBatchContext, records, batch_size, workers, using)
+
+
+def store_organism_captures(valid, batch_size, using):
+    from irekua_organisms.models import OrganismCapture
+    from irekua_organisms.models import OrganismChange
+
+    labels_field = OrganismCapture._meta.get_field('labels')
+    items_field = OrganismCapture._meta.get_field('items')
+
+    captures = insert_instances(
+        OrganismCapture,
+        [capture for unused, capture in valid],
+        batch_size,
+        using)
+
+    label_pairs = []
+    item_pairs = []
+    for (record, unused), capture in zip(valid, captures):
+        label_pairs.extend(
+            (capture.pk, label)
+            for label in get_ids(record.get('labels')))
+        item_pairs.extend(
+            (capture.pk, item)
+            for item in get_ids(record.get('items')))
+
+    label_pairs = insert_m2m(labels_field, label_pairs, batch_size, using)
+    insert_m2m(items_field, item_pairs, batch_size, using)
+
+    statistics.record_bulk_captures(captures, label_pairs, using=using)
+    changes.record_changes(
+        OrganismCapture,
+        [instance.pk for instance in captures],
+        OrganismChange.CREATE,
+        collections=[instance.collection_id for instance in captures],
+        using=using)
+
+    return captures
+
+
+def bulk_ingest_organism_captures(
+        records,
+        batch_size=DEFAULT_BATCH_SIZE,
+        user=None,
+        workers=None,
+        using=DEFAULT_DB_ALIAS):
+    """Validate and insert organism capture records in batches.
+
+    Records may be any iterable, including generators, and are consumed
+    one batch at a time. Each record is a dictionary with the capture
+    fields, where foreign keys may be given as instances or primary keys,
+    and the optional lists "labels" and "items". Invalid records are
+    reported in the result errors, keyed by the record position.
+    """
+    def build(record, context):
+        capture = build_organism_capture(record, context, user=user)
+        context.set_validation_state(capture)
+        return capture
+
+    return ingest_in_batches(
+        OrganismCaptureBatchContext,
+        records,
+        build,
+        store_organism_captures,
+        batch_size,
+        workers,
+        using)
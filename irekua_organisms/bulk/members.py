@@ -0,0 +1,92 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from irekua_organisms.bulk.base import DEFAULT_BATCH_SIZE
+from irekua_organisms.bulk.base import get_id
+from irekua_organisms.bulk.base import insert_instances
+from irekua_organisms.bulk.base import ingest_in_batches
+from irekua_organisms.bulk.validation import OrganismMemberValidationSnapshot
+from irekua_organisms.bulk.validation import check_organism_member
+from irekua_organisms.utils import TypeSchema
+
+
+class OrganismMemberBatchContext:
+    """Groups and organism types needed to validate a batch of members.
+
+    Both are loaded with one query each, whatever the batch size.
+    """
+
+    check = staticmethod(check_organism_member)
+
+    def __init__(self, records, using=DEFAULT_DB_ALIAS):
+        from irekua_organisms.models import Organism
+        from irekua_organisms.models import OrganismType
+
+        group_ids = {get_id(record.get('group')) for record in records}
+        organism_type_ids = {get_id(record.get('organism_type')) for record in records}
+
+        groups = {
+            pk: (name, is_multi_organism)
+            for pk, name, is_multi_organism in Organism.objects.using(using)
+            .filter(id__in=group_ids)
+            .values_list('id', 'organism_type__name', 'organism_type__is_multi_organism')}
+
+        organism_types = {
+            pk: TypeSchema(pk, name, schema)
+            for pk, name, schema in OrganismType.objects.using(using)
+            .filter(id__in=organism_type_ids)
+            .values_list('id', 'name', 'identification_info_schema')}
+
+        self.snapshot = OrganismMemberValidationSnapshot(groups, organism_types)
+
+    def accept(self, record):
+        pass
+
+    def validate(self, record):
+        self.check(record, self.snapshot)
+        self.accept(record)
+
+
+def build_organism_member(record):
+    from irekua_organisms.models import OrganismMember
+
+    member = OrganismMember(
+        group_id=get_id(record['group']),
+        organism_type_id=get_id(record['organism_type']),
+        count=record.get('count', 1))
+
+    if 'identification_info' in record:
+        member.identification_info = record['identification_info']
+
+    return member
+
+
+def store_organism_members(valid, batch_size, using):
+    from irekua_organisms.models import OrganismMember
+
+    return insert_instances(
+        OrganismMember,
+        [member for unused, member in valid],
+        batch_size,
+        using)
+
+
+def bulk_ingest_organism_members(
+        records,
+        batch_size=DEFAULT_BATCH_SIZE,
+        workers=None,
+        using=DEFAULT_DB_ALIAS):
+    """Validate and insert members of multi organisms in batches.
+
+    Each record is a dictionary with the "group" organism, the member
+    "organism_type", an optional "count" of individuals and optional
+    "identification_info". Invalid records are reported in the result
+    errors, keyed by the record position.
+    """
+    return ingest_in_batches(
+        OrganismMemberBatchContext,
+        records,
+        lambda record, context: build_organism_member(record),
+        store_organism_members,
+        batch_size,
+        workers,
+        using)
@@ -0,0 +1,212 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models import Collection
+
+from irekua_organisms.bulk.base import DEFAULT_BATCH_SIZE
+from irekua_organisms.bulk.base import BatchRelations
+from irekua_organisms.bulk.base import get_id
+from irekua_organisms.bulk.base import get_ids
+from irekua_organisms.bulk.base import insert_instances
+from irekua_organisms.bulk.base import insert_m2m
+from irekua_organisms.bulk.base import validate_in_batches
+from irekua_organisms.bulk.base import ingest_in_batches
+from irekua_organisms.bulk.validation import OrganismValidationSnapshot
+from irekua_organisms.bulk.validation import check_organism
+from irekua_organisms.utils import TypeSchema
+from irekua_organisms.utils import get_organism_schema_version
+from irekua_organisms.utils import get_organism_fingerprint
+from irekua_organisms.snapshots import get_config_snapshots
+from irekua_organisms import identification
+from irekua_organisms import search
+from irekua_organisms import statistics
+from irekua_organisms import changes
+
+
+ORGANISM_FIELDS = (
+    'name',
+    'remarks',
+    'identification_info',
+    'additional_metadata',
+)
+
+
+class OrganismBatchContext:
+    """Configuration needed to validate a batch of organism records.
+
+    Everything is loaded with a fixed number of queries into a snapshot
+    without model instances, so that records can be validated in memory
+    or in worker processes.
+    """
+
+    check = staticmethod(check_organism)
+
+    def __init__(self, records, using=DEFAULT_DB_ALIAS):
+        from irekua_organisms.models import OrganismType
+        from irekua_organisms.models import Organism
+
+        collection_ids = {get_id(record.get('collection')) for record in records}
+        organism_type_ids = {get_id(record.get('organism_type')) for record in records}
+        names = [record['name'] for record in records if record.get('name')]
+
+        collections = dict(
+            Collection.objects.using(using)
+            .filter(id__in=collection_ids)
+            .values_list('id', 'collection_type_id'))
+
+        organism_types = {
+            pk: TypeSchema(pk, name, schema)
+            for pk, name, schema in OrganismType.objects.using(using)
+            .filter(id__in=organism_type_ids)
+            .values_list('id', 'name', 'identification_info_schema')}
+
+        self.snapshot = OrganismValidationSnapshot(
+            collections,
+            get_config_snapshots(set(collections.values()), using=using),
+            organism_types)
+
+        self.relations = BatchRelations(records, OrganismType, 'organism_type', using)
+        self.schema_versions = {}
+        self.used_names = set(
+            Organism.objects.using(using)
+            .filter(name__in=names)
+            .values_list('name', flat=True))
+
+    def accept(self, record):
+        self.relations.check(record)
+
+        name = record.get('name')
+        if not name:
+            return
+
+        if name in self.used_names:
+            raise ValidationError({
+                'name': _('Organism with this name already exists')})
+
+        self.used_names.add(name)
+
+    def validate(self, record):
+        self.check(record, self.snapshot)
+        self.accept(record)
+
+    def set_validation_state(self, organism):
+        collection_type_id = self.snapshot.collections[organism.collection_id]
+        key = (organism.organism_type_id, collection_type_id)
+
+        try:
+            schema_version = self.schema_versions[key]
+        except KeyError:
+            schema_version = get_organism_schema_version(
+                self.snapshot.configs[collection_type_id],
+                self.snapshot.organism_types[organism.organism_type_id])
+            self.schema_versions[key] = schema_version
+
+        organism.schema_version = schema_version
+        organism.validation_fingerprint = get_organism_fingerprint(
+            organism.organism_type_id,
+            collection_type_id,
+            organism.identification_info,
+            organism.additional_metadata)
+
+
+def build_organism(record, user=None):
+    from irekua_organisms.models import Organism
+
+    fields = {
+        field: record[field]
+        for field in ORGANISM_FIELDS
+        if field in record}
+    fields['name'] = fields.get('name') or None
+
+    creator = record.get('created_by', user)
+    return Organism(
+        collection_id=get_id(record['collection']),
+        organism_type_id=get_id(record['organism_type']),
+        created_by_id=get_id(creator),
+        modified_by_id=get_id(creator),
+        **fields)
+
+
+def validate_organism_records(
+        records,
+        batch_size=DEFAULT_BATCH_SIZE,
+        workers=None,
+        using=DEFAULT_DB_ALIAS):
+    """Validate organism records without storing them.
+
+    Uses the same batched lookups and validation engine as the bulk
+    loader and returns a BulkIngestResult whose errors are keyed by
+    record position.
+    """
+    return validate_in_batches(OrganismBatchContext, records, batch_size, workers, using)
+
+
+def store_organisms(valid, batch_size, using):
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import OrganismChange
+
+    labels_field = Organism._meta.get_field('labels')
+    items_field = Organism._meta.get_field('items')
+
+    organisms = insert_instances(
+        Organism,
+        [organism for unused, organism in valid],
+        batch_size,
+        using)
+
+    label_pairs = []
+    item_pairs = []
+    for (record, unused), organism in zip(valid, organisms):
+        label_pairs.extend(
+            (organism.pk, label)
+            for label in get_ids(record.get('labels')))
+        item_pairs.extend(
+            (organism.pk, item)
+            for item in get_ids(record.get('items')))
+
+    label_pairs = insert_m2m(labels_field, label_pairs, batch_size, using)
+    insert_m2m(items_field, item_pairs, batch_size, using)
+
+    identification.index_organisms(organisms, replace=False, using=using)
+    search.update_organism_search(
+        [organism.pk for organism in organisms],
+        using=using)
+    statistics.record_bulk_organisms(organisms, label_pairs, using=using)
+    changes.record_changes(
+        Organism,
+        [instance.pk for instance in organisms],
+        OrganismChange.CREATE,
+        collections=[instance.collection_id for instance in organisms],
+        using=using)
+
+    return organisms
+
+
+def bulk_ingest_organisms(
+        records,
+        batch_size=DEFAULT_BATCH_SIZE,
+        user=None,
+        workers=None,
+        using=DEFAULT_DB_ALIAS):
+    """Validate and insert organism records in batches.
+
+    Each record is a dictionary with the organism fields, where foreign
+    keys may be given as instances or primary keys, and the optional
+    lists "labels" and "items". Invalid records are reported in the
+    result errors, keyed by the record position, and do not prevent the
+    remaining records of the batch from being stored.
+    """
+    def build(record, context):
+        organism = build_organism(record, user=user)
+        context.set_validation_state(organism)
+        return organism
+
+    return ingest_in_batches(
+        OrganismBatchContext,
+        records,
+        build,
+        store_organisms,
+        batch_size,
+        workers,
+        using)
@@ -0,0 +1,332 @@
+import math
+import threading
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.core.exceptions import ValidationError
+from django.utils import translation
+from django.utils.translation import gettext_lazy as _
+
+from irekua_organisms.bulk.base import get_id
+from irekua_organisms.utils import get_error_messages
+from irekua_organisms.utils import validate_identification_info
+from irekua_organisms.utils import validate_organism_metadata
+from irekua_organisms.utils import validate_capture_metadata
+
+
+# Smaller chunks cost more in pickling and scheduling than they save.
+MIN_CHUNK_SIZE = 50
+
+# Validation runs in the calling process unless worker processes are
+# configured with IREKUA_ORGANISMS_VALIDATION_WORKERS.
+DEFAULT_VALIDATION_WORKERS = 1
+
+# Workers are started fresh instead of forked, since callers may be
+# multi-threaded (web servers, the async executor).
+DEFAULT_START_METHOD = 'spawn'
+
+
+# Everything needed to validate organism records without the database.
+# collections maps collection ids to collection type ids, configs maps
+# collection type ids to OrganismConfigSnapshot and organism_types maps
+# organism type ids to TypeSchema.
+OrganismValidationSnapshot = namedtuple('OrganismValidationSnapshot', [
+    'collections',
+    'configs',
+    'organism_types',
+])
+
+# devices maps sampling event device ids to (collection id, collection
+# type id) and capture_types maps capture type ids to TypeSchema.
+OrganismCaptureValidationSnapshot = namedtuple('OrganismCaptureValidationSnapshot', [
+    'devices',
+    'configs',
+    'capture_types',
+])
+
+# groups maps organism ids to the (name, is_multi_organism) pair of their
+# organism type and organism_types maps organism type ids to TypeSchema.
+OrganismMemberValidationSnapshot = namedtuple('OrganismMemberValidationSnapshot', [
+    'groups',
+    'organism_types',
+])
+
+
+def check_organism(record, snapshot):
+    """Validate an organism record as Organism.clean() would."""
+    collection_id = get_id(record.get('collection'))
+    organism_type_id = get_id(record.get('organism_type'))
+
+    try:
+        collection_type_id = snapshot.collections[collection_id]
+    except KeyError:
+        raise ValidationError({'collection': _('Collection does not exist')})
+
+    try:
+        organism_type = snapshot.organism_types[organism_type_id]
+    except KeyError:
+        raise ValidationError({'organism_type': _('Organism type does not exist')})
+
+    organism_config = snapshot.configs[collection_type_id]
+    organism_config.validate_use_organisms()
+
+    try:
+        validate_identification_info(organism_type, record.get('identification_info', {}))
+    except ValidationError as error:
+        raise ValidationError({'identification_info': error})
+
+    try:
+        type_link = organism_config.get_organism_type_link(organism_type)
+    except ValidationError as error:
+        raise ValidationError({'organism_type': error})
+
+    try:
+        validate_organism_metadata(
+            type_link,
+            organism_type,
+            record.get('additional_metadata', {}))
+    except ValidationError as error:
+        raise ValidationError({'additional_metadata': error})
+
+
+def check_organism_capture(record, snapshot):
+    """Validate an organism capture record as OrganismCapture.clean() would."""
+    device_id = get_id(record.get('sampling_event_device'))
+    capture_type_id = get_id(record.get('organism_capture_type'))
+
+    try:
+        unused, collection_type_id = snapshot.devices[device_id]
+    except KeyError:
+        raise ValidationError({
+            'sampling_event_device': _('Sampling event device does not exist')})
+
+    try:
+        capture_type = snapshot.capture_types[capture_type_id]
+    except KeyError:
+        raise ValidationError({
+            'organism_capture_type': _('Organism capture type does not exist')})
+
+    organism_config = snapshot.configs[collection_type_id]
+    organism_config.validate_use_organisms()
+
+    try:
+        type_link = organism_config.get_organism_capture_type_link(capture_type)
+    except ValidationError as error:
+        raise ValidationError({'organism_capture_type': error})
+
+    try:
+        validate_capture_metadata(
+            type_link,
+            capture_type,
+            record.get('additional_metadata', {}))
+    except ValidationError as error:
+        raise ValidationError({'additional_metadata': error})
+
+
+def check_organism_member(record, snapshot):
+    """Validate an organism member record as OrganismMember.clean() would."""
+    group_id = get_id(record.get('group'))
+    organism_type_id = get_id(record.get('organism_type'))
+
+    try:
+        group_type, is_multi_organism = snapshot.groups[group_id]
+    except KeyError:
+        raise ValidationError({'group': _('Organism does not exist')})
+
+    if not is_multi_organism:
+        msg = _('Organisms of type %(type)s cannot have members')
+        params = dict(type=group_type)
+        raise ValidationError({'group': msg % params})
+
+    try:
+        organism_type = snapshot.organism_types[organism_type_id]
+    except KeyError:
+        raise ValidationError({'organism_type': _('Organism type does not exist')})
+
+    count = record.get('count', 1)
+    if not isinstance(count, int) or count < 1:
+        raise ValidationError({'count': _('Count must be a positive integer')})
+
+    identification_info = record.get('identification_info')
+    if not identification_info:
+        return
+
+    try:
+        validate_identification_info(organism_type, identification_info)
+    except ValidationError as error:
+        raise ValidationError({'identification_info': error})
+
+
+def check_records(check, records, snapshot, language=None):
+    """Run check on (index, record) pairs and return messages by index.
+
+    Messages are rendered to plain strings so that results can be sent
+    back from worker processes.
+    """
+    errors = {}
+
+    with translation.override(language):
+        for index, record in records:
+            try:
+                check(record, snapshot)
+            except ValidationError as error:
+                errors[index] = {
+                    field: [str(message) for message in messages]
+                    for field, messages in get_error_messages(error).items()}
+
+    return errors
+
+
+_inherited_connections = []
+
+
+def setup_worker():
+    import django
+    from django.apps import apps
+
+    # Processes started with "spawn" do not inherit a configured Django.
+    if not apps.ready:
+        django.setup()
+
+    # Workers never use the database. Connections inherited from a forked
+    # parent share its sockets, so they are detached without sending a
+    # terminate message and kept referenced so they are never finalized.
+    for connection in connections.all():
+        if connection.connection is not None:
+            _inherited_connections.append(connection.connection)
+            connection.connection = None
+
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def get_validation_workers():
+    return getattr(
+        settings,
+        'IREKUA_ORGANISMS_VALIDATION_WORKERS',
+        DEFAULT_VALIDATION_WORKERS)
+
+
+def get_start_method():
+    return getattr(
+        settings,
+        'IREKUA_ORGANISMS_VALIDATION_START_METHOD',
+        DEFAULT_START_METHOD)
+
+
+def get_process_pool(workers):
+    """Return the shared process pool with the given number of workers.
+
+    One pool is kept per worker count, so callers asking for a different
+    count never shut down a pool that others are submitting to.
+    """
+    with _pool_lock:
+        pool = _pools.get(workers)
+
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(get_start_method()),
+                initializer=setup_worker)
+            _pools[workers] = pool
+
+    return pool
+
+
+def shutdown_process_pool(wait=True):
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+def get_chunk_size(count, workers):
+    return max(MIN_CHUNK_SIZE, math.ceil(count / workers))
+
+
+def validate_records(check, records, snapshot, workers=None, chunk_size=None):
+    """Validate (index, record) pairs and return error messages by index.
+
+    Records are validated in this process unless more than one worker is
+    given or set with IREKUA_ORGANISMS_VALIDATION_WORKERS. Then they are
+    split in chunks that are validated in a shared process pool. Unless
+    chunk_size is given, records are split evenly across the workers,
+    with at least MIN_CHUNK_SIZE records per chunk. check must be a
+    module level function and records and snapshot must be picklable,
+    so no model instances should be passed. Inputs of a single chunk
+    are also validated in this process.
+    """
+    records = list(records)
+
+    if workers is None:
+        workers = get_validation_workers()
+
+    if chunk_size is None:
+        chunk_size = get_chunk_size(len(records), max(workers, 1))
+
+    language = translation.get_language()
+
+    if workers <= 1 or len(records) <= chunk_size:
+        return check_records(check, records, snapshot, language=language)
+
+    pool = get_process_pool(workers)
+    futures = [
+        pool.submit(
+            check_records,
+            check,
+            records[start:start + chunk_size],
+            snapshot,
+            language)
+        for start in range(0, len(records), chunk_size)]
+
+    errors = {}
+    for future in futures:
+        errors.update(future.result())
+
+    return errors
+
+
+def validate_batch(context, batch, offset, result, workers=None):
+    """Validate a batch of records and return the valid ones.
+
+    Schema validation runs through validate_records with the context
+    snapshot; checks that depend on the database or on previous records
+    of the import are made afterwards, in order, by context.accept.
+    Errors are added to result keyed by offset plus the batch position.
+    """
+    records = list(enumerate(batch, start=offset))
+    errors = validate_records(
+        context.check,
+        [(index, get_record_ids(record)) for index, record in records],
+        context.snapshot,
+        workers=workers)
+
+    valid = []
+    for index, record in records:
+        if index in errors:
+            result.add_messages(index, errors[index])
+            continue
+
+        try:
+            context.accept(record)
+        except ValidationError as error:
+            result.add_error(index, error)
+            continue
+
+        valid.append(record)
+
+    return valid
+
+
+def get_record_ids(record):
+    # Replace model instances by primary keys before pickling.
+    return {
+        key: get_id(value)
+        for key, value in record.items()
+        if key not in ('labels', 'items', 'created_by')}
@@ -0,0 +1,249 @@
+import time
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+
+from irekua_organisms.snapshots import get_shared_cache
+
+
+VERSION_KEY = 'irekua_organisms:type_catalog:version'
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+# Organism type entries can be used wherever a TypeSchema is expected.
+OrganismTypeInfo = namedtuple('OrganismTypeInfo', [
+    'pk',
+    'name',
+    'schema',
+    'term_type_ids',
+])
+
+CaptureTypeInfo = namedtuple('CaptureTypeInfo', [
+    'pk',
+    'name',
+    'organism_type_id',
+    'device_type_id',
+    'term_type_ids',
+])
+
+
+class TypeCatalog:
+    """Read-only view of all organism and capture types.
+
+    Holds every type with its allowed term type ids, and the capture
+    types available for each device type, so lookups need no queries.
+    Entries are plain tuples and are never modified once loaded; a new
+    catalog is built when the catalog version changes.
+    """
+
+    def __init__(self, version, organism_types, capture_types):
+        self.version = version
+        self.organism_types = MappingProxyType(dict(organism_types))
+        self.capture_types = MappingProxyType(dict(capture_types))
+
+        by_device_type = {}
+        by_organism_type = {}
+        for capture_type in sorted(self.capture_types.values()):
+            by_device_type.setdefault(capture_type.device_type_id, []).append(capture_type.pk)
+            by_organism_type.setdefault(capture_type.organism_type_id, []).append(capture_type.pk)
+
+        self.device_type_capture_types = MappingProxyType({
+            pk: tuple(capture_types) for pk, capture_types in by_device_type.items()})
+        self.organism_type_capture_types = MappingProxyType({
+            pk: tuple(capture_types) for pk, capture_types in by_organism_type.items()})
+
+    def get_organism_type(self, pk):
+        return self.organism_types.get(pk)
+
+    def get_capture_type(self, pk):
+        return self.capture_types.get(pk)
+
+    def get_device_type_capture_types(self, device_type_id):
+        """Return the ids of the capture types made with a device type."""
+        return self.device_type_capture_types.get(device_type_id, ())
+
+    def get_organism_type_capture_types(self, organism_type_id):
+        """Return the ids of the capture types of an organism type."""
+        return self.organism_type_capture_types.get(organism_type_id, ())
+
+    def get_allowed_term_types(self, model, pk):
+        """Return the allowed term type ids of a type, or None if unknown."""
+        from irekua_organisms.models import OrganismType
+
+        entries = self.organism_types if model is OrganismType else self.capture_types
+        entry = entries.get(pk)
+
+        if entry is None:
+            return None
+
+        return entry.term_type_ids
+
+
+_catalog = None
+_checked_at = None
+_lock = threading.Lock()
+
+
+def is_catalog_enabled():
+    return getattr(settings, 'IREKUA_ORGANISMS_TYPE_CATALOG', False)
+
+
+def get_check_interval():
+    return getattr(
+        settings,
+        'IREKUA_ORGANISMS_TYPE_CATALOG_CHECK_INTERVAL',
+        DEFAULT_CHECK_INTERVAL)
+
+
+def get_catalog_version():
+    """Return the current catalog version.
+
+    The version lives in the shared cache named by the
+    IREKUA_ORGANISMS_CONFIG_CACHE setting, so that every process sees
+    bumps made by the others. The catalog cannot be enabled without it.
+    """
+    shared_cache = get_shared_cache()
+    if shared_cache is None:
+        raise ImproperlyConfigured(
+            'IREKUA_ORGANISMS_TYPE_CATALOG requires IREKUA_ORGANISMS_CONFIG_CACHE '
+            'to name a cache shared by all processes.')
+
+    version = shared_cache.get(VERSION_KEY)
+    if version is None:
+        shared_cache.add(VERSION_KEY, 0, timeout=None)
+        version = shared_cache.get(VERSION_KEY, 0)
+
+    return version
+
+
+def bump_catalog_version():
+    """Mark every loaded catalog as stale.
+
+    Must only run once the type changes are committed, so that no
+    process reloads rows that could still be rolled back.
+    """
+    clear_type_catalog()
+
+    shared_cache = get_shared_cache()
+    if shared_cache is None:
+        return
+
+    try:
+        shared_cache.incr(VERSION_KEY)
+    except ValueError:
+        # The key expired or was evicted; any new value is a bump.
+        shared_cache.set(VERSION_KEY, 1, timeout=None)
+
+
+def load_type_catalog(version, using=DEFAULT_DB_ALIAS):
+    """Build a catalog of all types with four queries."""
+    from irekua_organisms.models import OrganismType
+    from irekua_organisms.models import OrganismCaptureType
+
+    def term_types(model):
+        field = model._meta.get_field('term_types')
+        source = field.m2m_column_name()
+        target = field.m2m_reverse_name()
+
+        allowed = {}
+        for pk, term_type_id in (
+                field.remote_field.through.objects.using(using)
+                .values_list(source, target)):
+            allowed.setdefault(pk, set()).add(term_type_id)
+
+        return allowed
+
+    organism_term_types = term_types(OrganismType)
+    capture_term_types = term_types(OrganismCaptureType)
+
+    organism_types = {
+        pk: OrganismTypeInfo(
+            pk,
+            name,
+            schema,
+            frozenset(organism_term_types.get(pk, ())))
+        for pk, name, schema in OrganismType.objects.using(using)
+        .order_by()
+        .values_list('id', 'name', 'identification_info_schema')}
+
+    capture_types = {
+        pk: CaptureTypeInfo(
+            pk,
+            name,
+            organism_type_id,
+            device_type_id,
+            frozenset(capture_term_types.get(pk, ())))
+        for pk, name, organism_type_id, device_type_id in OrganismCaptureType.objects.using(using)
+        .order_by()
+        .values_list('id', 'name', 'organism_type_id', 'device_type_id')}
+
+    return TypeCatalog(version, organism_types, capture_types)
+
+
+def get_type_catalog():
+    """Return the type catalog, or None when it is not enabled.
+
+    The catalog is enabled with the IREKUA_ORGANISMS_TYPE_CATALOG
+    setting. It is loaded on first access, kept in process memory and
+    rebuilt on the first access after the catalog version changes. The
+    shared version is checked at most once every
+    IREKUA_ORGANISMS_TYPE_CATALOG_CHECK_INTERVAL seconds. Type changes
+    bump the version after they are committed, so they are seen after
+    commit in every process, this one included.
+    """
+    global _catalog
+    global _checked_at
+
+    if not is_catalog_enabled():
+        return None
+
+    now = time.monotonic()
+
+    with _lock:
+        catalog = _catalog
+        checked_at = _checked_at
+
+    if catalog is not None and now - checked_at < get_check_interval():
+        return catalog
+
+    # Read the version before loading, so that a bump made while loading
+    # marks the loaded catalog as stale.
+    version = get_catalog_version()
+
+    if catalog is None or catalog.version != version:
+        catalog = load_type_catalog(version)
+
+    with _lock:
+        _catalog = catalog
+        _checked_at = now
+
+    return catalog
+
+
+def clear_type_catalog():
+    global _catalog
+
+    with _lock:
+        _catalog = None
+
+
+def get_organism_type_info(pk):
+    """Return the catalog entry of an organism type, or None if unavailable."""
+    catalog = get_type_catalog()
+    if catalog is None:
+        return None
+
+    return catalog.get_organism_type(pk)
+
+
+def get_capture_type_info(pk):
+    """Return the catalog entry of a capture type, or None if unavailable."""
+    catalog = get_type_catalog()
+    if catalog is None:
+        return None
+
+    return catalog.get_capture_type(pk)
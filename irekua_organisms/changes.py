@@ -0,0 +1,163 @@
+import time
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db import transaction
+from django.db.models import Max
+
+from irekua_organisms import statistics
+
+DEFAULT_LIMIT = 1000
+
+# Advisory lock held while sequence numbers are assigned.
+SEQUENCE_LOCK_ID = 0x6972656b
+
+
+def get_model_name(model):
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import OrganismChange
+
+    if model is Organism:
+        return OrganismChange.ORGANISM
+
+    return OrganismChange.ORGANISM_CAPTURE
+
+
+def record_change(
+        model,
+        object_id,
+        action,
+        payload=None,
+        collections=(),
+        using=DEFAULT_DB_ALIAS):
+    """Record a change of an object in the feed.
+
+    collections are the collections that the object belongs, or belonged,
+    to. Their change version is increased.
+    """
+    from irekua_organisms.models import OrganismChange
+
+    change = OrganismChange.objects.using(using).create(
+        model_name=get_model_name(model),
+        object_id=object_id,
+        action=action,
+        payload=payload or {})
+
+    statistics.record_collection_changes(collections, using=using)
+    return change
+
+
+def record_changes(
+        model,
+        object_ids,
+        action,
+        payload=None,
+        collections=(),
+        using=DEFAULT_DB_ALIAS):
+    from irekua_organisms.models import OrganismChange
+
+    model_name = get_model_name(model)
+    OrganismChange.objects.using(using).bulk_create([
+        OrganismChange(
+            model_name=model_name,
+            object_id=object_id,
+            action=action,
+            payload=payload or {})
+        for object_id in object_ids])
+
+    statistics.record_collection_changes(collections, using=using)
+
+
+def lock_sequence(using):
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        # Other backends already run one writing transaction at a time.
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', [SEQUENCE_LOCK_ID])
+
+
+def assign_sequence_numbers(limit=DEFAULT_LIMIT, using=DEFAULT_DB_ALIAS):
+    """Number up to limit committed changes that have no sequence number.
+
+    Changes are numbered only once they are visible, that is, after the
+    transaction that wrote them committed, and numbering is serialized
+    by a lock. A change committed late therefore always gets a greater
+    sequence number than every change already returned by the feed.
+    Returns the number of changes numbered.
+    """
+    from irekua_organisms.models import OrganismChange
+
+    changes = OrganismChange.objects.using(using)
+
+    with transaction.atomic(using=using):
+        lock_sequence(using)
+
+        pending = list(
+            changes
+            .filter(seq__isnull=True)
+            .order_by('id')
+            .only('id')[:limit])
+
+        if not pending:
+            return 0
+
+        last = changes.aggregate(last=Max('seq'))['last'] or 0
+        for offset, change in enumerate(pending, start=1):
+            change.seq = last + offset
+
+        changes.bulk_update(pending, ['seq'])
+
+    return len(pending)
+
+
+def changes_since(seq=0, limit=DEFAULT_LIMIT, model_names=None, using=DEFAULT_DB_ALIAS):
+    """Return up to limit changes with a sequence number greater than seq.
+
+    Consumers store the sequence number of the last change they processed
+    and pass it back on the next call. Pending changes are numbered
+    first, and numbers are only given to committed changes, so no change
+    can later appear behind a returned sequence number.
+    """
+    from irekua_organisms.models import OrganismChange
+
+    while assign_sequence_numbers(limit=limit, using=using) == limit:
+        pass
+
+    queryset = OrganismChange.objects.using(using).filter(seq__gt=seq)
+
+    if model_names:
+        queryset = queryset.filter(model_name__in=model_names)
+
+    return list(queryset.order_by('seq')[:limit])
+
+
+def iter_changes(
+        seq=0,
+        chunk_size=DEFAULT_LIMIT,
+        model_names=None,
+        follow=False,
+        poll_interval=1.0,
+        using=DEFAULT_DB_ALIAS):
+    """Yield all changes after seq, page by page.
+
+    With follow, keep polling for new changes instead of stopping when
+    the feed is exhausted.
+    """
+    while True:
+        changes = changes_since(
+            seq,
+            limit=chunk_size,
+            model_names=model_names,
+            using=using)
+
+        for change in changes:
+            seq = change.seq
+            yield change
+
+        if len(changes) < chunk_size:
+            if not follow:
+                return
+
+            time.sleep(poll_interval)
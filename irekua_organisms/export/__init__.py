@@ -0,0 +1,97 @@
+import time
+
+from irekua_organisms.export.rows import DEFAULT_CHUNK_SIZE
+from irekua_organisms.export.rows import ORGANISM_VALUES
+from irekua_organisms.export.rows import ORGANISM_CAPTURE_VALUES
+from irekua_organisms.export.rows import iter_organism_rows
+from irekua_organisms.export.rows import iter_organism_capture_rows
+from irekua_organisms.export import writers
+
+
+ORGANISMS = 'organisms'
+ORGANISM_CAPTURES = 'captures'
+
+CSV = 'csv'
+JSONL = 'jsonl'
+DWCA = 'dwca'
+
+FORMATS = (CSV, JSONL, DWCA)
+
+EXPORTS = {
+    ORGANISMS: (
+        iter_organism_rows,
+        ORGANISM_VALUES + ('labels', 'items'),
+        writers.organism_to_dwc,
+        writers.DWC_ORGANISM_FIELDS),
+    ORGANISM_CAPTURES: (
+        iter_organism_capture_rows,
+        ORGANISM_CAPTURE_VALUES + ('labels', 'items'),
+        writers.organism_capture_to_dwc,
+        writers.DWC_ORGANISM_CAPTURE_FIELDS),
+}
+
+
+class ExportStats:
+    def __init__(self, rows, seconds):
+        self.rows = rows
+        self.seconds = seconds
+
+    def __repr__(self):
+        return '<ExportStats rows={} seconds={:.2f} rows_per_second={:.1f}>'.format(
+            self.rows,
+            self.seconds,
+            self.rows_per_second)
+
+    @property
+    def rows_per_second(self):
+        if not self.seconds:
+            return 0.0
+
+        return self.rows / self.seconds
+
+
+def export(
+        fileobj,
+        kind=ORGANISMS,
+        output_format=CSV,
+        queryset=None,
+        collections=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        scientific_name_key='scientific_name'):
+    """Stream organisms or organism captures into a file object.
+
+    CSV and JSON Lines exports expect a text file object, Darwin Core
+    Archives a binary one. Returns the number of rows written and the
+    throughput.
+    """
+    iter_rows, fields, to_dwc, dwc_fields = EXPORTS[kind]
+    rows = iter_rows(
+        queryset=queryset,
+        collections=collections,
+        chunk_size=chunk_size)
+
+    start = time.perf_counter()
+
+    if output_format == CSV:
+        count = writers.write_csv(rows, fileobj, fields)
+    elif output_format == JSONL:
+        count = writers.write_jsonl(rows, fileobj)
+    elif output_format == DWCA:
+        count = writers.write_dwca(
+            rows,
+            fileobj,
+            to_dwc,
+            dwc_fields,
+            scientific_name_key=scientific_name_key)
+    else:
+        raise ValueError('Unknown export format {}'.format(output_format))
+
+    return ExportStats(count, time.perf_counter() - start)
+
+
+__all__ = [
+    'ExportStats',
+    'export',
+    'iter_organism_rows',
+    'iter_organism_capture_rows',
+]
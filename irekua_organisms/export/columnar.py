@@ -0,0 +1,571 @@
+"""Columnar, memory mappable snapshots of organisms and captures.
+
+Each table is split in partitions by collection and organism type. A
+partition is a directory with one .npy file per column:
+
+- integer columns are int64 arrays, with -1 for missing values,
+- dates are datetime64[us] arrays in UTC,
+- text and JSON columns are stored as UTF-8 bytes ("<name>.data.npy")
+  plus row offsets into them ("<name>.offsets.npy"),
+- label and item links are stored as related ids ("<name>.values.npy")
+  plus row offsets ("<name>.offsets.npy").
+
+A manifest at the snapshot root records the state of every partition
+so that later snapshots only rewrite the partitions that changed.
+
+Partitions are never rewritten in place. Every write goes to a new
+version directory of the partition and the manifest, which is replaced
+atomically, points readers to the current versions. Versions that a
+snapshot supersedes are removed by the following snapshot, so readers
+that loaded the previous manifest can still open its partitions.
+"""
+import os
+import json
+import shutil
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+from django.apps import apps
+from django.db.models import Count
+from django.db.models import Max
+
+from irekua_organisms.export import ORGANISMS
+from irekua_organisms.export import ORGANISM_CAPTURES
+from irekua_organisms.export.rows import DEFAULT_CHUNK_SIZE
+from irekua_organisms.utils.iterables import chunked
+from irekua_organisms import changes
+
+
+FORMAT_VERSION = 2
+MANIFEST = 'manifest.json'
+MISSING = -1
+
+
+TableSpec = namedtuple('TableSpec', [
+    'model_name',
+    'type_lookup',
+    'integer_fields',
+    'date_fields',
+    'text_fields',
+    'json_fields',
+    'relations',
+])
+
+TABLES = {
+    ORGANISMS: TableSpec(
+        'Organism',
+        'organism_type',
+        ('id', 'created_by_id'),
+        ('created_on', 'modified_on'),
+        ('name', 'remarks'),
+        ('identification_info', 'additional_metadata'),
+        ('labels', 'items')),
+    ORGANISM_CAPTURES: TableSpec(
+        'OrganismCapture',
+        'organism__organism_type',
+        (
+            'id',
+            'organism_id',
+            'organism_capture_type_id',
+            'sampling_event_device_id',
+            'created_by_id',
+        ),
+        ('created_on', 'modified_on'),
+        (),
+        ('additional_metadata',),
+        ('labels', 'items')),
+}
+
+SnapshotStats = namedtuple('SnapshotStats', ['written', 'removed', 'unchanged'])
+
+
+def get_model(spec):
+    return apps.get_model('irekua_organisms', spec.model_name)
+
+
+def get_partition_key(collection_id, organism_type_id):
+    return '{}-{}'.format(collection_id, organism_type_id)
+
+
+def get_partition_path(root, table, collection_id, organism_type_id, version=None):
+    path = os.path.join(
+        root,
+        table,
+        'collection={}'.format(collection_id),
+        'organism_type={}'.format(organism_type_id))
+
+    if version is None:
+        return path
+
+    return os.path.join(path, 'version={}'.format(version))
+
+
+def to_microseconds(value):
+    if value is None:
+        return MISSING
+
+    return int(value.timestamp() * 1000000)
+
+
+class ColumnWriter:
+    """Append chunks of a column to disk and save it as .npy when closed.
+
+    Chunks are written to a raw file first, since the length of the
+    column is unknown until the last chunk, and then copied to the .npy
+    file through a memory map.
+    """
+
+    def __init__(self, directory, name, dtype):
+        self.path = os.path.join(directory, name + '.npy')
+        self.dtype = np.dtype(dtype)
+        self.fileobj = open(self.path + '.part', 'wb')
+
+    def append(self, values):
+        np.asarray(values, dtype=self.dtype).tofile(self.fileobj)
+
+    def close(self):
+        self.fileobj.close()
+
+        part = self.fileobj.name
+        if os.path.getsize(part):
+            array = np.memmap(part, dtype=self.dtype, mode='r')
+        else:
+            array = np.zeros(0, dtype=self.dtype)
+
+        np.save(self.path, array)
+        del array
+        os.remove(part)
+
+
+class OffsetsWriter(ColumnWriter):
+    """Write row offsets from the row lengths of every chunk."""
+
+    def __init__(self, directory, name):
+        super().__init__(directory, name + '.offsets', np.int64)
+        self.total = 0
+        self.append([0])
+
+    def append_lengths(self, lengths):
+        offsets = np.cumsum(np.asarray(lengths, dtype=np.int64)) + self.total
+        if len(offsets):
+            self.total = int(offsets[-1])
+
+        self.append(offsets)
+
+
+def write_strings(writers, name, values):
+    encoded = [value.encode('utf-8') for value in values]
+    writers[name + '.offsets'].append_lengths([len(value) for value in encoded])
+    writers[name + '.data'].append(np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+
+def get_partition_states(spec):
+    """Return (rows, last modification) of every partition of a table."""
+    return {
+        get_partition_key(collection_id, organism_type_id): {
+            'collection': collection_id,
+            'organism_type': organism_type_id,
+            'rows': rows,
+            'modified_on': modified_on.isoformat() if modified_on else None,
+        }
+        for collection_id, organism_type_id, rows, modified_on in (
+            get_model(spec).objects
+            .order_by()
+            .values_list('collection', spec.type_lookup)
+            .annotate(rows=Count('id'), last_modified=Max('modified_on')))
+    }
+
+
+def get_relinked_partitions(spec, since):
+    """Return the partitions of objects whose links changed after a change."""
+    from irekua_organisms.models import OrganismChange
+
+    model = get_model(spec)
+    object_ids = set(
+        OrganismChange.objects
+        .filter(
+            id__gt=since,
+            model_name=changes.get_model_name(model),
+            action__in=[
+                OrganismChange.ADD,
+                OrganismChange.REMOVE,
+                OrganismChange.CLEAR,
+            ])
+        .values_list('object_id', flat=True)
+        .iterator())
+
+    partitions = set()
+    for chunk in chunked(sorted(object_ids), DEFAULT_CHUNK_SIZE):
+        partitions.update(
+            get_partition_key(collection_id, organism_type_id)
+            for collection_id, organism_type_id in (
+                model.objects
+                .filter(id__in=chunk)
+                .order_by()
+                .values_list('collection', spec.type_lookup)
+                .distinct()))
+
+    return partitions
+
+
+def write_partition_columns(spec, queryset, directory, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write the columns of a partition to a directory.
+
+    Rows are read in chunks of primary keys and every chunk is appended
+    to the column files, so a partition is never held in memory at once.
+    """
+    fields = spec.integer_fields + spec.date_fields + spec.text_fields + spec.json_fields
+    model = queryset.model
+
+    writers = {}
+    for field in spec.integer_fields:
+        writers[field] = ColumnWriter(directory, field, np.int64)
+
+    for field in spec.date_fields:
+        writers[field] = ColumnWriter(directory, field, 'datetime64[us]')
+
+    for field in spec.text_fields + spec.json_fields:
+        writers[field + '.offsets'] = OffsetsWriter(directory, field)
+        writers[field + '.data'] = ColumnWriter(directory, field + '.data', np.uint8)
+
+    relations = []
+    for relation in spec.relations:
+        field = model._meta.get_field(relation)
+        relations.append((
+            relation,
+            field.remote_field.through,
+            field.m2m_column_name(),
+            field.m2m_reverse_name()))
+        writers[relation + '.offsets'] = OffsetsWriter(directory, relation)
+        writers[relation + '.values'] = ColumnWriter(directory, relation + '.values', np.int64)
+
+    rows = queryset.order_by('id').values_list(*fields)
+    last_id = None
+
+    while True:
+        chunk = rows if last_id is None else rows.filter(id__gt=last_id)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            break
+
+        values = dict(zip(fields, zip(*chunk)))
+        last_id = values['id'][-1]
+
+        for field in spec.integer_fields:
+            writers[field].append([
+                MISSING if value is None else value
+                for value in values[field]])
+
+        for field in spec.date_fields:
+            writers[field].append(np.array(
+                [to_microseconds(value) for value in values[field]],
+                dtype=np.int64).astype('datetime64[us]'))
+
+        for field in spec.text_fields:
+            write_strings(writers, field, (value or '' for value in values[field]))
+
+        for field in spec.json_fields:
+            write_strings(writers, field, (
+                json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+                for value in values[field]))
+
+        ids = np.array(values['id'], dtype=np.int64)
+        for relation, through, source, target in relations:
+            links = np.array(
+                list(
+                    through.objects
+                    .filter(**{source + '__in': values['id']})
+                    .order_by(source, target)
+                    .values_list(source, target)),
+                dtype=np.int64).reshape(-1, 2)
+
+            writers[relation + '.offsets'].append_lengths(
+                np.searchsorted(links[:, 0], ids, side='right') -
+                np.searchsorted(links[:, 0], ids, side='left'))
+            writers[relation + '.values'].append(links[:, 1])
+
+    for writer in writers.values():
+        writer.close()
+
+
+def get_version_path(root, table, state):
+    """Return the path of a partition version relative to the root."""
+    return os.path.relpath(
+        get_partition_path(
+            root,
+            table,
+            state['collection'],
+            state['organism_type'],
+            state['version']),
+        root)
+
+
+def remove_path(root, path):
+    path = os.path.join(root, path)
+
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def get_legacy_files(root, manifest):
+    """Return the column files of partitions written before versions."""
+    files = []
+    for table, states in manifest['tables'].items():
+        for state in states.values():
+            path = get_partition_path(root, table, state['collection'], state['organism_type'])
+            if not os.path.isdir(path):
+                continue
+
+            files.extend(
+                os.path.relpath(os.path.join(path, name), root)
+                for name in os.listdir(path)
+                if name.endswith('.npy'))
+
+    return files
+
+
+def write_partition(
+        spec,
+        root,
+        table,
+        collection_id,
+        organism_type_id,
+        version,
+        chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write a new version of a partition next to the current one.
+
+    The version directory only appears once all of its columns are
+    written. Readers keep using the current version until the manifest
+    points to the new one.
+    """
+    queryset = get_model(spec).objects.filter(**{
+        'collection': collection_id,
+        spec.type_lookup: organism_type_id})
+
+    path = get_partition_path(root, table, collection_id, organism_type_id, version)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+
+    # Left over by a snapshot that failed before its manifest was written,
+    # so no reader uses it.
+    shutil.rmtree(path, ignore_errors=True)
+
+    tmp = tempfile.mkdtemp(dir=parent)
+    try:
+        write_partition_columns(spec, queryset, tmp, chunk_size=chunk_size)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    os.rename(tmp, path)
+
+
+def read_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST), encoding='utf-8') as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {
+            'version': FORMAT_VERSION,
+            'generation': 0,
+            'last_changes': {},
+            'retired': [],
+            'tables': {},
+        }
+
+
+def write_manifest(root, manifest):
+    path = os.path.join(root, MANIFEST)
+    tmp = path + '.tmp'
+
+    with open(tmp, 'w', encoding='utf-8') as fileobj:
+        json.dump(manifest, fileobj, indent=2, sort_keys=True)
+
+    os.replace(tmp, path)
+
+
+def write_snapshot(root, tables=None, full=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write or update a columnar snapshot in the root directory.
+
+    Partitions are rewritten when their row count or latest modified_on
+    changed, or when labels or items of their objects changed in the
+    change feed, since link changes do not touch modified_on. Partitions
+    that no longer exist are dropped from the manifest. With full, every
+    partition is rewritten. The last change read from the feed is kept
+    per table, so updating only some tables does not hide link changes
+    from the others. Returns SnapshotStats by table.
+
+    Rewritten partitions get a new version directory and the manifest is
+    swapped in at the end, so a reader sees either the previous or the
+    new snapshot, never a mix. The versions superseded by this snapshot
+    are removed by the next one.
+    """
+    from irekua_organisms.models import OrganismChange
+
+    os.makedirs(root, exist_ok=True)
+    manifest = read_manifest(root)
+    rewrite = full or manifest.get('version') != FORMAT_VERSION
+
+    # Superseded by the previous snapshot, and so only referenced by
+    # manifests that are two snapshots old.
+    for path in manifest.pop('retired', []):
+        remove_path(root, path)
+
+    retired = []
+    if manifest.get('version') != FORMAT_VERSION:
+        retired.extend(get_legacy_files(root, manifest))
+
+    generation = manifest.get('generation', 0) + 1
+
+    # Manifests written before changes were tracked per table hold a
+    # single marker for all of them.
+    last_changes = manifest.setdefault('last_changes', {})
+    previous_last_change = manifest.pop('last_change', 0)
+
+    # Read before the tables so changes made while writing are picked up
+    # by the next snapshot.
+    last_change = OrganismChange.objects.aggregate(last=Max('id'))['last'] or 0
+
+    stats = {}
+    for table in tables or sorted(TABLES):
+        spec = TABLES[table]
+        previous = manifest['tables'].get(table, {})
+        current = get_partition_states(spec)
+        relinked = get_relinked_partitions(
+            spec,
+            last_changes.get(table, previous_last_change))
+
+        written = 0
+        for key, state in current.items():
+            previous_state = previous.get(key)
+
+            if not rewrite and key not in relinked and previous_state is not None and (
+                    {name: previous_state.get(name) for name in state} == state):
+                state['version'] = previous_state['version']
+                continue
+
+            write_partition(
+                spec,
+                root,
+                table,
+                state['collection'],
+                state['organism_type'],
+                generation,
+                chunk_size=chunk_size)
+            state['version'] = generation
+            written += 1
+
+            if previous_state is not None and 'version' in previous_state:
+                retired.append(get_version_path(root, table, previous_state))
+
+        removed = 0
+        for key in set(previous).difference(current):
+            if 'version' in previous[key]:
+                retired.append(get_version_path(root, table, previous[key]))
+            removed += 1
+
+        manifest['tables'][table] = current
+        last_changes[table] = last_change
+        stats[table] = SnapshotStats(written, removed, len(current) - written)
+
+    for table in manifest['tables']:
+        last_changes.setdefault(table, previous_last_change)
+
+    manifest['version'] = FORMAT_VERSION
+    manifest['generation'] = generation
+    manifest['retired'] = retired
+    write_manifest(root, manifest)
+
+    return stats
+
+
+class SnapshotPartition:
+    def __init__(self, path, collection, organism_type, rows):
+        self.path = path
+        self.collection = collection
+        self.organism_type = organism_type
+        self.rows = rows
+
+    def __repr__(self):
+        return '<SnapshotPartition collection={} organism_type={} rows={}>'.format(
+            self.collection,
+            self.organism_type,
+            self.rows)
+
+    def load(self, name):
+        return np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+
+    def column(self, name):
+        """Return a memory mapped integer or date column."""
+        return self.load(name)
+
+    def texts(self, name, index=None):
+        """Decode a text column, or a single row of it."""
+        offsets = self.load(name + '.offsets')
+        data = self.load(name + '.data')
+
+        if index is not None:
+            return bytes(data[offsets[index]:offsets[index + 1]]).decode('utf-8')
+
+        return [
+            bytes(data[start:end]).decode('utf-8')
+            for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def json(self, name, index=None):
+        if index is not None:
+            return json.loads(self.texts(name, index))
+
+        return [json.loads(value) for value in self.texts(name)]
+
+    def related(self, name, index):
+        """Return the label or item ids of a row."""
+        offsets = self.load(name + '.offsets')
+        return self.load(name + '.values')[offsets[index]:offsets[index + 1]]
+
+
+class SnapshotReader:
+    """Read columnar snapshots without touching the database."""
+
+    def __init__(self, root):
+        self.root = root
+        self.manifest = read_manifest(root)
+
+    def partitions(self, table, collections=None, organism_types=None):
+        states = self.manifest['tables'].get(table, {})
+
+        return [
+            SnapshotPartition(
+                get_partition_path(
+                    self.root,
+                    table,
+                    state['collection'],
+                    state['organism_type'],
+                    state['version']),
+                state['collection'],
+                state['organism_type'],
+                state['rows'])
+            for state in sorted(
+                states.values(),
+                key=lambda state: (state['collection'], state['organism_type']))
+            if (collections is None or state['collection'] in collections) and
+            (organism_types is None or state['organism_type'] in organism_types)
+        ]
+
+    def scan(self, table, columns, collections=None, organism_types=None, where=None):
+        """Yield (partition, arrays) for the selected partitions.
+
+        arrays maps the requested integer or date columns to memory
+        mapped arrays. where, if given, receives those arrays and returns
+        a boolean mask to filter the rows of each partition.
+        """
+        for partition in self.partitions(table, collections, organism_types):
+            arrays = {column: partition.column(column) for column in columns}
+
+            if where is not None:
+                mask = where(arrays)
+                arrays = {column: array[mask] for column, array in arrays.items()}
+
+            yield partition, arrays
@@ -0,0 +1,127 @@
+from collections import defaultdict
+
+from irekua_organisms.utils.iterables import chunked
+
+
+DEFAULT_CHUNK_SIZE = 2000
+
+ORGANISM_VALUES = (
+    'id',
+    'name',
+    'remarks',
+    'collection_id',
+    'organism_type_id',
+    'organism_type__name',
+    'identification_info',
+    'additional_metadata',
+    'created_on',
+    'modified_on',
+)
+
+ORGANISM_CAPTURE_VALUES = (
+    'id',
+    'organism_id',
+    'organism_capture_type_id',
+    'organism_capture_type__name',
+    'sampling_event_device_id',
+    'collection_id',
+    'additional_metadata',
+    'created_on',
+    'modified_on',
+)
+
+
+def get_related_labels(field, ids):
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+
+    labels = defaultdict(list)
+    rows = (
+        through.objects
+        .filter(**{source + '__in': ids})
+        .values_list(
+            source + '_id',
+            target + '__term_type__name',
+            target + '__value'))
+    for source_id, term_type, value in rows:
+        labels[source_id].append('{}: {}'.format(term_type, value))
+
+    return labels
+
+
+def get_related_ids(field, ids):
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+
+    related = defaultdict(list)
+    rows = (
+        through.objects
+        .filter(**{source + '__in': ids})
+        .values_list(source + '_id', target + '_id'))
+    for source_id, target_id in rows:
+        related[source_id].append(target_id)
+
+    return related
+
+
+def iter_rows_with_relations(model, rows, chunk_size):
+    labels_field = model._meta.get_field('labels')
+    items_field = model._meta.get_field('items')
+
+    for chunk in chunked(rows, chunk_size):
+        ids = [row['id'] for row in chunk]
+        labels = get_related_labels(labels_field, ids)
+        items = get_related_ids(items_field, ids)
+
+        for row in chunk:
+            row['labels'] = labels.get(row['id'], [])
+            row['items'] = items.get(row['id'], [])
+            yield row
+
+
+def iter_organism_rows(queryset=None, collections=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield organisms as flat dictionaries.
+
+    Rows are read with a server side cursor, and labels and item ids are
+    fetched for every chunk of rows, so memory use does not grow with the
+    size of the export.
+    """
+    from irekua_organisms.models import Organism
+
+    if queryset is None:
+        queryset = Organism.objects.all()
+
+    if collections:
+        queryset = queryset.filter(collection__in=collections)
+
+    rows = (
+        queryset
+        .order_by('id')
+        .values(*ORGANISM_VALUES)
+        .iterator(chunk_size=chunk_size))
+
+    return iter_rows_with_relations(Organism, rows, chunk_size)
+
+
+def iter_organism_capture_rows(queryset=None, collections=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield organism captures as flat dictionaries.
+
+    See iter_organism_rows.
+    """
+    from irekua_organisms.models import OrganismCapture
+
+    if queryset is None:
+        queryset = OrganismCapture.objects.all()
+
+    if collections:
+        queryset = queryset.filter(collection__in=collections)
+
+    rows = (
+        queryset
+        .order_by('id')
+        .values(*ORGANISM_CAPTURE_VALUES)
+        .iterator(chunk_size=chunk_size))
+
+    return iter_rows_with_relations(OrganismCapture, rows, chunk_size)
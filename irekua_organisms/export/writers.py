@@ -0,0 +1,165 @@
+import io
+import csv
+import json
+import zipfile
+from xml.sax.saxutils import quoteattr
+
+
+LIST_SEPARATOR = ' | '
+
+DWC_NAMESPACE = 'http://rs.tdwg.org/dwc/terms/'
+
+DWC_ORGANISM_FIELDS = (
+    'occurrenceID',
+    'basisOfRecord',
+    'organismID',
+    'organismName',
+    'scientificName',
+    'occurrenceRemarks',
+    'collectionID',
+    'eventDate',
+    'modified',
+    'dynamicProperties',
+    'associatedMedia',
+)
+
+DWC_ORGANISM_CAPTURE_FIELDS = (
+    'occurrenceID',
+    'basisOfRecord',
+    'organismID',
+    'collectionID',
+    'eventDate',
+    'modified',
+    'samplingProtocol',
+    'dynamicProperties',
+    'associatedMedia',
+)
+
+
+def encode_json_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+
+    return str(value)
+
+
+def to_json(value):
+    return json.dumps(value, default=encode_json_value, sort_keys=True)
+
+
+def flatten_value(value):
+    if isinstance(value, dict):
+        return to_json(value)
+
+    if isinstance(value, (list, tuple)):
+        return LIST_SEPARATOR.join(str(element) for element in value)
+
+    if value is None:
+        return ''
+
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+
+    return value
+
+
+def write_csv(rows, fileobj, fields, delimiter=','):
+    writer = csv.writer(fileobj, delimiter=delimiter, lineterminator='\n')
+    writer.writerow(fields)
+
+    count = 0
+    for row in rows:
+        writer.writerow([flatten_value(row.get(field)) for field in fields])
+        count += 1
+
+    return count
+
+
+def write_jsonl(rows, fileobj):
+    count = 0
+    for row in rows:
+        fileobj.write(to_json(row))
+        fileobj.write('\n')
+        count += 1
+
+    return count
+
+
+def organism_to_dwc(row, scientific_name_key='scientific_name', **kwargs):
+    return {
+        'occurrenceID': 'organism:{}'.format(row['id']),
+        'basisOfRecord': 'HumanObservation',
+        'organismID': row['id'],
+        'organismName': row['name'],
+        'scientificName': row['identification_info'].get(scientific_name_key),
+        'occurrenceRemarks': row['remarks'],
+        'collectionID': row['collection_id'],
+        'eventDate': row['created_on'],
+        'modified': row['modified_on'],
+        'dynamicProperties': {
+            'organismType': row['organism_type__name'],
+            'identificationInfo': row['identification_info'],
+            'additionalMetadata': row['additional_metadata'],
+            'labels': row['labels'],
+        },
+        'associatedMedia': row['items'],
+    }
+
+
+def organism_capture_to_dwc(row, **kwargs):
+    return {
+        'occurrenceID': 'capture:{}'.format(row['id']),
+        'basisOfRecord': 'MachineObservation',
+        'organismID': row['organism_id'],
+        'collectionID': row['collection_id'],
+        'eventDate': row['created_on'],
+        'modified': row['modified_on'],
+        'samplingProtocol': row['organism_capture_type__name'],
+        'dynamicProperties': {
+            'samplingEventDevice': row['sampling_event_device_id'],
+            'additionalMetadata': row['additional_metadata'],
+            'labels': row['labels'],
+        },
+        'associatedMedia': row['items'],
+    }
+
+
+def build_dwc_meta(fields, filename):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<archive xmlns="http://rs.tdwg.org/dwc/text/">',
+        '  <core encoding="UTF-8" fieldsTerminatedBy="\\t" '
+        'linesTerminatedBy="\\n" fieldsEnclosedBy="&quot;" ignoreHeaderLines="1" '
+        'rowType="http://rs.tdwg.org/dwc/terms/Occurrence">',
+        '    <files><location>{}</location></files>'.format(filename),
+        '    <id index="0"/>',
+    ]
+    for index, field in enumerate(fields):
+        lines.append('    <field index="{}" term={}/>'.format(
+            index,
+            quoteattr(DWC_NAMESPACE + field)))
+    lines.extend(['  </core>', '</archive>', ''])
+    return '\n'.join(lines)
+
+
+def write_dwca(rows, fileobj, to_dwc, fields, **kwargs):
+    """Write a Darwin Core Archive with a single occurrence core file.
+
+    The occurrence file is streamed into the zip archive so the archive
+    is never held in memory.
+    """
+    filename = 'occurrence.txt'
+
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('meta.xml', build_dwc_meta(fields, filename))
+
+        # The size is unknown while streaming, so ZIP64 headers are always
+        # written to allow occurrence files larger than 2 GiB.
+        with archive.open(filename, 'w', force_zip64=True) as raw:
+            text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+            dwc_rows = (to_dwc(row, **kwargs) for row in rows)
+            count = write_csv(dwc_rows, text, fields, delimiter='\t')
+            text.flush()
+            text.detach()
+
+    return count
@@ -0,0 +1,267 @@
+from collections import namedtuple
+
+import numpy as np
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db.models import Q
+from django.db.models import QuerySet
+
+from irekua_organisms.bulk.base import get_ids
+from irekua_organisms.utils.iterables import chunked
+
+
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_ID_BATCH_SIZE = 10000
+
+
+Adjacency = namedtuple('Adjacency', [
+    'ids',
+    'offsets',
+    'values',
+])
+
+OrganismGraph = namedtuple('OrganismGraph', [
+    'organism_ids',
+    'capture_ids',
+    'capture_organisms',
+    'capture_devices',
+    'organism_items',
+    'organism_labels',
+    'capture_items',
+    'capture_labels',
+])
+
+
+def empty_ids():
+    return np.empty(0, dtype=np.int64)
+
+
+def build_adjacency(ids, links):
+    """Build a CSR adjacency from sorted ids and (source, target) links.
+
+    The targets of ids[i] are values[offsets[i]:offsets[i + 1]]. Links
+    must be sorted by source; sources not in ids are ignored.
+    """
+    links = links[np.isin(links[:, 0], ids)]
+
+    offsets = np.empty(len(ids) + 1, dtype=np.int64)
+    offsets[:-1] = np.searchsorted(links[:, 0], ids, side='left')
+    offsets[-1] = len(links)
+    return Adjacency(ids, offsets, np.ascontiguousarray(links[:, 1]))
+
+
+def get_neighbors(adjacency, source_id):
+    """Return the target ids of a source id, or an empty array."""
+    index = np.searchsorted(adjacency.ids, source_id)
+    if index == len(adjacency.ids) or adjacency.ids[index] != source_id:
+        return empty_ids()
+
+    return adjacency.values[adjacency.offsets[index]:adjacency.offsets[index + 1]]
+
+
+def get_sources(adjacency):
+    """Return the source id of every value, aligned with adjacency.values."""
+    return np.repeat(adjacency.ids, np.diff(adjacency.offsets))
+
+
+def invert_adjacency(adjacency):
+    """Return the adjacency with sources and targets swapped."""
+    sources = get_sources(adjacency)
+    order = np.lexsort((sources, adjacency.values))
+    links = np.column_stack((adjacency.values[order], sources[order]))
+    return build_adjacency(np.unique(links[:, 0]), links)
+
+
+def load_links(field, sources, using, chunk_size):
+    through = field.remote_field.through
+    source = field.m2m_column_name()
+    target = field.m2m_reverse_name()
+
+    return np.array(
+        list(
+            through.objects.using(using)
+            .filter(**{source + '__in': sources})
+            .order_by(source, target)
+            .values_list(source, target)
+            .iterator(chunk_size=chunk_size)),
+        dtype=np.int64).reshape(-1, 2)
+
+
+def get_id_batch_size(using):
+    # Keep IN (...) lists within the backend limit on query parameters.
+    max_params = connections[using].features.max_query_params
+    return min(max_params or DEFAULT_ID_BATCH_SIZE, DEFAULT_ID_BATCH_SIZE)
+
+
+def get_id_batches(values, using):
+    """Split a set of objects into id sources for set-based queries.
+
+    Querysets are kept as a single subquery so ids never travel to the
+    client. Instances or primary keys are sorted and split in batches
+    that fit the backend limit on query parameters.
+    """
+    if isinstance(values, QuerySet):
+        return [values.values('id')]
+
+    ids = sorted(set(get_ids(values)))
+    return list(chunked(ids, get_id_batch_size(using)))
+
+
+def sort_links(links):
+    order = np.lexsort((links[:, 1], links[:, 0]))
+    return links[order]
+
+
+def get_item_organisms(items, using=DEFAULT_DB_ALIAS):
+    """Return the organisms linked to items directly or by capture.
+
+    A subquery is returned when items is a queryset, and a list of ids
+    loaded one batch of items at a time otherwise.
+    """
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import OrganismCapture
+
+    def linked(model, items):
+        field = model._meta.get_field('items')
+        return (
+            field.remote_field.through.objects.using(using)
+            .filter(**{field.m2m_reverse_name() + '__in': items})
+            .values(field.m2m_column_name()))
+
+    def organisms(items):
+        captures = OrganismCapture.objects.using(using).filter(
+            id__in=linked(OrganismCapture, items))
+
+        return (
+            Organism.objects.using(using)
+            .filter(
+                Q(id__in=linked(Organism, items)) |
+                Q(id__in=captures.values('organism_id')))
+            .values('id'))
+
+    if isinstance(items, QuerySet):
+        return organisms(items.values('id'))
+
+    organism_ids = set()
+    for batch in get_id_batches(items, using):
+        organism_ids.update(organisms(batch).values_list('id', flat=True))
+
+    return sorted(organism_ids)
+
+
+def load_graph_part(organisms, using, chunk_size):
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import OrganismCapture
+
+    organism_ids = np.fromiter(
+        Organism.objects.using(using)
+        .filter(id__in=organisms)
+        .order_by('id')
+        .values_list('id', flat=True)
+        .iterator(chunk_size=chunk_size),
+        dtype=np.int64)
+
+    captures = np.array(
+        list(
+            OrganismCapture.objects.using(using)
+            .filter(organism_id__in=organisms)
+            .order_by('id')
+            .values_list('id', 'organism_id', 'sampling_event_device_id')
+            .iterator(chunk_size=chunk_size)),
+        dtype=np.int64).reshape(-1, 3)
+
+    capture_sources = (
+        OrganismCapture.objects.using(using)
+        .filter(organism_id__in=organisms)
+        .values('id'))
+
+    def links(model, relation, sources):
+        return load_links(model._meta.get_field(relation), sources, using, chunk_size)
+
+    return (
+        organism_ids,
+        captures,
+        links(Organism, 'items', organisms),
+        links(Organism, 'labels', organisms),
+        links(OrganismCapture, 'items', capture_sources),
+        links(OrganismCapture, 'labels', capture_sources))
+
+
+def load_organism_graph(organisms, using=DEFAULT_DB_ALIAS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Load the neighborhood of a set of organisms as integer id arrays.
+
+    organisms may be a queryset, instances or primary keys. The graph is
+    loaded with six queries, organisms, captures and the item and label
+    links of both, per batch of ids; a queryset is used as a subquery
+    and loaded as a single batch. Relations are returned as CSR
+    adjacencies sorted by source id, use get_neighbors to walk them and
+    invert_adjacency to walk them backwards.
+    """
+    parts = [
+        load_graph_part(batch, using, chunk_size)
+        for batch in get_id_batches(organisms, using)]
+
+    if parts:
+        (
+            organism_ids,
+            captures,
+            organism_items,
+            organism_labels,
+            capture_items,
+            capture_labels,
+        ) = (np.concatenate(arrays) for arrays in zip(*parts))
+    else:
+        organism_ids = empty_ids()
+        captures = np.empty((0, 3), dtype=np.int64)
+        organism_items = organism_labels = np.empty((0, 2), dtype=np.int64)
+        capture_items = capture_labels = np.empty((0, 2), dtype=np.int64)
+
+    # Batches are disjoint ranges of organism ids, but their captures
+    # may interleave, so capture data is sorted again after merging.
+    captures = captures[np.argsort(captures[:, 0], kind='stable')]
+    capture_ids = np.ascontiguousarray(captures[:, 0])
+
+    return OrganismGraph(
+        organism_ids=organism_ids,
+        capture_ids=capture_ids,
+        capture_organisms=np.ascontiguousarray(captures[:, 1]),
+        capture_devices=np.ascontiguousarray(captures[:, 2]),
+        organism_items=build_adjacency(organism_ids, organism_items),
+        organism_labels=build_adjacency(organism_ids, organism_labels),
+        capture_items=build_adjacency(capture_ids, sort_links(capture_items)),
+        capture_labels=build_adjacency(capture_ids, sort_links(capture_labels)))
+
+
+def load_item_graph(items, using=DEFAULT_DB_ALIAS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Load the graph of the organisms related to a set of items.
+
+    An organism is included when it, or one of its captures, is linked
+    to any of the items. Item querysets are used as subqueries; lists
+    of items are first resolved to organism ids a batch at a time.
+    """
+    return load_organism_graph(
+        get_item_organisms(items, using=using),
+        using=using,
+        chunk_size=chunk_size)
+
+
+def get_capture_adjacency(graph):
+    """Return the organism to capture adjacency of a graph."""
+    order = np.lexsort((graph.capture_ids, graph.capture_organisms))
+    links = np.column_stack((graph.capture_organisms[order], graph.capture_ids[order]))
+    return build_adjacency(graph.organism_ids, links)
+
+
+def get_graph_items(graph):
+    """Return the sorted ids of all items in a graph."""
+    return np.union1d(graph.organism_items.values, graph.capture_items.values)
+
+
+def get_graph_labels(graph):
+    """Return the sorted ids of all labels in a graph."""
+    return np.union1d(graph.organism_labels.values, graph.capture_labels.values)
+
+
+def get_graph_devices(graph):
+    """Return the sorted ids of all sampling event devices in a graph."""
+    return np.unique(graph.capture_devices)
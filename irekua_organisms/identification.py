@@ -0,0 +1,272 @@
+import json
+import logging
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+
+
+INDEXABLE_KEYWORD = 'indexable'
+PATH_SEPARATOR = '.'
+MAX_KEY_LENGTH = 128
+MAX_VALUE_LENGTH = 255
+DEFAULT_BATCH_SIZE = 5000
+
+
+logger = logging.getLogger(__name__)
+
+
+def find_indexable_paths(schema, prefix=()):
+    paths = []
+
+    if not isinstance(schema, dict):
+        return paths
+
+    properties = schema.get('properties', {})
+    if not isinstance(properties, dict):
+        return paths
+
+    for name, subschema in properties.items():
+        if not isinstance(subschema, dict):
+            continue
+
+        path = prefix + (name,)
+        if subschema.get(INDEXABLE_KEYWORD) is True:
+            paths.append(PATH_SEPARATOR.join(path))
+
+        paths.extend(find_indexable_paths(subschema, path))
+        paths.extend(find_indexable_paths(subschema.get('items'), path))
+
+    return paths
+
+
+@lru_cache(maxsize=256)
+def _get_indexable_paths(dump):
+    paths = set(find_indexable_paths(json.loads(dump)))
+
+    too_long = sorted(path for path in paths if len(path) > MAX_KEY_LENGTH)
+    if too_long:
+        logger.warning(
+            'Identification paths longer than %s characters are not indexed: %s',
+            MAX_KEY_LENGTH,
+            ', '.join(too_long))
+
+    return tuple(sorted(paths.difference(too_long)))
+
+
+def get_indexable_paths(schema):
+    """Return the paths declared as indexable in an identification schema.
+
+    A property is indexable when its subschema has "indexable": true.
+    Nested properties are joined with dots, e.g. "taxon.genus", and
+    properties of array items share the path of the array. Paths longer
+    than MAX_KEY_LENGTH cannot be stored; they are left out and logged,
+    and validate_indexable_paths rejects schemas declaring them.
+    """
+    return _get_indexable_paths(json.dumps(schema, sort_keys=True))
+
+
+def validate_indexable_paths(schema):
+    too_long = sorted(
+        path for path in set(find_indexable_paths(schema))
+        if len(path) > MAX_KEY_LENGTH)
+
+    if too_long:
+        msg = _(
+            'Indexable paths cannot be longer than %(max_length)s characters: '
+            '%(paths)s')
+        params = dict(max_length=MAX_KEY_LENGTH, paths=', '.join(too_long))
+        raise ValidationError(msg % params)
+
+
+def normalize_value(value):
+    """Return the indexed form of a value, or None if it is not indexed.
+
+    Strings longer than MAX_VALUE_LENGTH are truncated, both when indexed
+    and when looked up, so long values are matched by their prefix.
+    """
+    if isinstance(value, str):
+        return value[:MAX_VALUE_LENGTH]
+
+    if isinstance(value, (bool, int, float)):
+        return json.dumps(value)[:MAX_VALUE_LENGTH]
+
+    return None
+
+
+def get_path_values(data, path):
+    values = [data]
+
+    for key in path.split(PATH_SEPARATOR):
+        found = []
+        for value in values:
+            if isinstance(value, list):
+                found.extend(
+                    item[key] for item in value
+                    if isinstance(item, dict) and key in item)
+            elif isinstance(value, dict) and key in value:
+                found.append(value[key])
+        values = found
+
+    flat = []
+    for value in values:
+        if isinstance(value, list):
+            flat.extend(value)
+        else:
+            flat.append(value)
+
+    return flat
+
+
+def extract_identification(identification_info, paths):
+    """Return the (path, value) pairs to index for identification info.
+
+    Only strings, numbers and booleans are indexed. Values longer than
+    MAX_VALUE_LENGTH are truncated, see normalize_value.
+    """
+    pairs = []
+
+    for path in paths:
+        for value in get_path_values(identification_info, path):
+            value = normalize_value(value)
+
+            if value is None:
+                continue
+
+            pairs.append((path, value))
+
+    return list(dict.fromkeys(pairs))
+
+
+def get_type_paths(organism_type_ids, organism_type_model=None, using=DEFAULT_DB_ALIAS):
+    if organism_type_model is None:
+        from irekua_organisms.models import OrganismType as organism_type_model
+
+    return {
+        pk: get_indexable_paths(schema)
+        for pk, schema in organism_type_model.objects.using(using)
+        .filter(id__in=set(organism_type_ids))
+        .values_list('id', 'identification_info_schema')}
+
+
+def build_identifications(rows, type_paths, identification_model=None):
+    """Build identification rows from (organism id, type id, info) tuples."""
+    if identification_model is None:
+        from irekua_organisms.models import OrganismIdentification as identification_model
+
+    return [
+        identification_model(
+            organism_id=organism_id,
+            organism_type_id=organism_type_id,
+            key=key,
+            value=value)
+        for organism_id, organism_type_id, identification_info in rows
+        for key, value in extract_identification(
+            identification_info,
+            type_paths.get(organism_type_id, ()))]
+
+
+def index_organisms(organisms, replace=True, using=DEFAULT_DB_ALIAS):
+    """Store the identification rows of the given organisms.
+
+    With replace, existing rows of the organisms are deleted first.
+    """
+    from irekua_organisms.models import OrganismIdentification
+
+    rows = [
+        (organism.pk, organism.organism_type_id, organism.identification_info)
+        for organism in organisms]
+
+    if not rows:
+        return
+
+    if replace:
+        (
+            OrganismIdentification.objects.using(using)
+            .filter(organism__in=[row[0] for row in rows])
+            .delete()
+        )
+
+    type_paths = get_type_paths({row[1] for row in rows}, using=using)
+    OrganismIdentification.objects.using(using).bulk_create(
+        build_identifications(rows, type_paths),
+        batch_size=DEFAULT_BATCH_SIZE,
+        ignore_conflicts=True)
+
+
+def reindex_organisms(
+        queryset,
+        batch_size=DEFAULT_BATCH_SIZE,
+        organism_type_model=None,
+        identification_model=None):
+    """Rebuild the identification rows of the organisms in queryset.
+
+    Organisms are streamed in batches and the rows of each batch are
+    replaced. The model arguments allow running from migrations.
+    """
+    if identification_model is None:
+        from irekua_organisms.models import OrganismIdentification as identification_model
+
+    using = queryset.db
+    rows = (
+        queryset
+        .order_by()
+        .values_list('id', 'organism_type_id', 'identification_info')
+        .iterator(chunk_size=batch_size))
+
+    type_paths = {}
+    count = 0
+    batch = []
+
+    def flush():
+        missing = {row[1] for row in batch}.difference(type_paths)
+        type_paths.update(get_type_paths(
+            missing,
+            organism_type_model=organism_type_model,
+            using=using))
+
+        (
+            identification_model.objects.using(using)
+            .filter(organism__in=[row[0] for row in batch])
+            .delete()
+        )
+        identification_model.objects.using(using).bulk_create(
+            build_identifications(batch, type_paths, identification_model),
+            batch_size=batch_size,
+            ignore_conflicts=True)
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            flush()
+            count += len(batch)
+            batch = []
+
+    if batch:
+        flush()
+        count += len(batch)
+
+    return count
+
+
+def get_criteria_lookups(criteria):
+    """Translate identified_as keyword criteria to (path, values) pairs.
+
+    Double underscores separate nested keys, so taxon__genus='Puma'
+    matches the "taxon.genus" path. Lists match any of their values.
+    """
+    lookups = []
+
+    for key, value in criteria.items():
+        path = key.replace('__', PATH_SEPARATOR)
+
+        if isinstance(value, (list, tuple, set, frozenset)):
+            values = [normalize_value(item) for item in value]
+        else:
+            values = [normalize_value(value)]
+
+        lookups.append((path, [value for value in values if value is not None]))
+
+    return lookups
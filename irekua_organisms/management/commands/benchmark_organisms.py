@@ -0,0 +1,144 @@
+from django.db import connection
+from django.db import transaction
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from irekua_organisms.benchmarks.fixtures import BenchmarkData
+from irekua_organisms.benchmarks.runner import DEFAULT_THRESHOLD
+from irekua_organisms.benchmarks.runner import measure
+from irekua_organisms.benchmarks.runner import compare
+from irekua_organisms.benchmarks.runner import check_constant_queries
+from irekua_organisms.benchmarks.runner import load_baseline
+from irekua_organisms.benchmarks.runner import save_baseline
+from irekua_organisms.benchmarks.workloads import DEFAULT_ITERATIONS
+from irekua_organisms.benchmarks.workloads import DEFAULT_SIZES
+from irekua_organisms.benchmarks.workloads import get_write_path_workloads
+from irekua_organisms.benchmarks.workloads import get_sized_workloads
+from irekua_organisms.snapshots import clear_config_snapshots
+from irekua_organisms.utils import validator_cache
+from irekua_organisms.utils import invalidate_allowed_term_types
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark query counts, wall time and peak memory of the organism '
+        'write, list and export paths. All benchmark data is created inside '
+        'a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=list(DEFAULT_SIZES),
+            help='Number of stored organisms for list and export workloads.')
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=DEFAULT_ITERATIONS,
+            help='Calls per timing run of the write path workloads.')
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Timing runs per workload. The best run is reported.')
+        parser.add_argument(
+            '--collection',
+            type=int,
+            help='Collection in which benchmark organisms are created.')
+        parser.add_argument(
+            '--sampling-event-device',
+            type=int,
+            help='Sampling event device used by benchmark captures.')
+        parser.add_argument(
+            '--baseline',
+            help='JSON file with baseline results, keyed by database vendor.')
+        parser.add_argument(
+            '--save',
+            action='store_true',
+            help='Store the results as the new baseline instead of comparing.')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help='Allowed relative increase of wall time and peak memory.')
+
+    def handle(self, *args, **options):
+        data = BenchmarkData(
+            collection=options['collection'],
+            sampling_event_device=options['sampling_event_device'])
+
+        try:
+            with transaction.atomic():
+                workloads, results = self.run(data, options)
+                raise Rollback
+        except Rollback:
+            pass
+        except ValueError as error:
+            raise CommandError(str(error))
+        finally:
+            clear_caches()
+
+        vendor = connection.vendor
+        baseline_path = options['baseline']
+
+        if baseline_path and options['save']:
+            save_baseline(baseline_path, vendor, results)
+            self.stdout.write('Baseline saved to {}'.format(baseline_path))
+            return
+
+        failures = []
+        for name in check_constant_queries(workloads, results):
+            failures.append('{}: query count grows with result size'.format(name))
+
+        if baseline_path:
+            baseline = load_baseline(baseline_path).get(vendor, {})
+            regressions = compare(results, baseline, threshold=options['threshold'])
+            for key, metric, before, after in regressions:
+                failures.append('{}: {} regressed from {} to {}'.format(
+                    key, metric, before, after))
+
+        if failures:
+            raise CommandError(
+                'Performance regressions found:\n' + '\n'.join(failures))
+
+    def run(self, data, options):
+        data.setup()
+
+        workloads = get_write_path_workloads(data, iterations=options['iterations'])
+        results = {}
+        for workload in workloads:
+            results[workload.key] = self.measure(workload, options)
+
+        for size in sorted(options['sizes']):
+            data.grow(size)
+
+            for workload in get_sized_workloads(data, size):
+                workloads.append(workload)
+                results[workload.key] = self.measure(workload, options)
+
+        return workloads, results
+
+    def measure(self, workload, options):
+        result = measure(workload, repeat=options['repeat'])
+        self.stdout.write(
+            '{:<60} {:>6} queries {:>12.6f} s {:>12} bytes'.format(
+                workload.key,
+                result['queries'],
+                result['seconds'],
+                result['peak_memory']))
+        return result
+
+
+def clear_caches():
+    from irekua_organisms.models import OrganismType
+    from irekua_organisms.models import OrganismCaptureType
+
+    clear_config_snapshots()
+    validator_cache.clear()
+    for model in (OrganismType, OrganismCaptureType):
+        invalidate_allowed_term_types(model, model.objects.values_list('pk', flat=True))
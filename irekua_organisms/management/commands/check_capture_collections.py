@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from irekua_database.models import SamplingEventDevice
+
+from irekua_organisms.models import OrganismCapture
+from irekua_organisms.utils.denormalization import DEFAULT_BATCH_SIZE
+from irekua_organisms.utils.denormalization import backfill_capture_collections
+from irekua_organisms.utils.denormalization import get_inconsistent_captures
+
+
+SAMPLE_SIZE = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Check that the denormalized collection and collection type of '
+        'organism captures match their sampling event device.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Copy the collection and collection type from the sampling event device.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        inconsistent = get_inconsistent_captures(OrganismCapture.objects.all())
+        count = inconsistent.count()
+
+        if not count:
+            self.stdout.write(self.style.SUCCESS('All organism captures are consistent'))
+            return
+
+        sample = list(inconsistent.order_by('id').values_list('id', flat=True)[:SAMPLE_SIZE])
+        self.stdout.write('{} inconsistent organism captures, e.g. {}'.format(
+            count,
+            ', '.join(str(pk) for pk in sample)))
+
+        if not options['fix']:
+            raise CommandError('Run with --fix to repair inconsistent captures')
+
+        updated = backfill_capture_collections(
+            inconsistent,
+            SamplingEventDevice,
+            batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            'Updated {} organism captures'.format(updated)))
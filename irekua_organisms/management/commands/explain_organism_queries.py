@@ -0,0 +1,62 @@
+from django.db import connection
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from irekua_organisms.benchmarks.query_plans import get_hot_path_queries
+from irekua_organisms.benchmarks.query_plans import explain_queries
+from irekua_organisms.benchmarks.query_plans import explain_without_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        'Print the query plans of the organism hot path queries. With '
+        '--compare, also print the plans without the organism indexes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run the queries with EXPLAIN ANALYZE.')
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help=(
+                'Also explain the queries with index scans disabled by the '
+                'planner settings of a rolled back transaction (PostgreSQL only).'))
+        parser.add_argument(
+            '--drop-indexes',
+            action='store_true',
+            help=(
+                'With --compare, drop the organism indexes inside the rolled '
+                'back transaction instead. This locks the organism tables '
+                'against all reads and writes until the plans are done; only '
+                'use it on a scratch database.'))
+
+    def handle(self, *args, **options):
+        queries = get_hot_path_queries()
+        after = explain_queries(queries, analyze=options['analyze'])
+
+        if not options['compare']:
+            self.print_plans(after)
+            return
+
+        if connection.vendor != 'postgresql':
+            raise CommandError('--compare is only supported on PostgreSQL')
+
+        before = explain_without_indexes(
+            queries,
+            analyze=options['analyze'],
+            drop_indexes=options['drop_indexes'])
+        for (name, plan_before), (unused, plan_after) in zip(before, after):
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(self.style.MIGRATE_LABEL('  Without indexes:'))
+            self.stdout.write(plan_before)
+            self.stdout.write(self.style.MIGRATE_LABEL('  With indexes:'))
+            self.stdout.write(plan_after)
+            self.stdout.write('')
+
+    def print_plans(self, plans):
+        for name, plan in plans:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            self.stdout.write('')
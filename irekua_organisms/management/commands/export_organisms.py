@@ -0,0 +1,76 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from irekua_organisms.export import DEFAULT_CHUNK_SIZE
+from irekua_organisms.export import DWCA
+from irekua_organisms.export import EXPORTS
+from irekua_organisms.export import FORMATS
+from irekua_organisms.export import ORGANISMS
+from irekua_organisms.export import export
+
+
+class Command(BaseCommand):
+    help = 'Stream organisms or organism captures to CSV, JSON Lines or a Darwin Core Archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'kind',
+            nargs='?',
+            choices=sorted(EXPORTS),
+            default=ORGANISMS)
+        parser.add_argument(
+            '--format',
+            dest='output_format',
+            choices=FORMATS,
+            default=FORMATS[0])
+        parser.add_argument(
+            '--output',
+            '-o',
+            help='Output file. Defaults to standard output for text formats.')
+        parser.add_argument(
+            '--collection',
+            dest='collections',
+            type=int,
+            action='append',
+            help='Restrict the export to this collection id. May be repeated.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--scientific-name-key',
+            default='scientific_name',
+            help='Identification info key used as Darwin Core scientificName.')
+
+    def handle(self, *args, **options):
+        output_format = options['output_format']
+        output = options['output']
+
+        if output_format == DWCA and output is None:
+            raise CommandError('Darwin Core Archives need an --output file')
+
+        if output is None:
+            fileobj = sys.stdout
+        elif output_format == DWCA:
+            fileobj = open(output, 'wb')
+        else:
+            fileobj = open(output, 'w', newline='', encoding='utf-8')
+
+        try:
+            stats = export(
+                fileobj,
+                kind=options['kind'],
+                output_format=output_format,
+                collections=options['collections'],
+                chunk_size=options['chunk_size'],
+                scientific_name_key=options['scientific_name_key'])
+        finally:
+            if fileobj is not sys.stdout:
+                fileobj.close()
+
+        self.stderr.write('Exported {} rows in {:.2f}s ({:.1f} rows/s)'.format(
+            stats.rows,
+            stats.seconds,
+            stats.rows_per_second))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from irekua_organisms.models import Organism
+from irekua_organisms.identification import DEFAULT_BATCH_SIZE
+from irekua_organisms.identification import reindex_organisms
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the organism identification index from identification info'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organism-type',
+            dest='organism_types',
+            type=int,
+            action='append',
+            help='Only rebuild organisms of this type id. May be repeated.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = Organism.objects.all()
+        if options['organism_types']:
+            queryset = queryset.filter(organism_type__in=options['organism_types'])
+
+        count = reindex_organisms(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            'Indexed identification of {} organisms'.format(count)))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from irekua_organisms.models import Organism
+from irekua_organisms.search import DEFAULT_BATCH_SIZE
+from irekua_organisms.search import update_search
+
+
+class Command(BaseCommand):
+    help = 'Recompute the search text and search vector of organisms'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--collection',
+            dest='collections',
+            type=int,
+            action='append',
+            help='Only rebuild organisms of this collection id. May be repeated.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = Organism.objects.all()
+        if options['collections']:
+            queryset = queryset.filter(collection__in=options['collections'])
+
+        count = update_search(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            'Updated search of {} organisms'.format(count)))
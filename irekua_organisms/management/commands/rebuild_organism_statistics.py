@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from irekua_organisms.statistics import rebuild_statistics
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per collection organism and capture statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--collection',
+            dest='collections',
+            type=int,
+            action='append',
+            help='Only rebuild this collection id. May be repeated.')
+
+    def handle(self, *args, **options):
+        rebuild_statistics(collections=options['collections'])
+        self.stdout.write(self.style.SUCCESS('Organism statistics rebuilt'))
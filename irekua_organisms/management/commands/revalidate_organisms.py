@@ -0,0 +1,109 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from irekua_organisms.models import RevalidationJob
+from irekua_organisms.revalidation import DEFAULT_BATCH_SIZE
+from irekua_organisms.revalidation import REVALIDATIONS
+from irekua_organisms.revalidation import get_stale_organisms
+from irekua_organisms.revalidation import get_stale_organism_captures
+from irekua_organisms.revalidation import revalidate_organisms
+from irekua_organisms.revalidation import revalidate_organism_captures
+from irekua_organisms.revalidation import start_revalidation_job
+from irekua_organisms.revalidation import run_revalidation_job
+
+
+REVALIDATE = {
+    RevalidationJob.ORGANISMS: (get_stale_organisms, revalidate_organisms),
+    RevalidationJob.ORGANISM_CAPTURES: (get_stale_organism_captures, revalidate_organism_captures),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Recheck organisms or organism captures whose schemas or collection '
+        'type configuration changed since they were last validated. '
+        'Violations are written as JSON Lines. With --report the check runs '
+        'as a resumable job.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'kind',
+            choices=sorted(REVALIDATIONS),
+            default=RevalidationJob.ORGANISMS,
+            nargs='?')
+        parser.add_argument(
+            '--type',
+            dest='types',
+            type=int,
+            action='append',
+            help='Only recheck this organism or capture type id. May be repeated.')
+        parser.add_argument(
+            '--report',
+            help='Start a resumable job that writes violations to this file.')
+        parser.add_argument(
+            '--resume',
+            type=int,
+            metavar='JOB_ID',
+            help='Resume an interrupted job from its last checkpoint.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help=(
+                'Number of validation processes. Defaults to the '
+                'IREKUA_ORGANISMS_VALIDATION_WORKERS setting, or 1.'))
+
+    def handle(self, *args, **options):
+        if options['resume'] is not None:
+            try:
+                job = RevalidationJob.objects.get(pk=options['resume'])
+            except RevalidationJob.DoesNotExist:
+                raise CommandError('Revalidation job {} does not exist'.format(options['resume']))
+
+            if job.status == RevalidationJob.FINISHED:
+                raise CommandError('Revalidation job {} already finished'.format(job.pk))
+
+            self.run_job(job, options)
+            return
+
+        if options['report'] is not None:
+            job = start_revalidation_job(
+                options['kind'],
+                options['report'],
+                types=options['types'])
+            self.stderr.write('Started revalidation job {}'.format(job.pk))
+            self.run_job(job, options)
+            return
+
+        get_stale, revalidate = REVALIDATE[options['kind']]
+        result = revalidate(
+            get_stale(options['types']),
+            batch_size=options['batch_size'],
+            workers=options['workers'])
+
+        for pk, errors in sorted(result.errors.items()):
+            self.stdout.write(json.dumps({'id': pk, 'errors': errors}))
+
+        self.stderr.write('Checked {}, updated {}, invalid {}'.format(
+            result.checked,
+            result.updated,
+            len(result.errors)))
+
+    def run_job(self, job, options):
+        job = run_revalidation_job(
+            job,
+            batch_size=options['batch_size'],
+            workers=options['workers'])
+
+        self.stderr.write(
+            'Job {}: checked {}, updated {}, invalid {}. Report: {}'.format(
+                job.pk,
+                job.checked,
+                job.updated,
+                job.invalid,
+                job.report_path))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from irekua_organisms.export.rows import DEFAULT_CHUNK_SIZE
+from irekua_organisms.export.columnar import TABLES
+from irekua_organisms.export.columnar import write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Write or update a columnar snapshot of organisms and organism '
+        'captures, partitioned by collection and organism type')
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Snapshot directory')
+        parser.add_argument(
+            '--table',
+            dest='tables',
+            choices=sorted(TABLES),
+            action='append',
+            help='Only snapshot this table. May be repeated.')
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rewrite every partition instead of only the changed ones.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        stats = write_snapshot(
+            options['output'],
+            tables=options['tables'],
+            full=options['full'],
+            chunk_size=options['chunk_size'])
+
+        for table, table_stats in sorted(stats.items()):
+            self.stdout.write('{}: {} partitions written, {} removed, {} unchanged'.format(
+                table,
+                table_stats.written,
+                table_stats.removed,
+                table_stats.unchanged))
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from irekua_organisms.changes import DEFAULT_LIMIT
+from irekua_organisms.changes import iter_changes
+from irekua_organisms.models import OrganismChange
+
+
+class Command(BaseCommand):
+    help = 'Stream organism and organism capture changes as JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            type=int,
+            default=0,
+            help='Only stream changes with a greater sequence number.')
+        parser.add_argument(
+            '--model',
+            dest='model_names',
+            action='append',
+            choices=[name for name, unused in OrganismChange.MODEL_CHOICES],
+            help='Only stream changes of this model. May be repeated.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_LIMIT)
+        parser.add_argument(
+            '--follow',
+            action='store_true',
+            help='Keep polling for new changes.')
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds between polls when following.')
+
+    def handle(self, *args, **options):
+        last = options['since']
+        changes = iter_changes(
+            seq=last,
+            chunk_size=options['chunk_size'],
+            model_names=options['model_names'],
+            follow=options['follow'],
+            poll_interval=options['poll_interval'])
+
+        try:
+            for change in changes:
+                self.stdout.write(json.dumps(change.to_dict()))
+                last = change.seq
+        except KeyboardInterrupt:
+            pass
+
+        self.stderr.write('Last sequence: {}'.format(last))
@@ -0,0 +1,81 @@
+import sys
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from irekua_organisms.bulk import validate_organism_records
+from irekua_organisms.bulk import validate_organism_capture_records
+from irekua_organisms.bulk.base import DEFAULT_BATCH_SIZE
+from irekua_organisms.export import ORGANISMS
+from irekua_organisms.export import ORGANISM_CAPTURES
+
+
+VALIDATORS = {
+    ORGANISMS: validate_organism_records,
+    ORGANISM_CAPTURES: validate_organism_capture_records,
+}
+
+
+def read_records(fileobj):
+    for line in fileobj:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = (
+        'Validate organism or organism capture records from a JSON Lines '
+        'file without storing them. Errors are written as JSON Lines.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'kind',
+            choices=sorted(VALIDATORS),
+            default=ORGANISMS,
+            nargs='?')
+        parser.add_argument(
+            '--input',
+            '-i',
+            help='JSON Lines file with one record per line. Defaults to standard input.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help=(
+                'Number of validation processes. Defaults to the '
+                'IREKUA_ORGANISMS_VALIDATION_WORKERS setting, or 1.'))
+
+    def handle(self, *args, **options):
+        validate = VALIDATORS[options['kind']]
+
+        if options['input'] is None:
+            fileobj = sys.stdin
+        else:
+            fileobj = open(options['input'], encoding='utf-8')
+
+        start = time.perf_counter()
+        try:
+            result = validate(
+                read_records(fileobj),
+                batch_size=options['batch_size'],
+                workers=options['workers'])
+        finally:
+            if fileobj is not sys.stdin:
+                fileobj.close()
+        seconds = time.perf_counter() - start
+
+        for index, errors in sorted(result.errors.items()):
+            self.stdout.write(json.dumps({'index': index, 'errors': errors}))
+
+        if result.has_errors:
+            raise CommandError('{} invalid records ({:.2f}s)'.format(
+                len(result.errors),
+                seconds))
+
+        self.stderr.write('All records are valid ({:.2f}s)'.format(seconds))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from irekua_organisms.models import OrganismType
+from irekua_organisms.models import OrganismCaptureType
+from irekua_organisms.thumbnails import DEFAULT_WORKERS
+from irekua_organisms.thumbnails import warm_icon_thumbnails
+
+
+MODELS = {
+    'organism_types': OrganismType,
+    'capture_types': OrganismCaptureType,
+}
+
+
+class Command(BaseCommand):
+    help = 'Pre-generate the icon thumbnails of organism and capture types'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            dest='models',
+            choices=sorted(MODELS),
+            action='append',
+            help='Only warm thumbnails of these types. May be repeated.')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS)
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate thumbnails that are already stored.')
+
+    def handle(self, *args, **options):
+        models = [MODELS[name] for name in options['models'] or sorted(MODELS)]
+
+        count = warm_icon_thumbnails(
+            models,
+            workers=options['workers'],
+            force=options['force'])
+        self.stdout.write(self.style.SUCCESS(
+            'Generated icon thumbnails of {} types'.format(count)))
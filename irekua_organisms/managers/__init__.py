@@ -0,0 +1,24 @@
+from irekua_organisms.managers.organism import OrganismManager
+from irekua_organisms.managers.organism import OrganismQuerySet
+from irekua_organisms.managers.organism_capture import OrganismCaptureManager
+from irekua_organisms.managers.organism_capture import OrganismCaptureQuerySet
+from irekua_organisms.managers.organism_member import OrganismMemberManager
+from irekua_organisms.managers.organism_member import OrganismMemberQuerySet
+from irekua_organisms.managers.organism_type import OrganismTypeManager
+from irekua_organisms.managers.organism_type import OrganismTypeQuerySet
+from irekua_organisms.managers.organism_capture_type import OrganismCaptureTypeManager
+from irekua_organisms.managers.organism_capture_type import OrganismCaptureTypeQuerySet
+
+
+__all__ = [
+    'OrganismManager',
+    'OrganismQuerySet',
+    'OrganismCaptureManager',
+    'OrganismCaptureQuerySet',
+    'OrganismMemberManager',
+    'OrganismMemberQuerySet',
+    'OrganismTypeManager',
+    'OrganismTypeQuerySet',
+    'OrganismCaptureTypeManager',
+    'OrganismCaptureTypeQuerySet',
+]
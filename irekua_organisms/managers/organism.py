@@ -0,0 +1,113 @@
+from django.db import models
+from django.db.models.functions import Coalesce
+
+from irekua_database.models import Term
+
+from irekua_organisms.bulk import bulk_ingest_organisms
+from irekua_organisms.bulk.base import DEFAULT_BATCH_SIZE
+from irekua_organisms.bulk.base import get_id
+from irekua_organisms.identification import get_criteria_lookups
+from irekua_organisms.pagination import DEFAULT_PAGE_SIZE
+from irekua_organisms.pagination import get_page
+from irekua_organisms.search import search_organisms
+
+
+class OrganismQuerySet(models.QuerySet):
+    def with_labels_and_items(self):
+        return self.prefetch_related(
+            models.Prefetch(
+                'labels',
+                queryset=Term.objects.select_related('term_type')),
+            'items')
+
+    def with_context(self):
+        return self.select_related(
+            'organism_type',
+            'collection__collection_type',
+        ).with_labels_and_items()
+
+    def identified_as(self, **criteria):
+        """Filter organisms by indexed identification fields.
+
+        Each keyword is a path declared as indexable in the organism type
+        schema, with double underscores between nested keys, e.g.
+        identified_as(taxon__genus='Puma'). Lookups use the organism
+        identification table instead of the JSON column.
+        """
+        from irekua_organisms.models import OrganismIdentification
+
+        queryset = self
+        for path, values in get_criteria_lookups(criteria):
+            identifications = OrganismIdentification.objects.filter(
+                organism=models.OuterRef('pk'),
+                key=path,
+                value__in=values)
+            queryset = queryset.filter(models.Exists(identifications))
+
+        return queryset
+
+    def search(self, q):
+        """Return organisms matching q, best matches first, annotated with rank."""
+        return search_organisms(self, q)
+
+    def keyset_page(
+            self,
+            limit=DEFAULT_PAGE_SIZE,
+            after=None,
+            before=None,
+            collection=None,
+            organism_type=None):
+        """Return a Page of organisms, newest first, using keyset pagination."""
+        queryset = self
+        if collection is not None:
+            queryset = queryset.filter(collection=get_id(collection))
+        if organism_type is not None:
+            queryset = queryset.filter(organism_type=get_id(organism_type))
+
+        return get_page(queryset, limit=limit, after=after, before=before)
+
+    def with_individuals(self):
+        """Annotate organisms with their number of individuals.
+
+        Multi organisms count the sum of their member counts and any
+        other organism counts as one.
+        """
+        return self.annotate(
+            individuals=Coalesce(models.Sum('members__count'), 1))
+
+    def total_individuals(self):
+        """Return the number of individuals with a single aggregate query."""
+        return self.order_by().aggregate(
+            total=Coalesce(models.Sum(Coalesce('members__count', 1)), 0))['total']
+
+    def individuals_by_collection(self):
+        """Map collection ids to their number of individuals in one query."""
+        return dict(
+            self.order_by()
+            .values('collection')
+            .annotate(individuals=models.Sum(Coalesce('members__count', 1)))
+            .values_list('collection', 'individuals'))
+
+    def individuals_by_organism_type(self):
+        """Map organism type ids to their number of individuals in one query.
+
+        Members are counted under their own organism type, and organisms
+        without members under the type of the organism.
+        """
+        return dict(
+            self.order_by()
+            .annotate(member_type=Coalesce('members__organism_type', 'organism_type'))
+            .values('member_type')
+            .annotate(individuals=models.Sum(Coalesce('members__count', 1)))
+            .values_list('member_type', 'individuals'))
+
+    def bulk_ingest(self, records, batch_size=DEFAULT_BATCH_SIZE, user=None, workers=None):
+        return bulk_ingest_organisms(
+            records,
+            batch_size=batch_size,
+            user=user,
+            workers=workers,
+            using=self.db)
+
+
+OrganismManager = models.Manager.from_queryset(OrganismQuerySet)
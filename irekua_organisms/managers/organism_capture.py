@@ -0,0 +1,56 @@
+from django.db import models
+
+from irekua_database.models import Term
+
+from irekua_organisms.bulk import bulk_ingest_organism_captures
+from irekua_organisms.bulk.base import DEFAULT_BATCH_SIZE
+from irekua_organisms.bulk.base import get_id
+from irekua_organisms.pagination import DEFAULT_PAGE_SIZE
+from irekua_organisms.pagination import get_page
+
+
+class OrganismCaptureQuerySet(models.QuerySet):
+    def with_labels_and_items(self):
+        return self.prefetch_related(
+            models.Prefetch(
+                'labels',
+                queryset=Term.objects.select_related('term_type')),
+            'items')
+
+    def with_context(self):
+        return self.select_related(
+            'organism_capture_type',
+            'organism__organism_type',
+            'sampling_event_device__sampling_event__collection__collection_type',
+        ).with_labels_and_items()
+
+    def keyset_page(
+            self,
+            limit=DEFAULT_PAGE_SIZE,
+            after=None,
+            before=None,
+            collection=None,
+            organism_capture_type=None,
+            organism_type=None):
+        """Return a Page of organism captures, newest first, using keyset pagination."""
+        queryset = self
+        if collection is not None:
+            queryset = queryset.filter(collection=get_id(collection))
+        if organism_capture_type is not None:
+            queryset = queryset.filter(organism_capture_type=get_id(organism_capture_type))
+        if organism_type is not None:
+            queryset = queryset.filter(
+                organism_capture_type__organism_type=get_id(organism_type))
+
+        return get_page(queryset, limit=limit, after=after, before=before)
+
+    def bulk_ingest(self, records, batch_size=DEFAULT_BATCH_SIZE, user=None, workers=None):
+        return bulk_ingest_organism_captures(
+            records,
+            batch_size=batch_size,
+            user=user,
+            workers=workers,
+            using=self.db)
+
+
+OrganismCaptureManager = models.Manager.from_queryset(OrganismCaptureQuerySet)
@@ -0,0 +1,15 @@
+from django.db import models
+
+from irekua_organisms.search import search_types
+from irekua_organisms.thumbnails import get_icon_urls
+
+
+class OrganismCaptureTypeQuerySet(models.QuerySet):
+    def search(self, q):
+        return search_types(self, q)
+
+    def icon_urls(self, size):
+        return get_icon_urls(self, size)
+
+
+OrganismCaptureTypeManager = models.Manager.from_queryset(OrganismCaptureTypeQuerySet)
@@ -0,0 +1,22 @@
+from django.db import models
+from django.db.models.functions import Coalesce
+
+from irekua_organisms.bulk import bulk_ingest_organism_members
+from irekua_organisms.bulk.base import DEFAULT_BATCH_SIZE
+
+
+class OrganismMemberQuerySet(models.QuerySet):
+    def total_individuals(self):
+        """Return the sum of member counts with a single aggregate query."""
+        return self.aggregate(
+            total=Coalesce(models.Sum('count'), 0))['total']
+
+    def bulk_ingest(self, records, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+        return bulk_ingest_organism_members(
+            records,
+            batch_size=batch_size,
+            workers=workers,
+            using=self.db)
+
+
+OrganismMemberManager = models.Manager.from_queryset(OrganismMemberQuerySet)
@@ -0,0 +1,43 @@
+# Generated by Django 3.1 on 2020-09-02 18:12
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import irekua_organisms.utils.migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organism',
+            index=models.Index(fields=['collection', '-created_on'], name='organism_col_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organism',
+            index=models.Index(fields=['collection', 'organism_type', '-created_on'], name='organism_col_type_created_idx'),
+        ),
+        irekua_organisms.utils.migrations.PostgreSQLAddIndex(
+            model_name='organism',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['identification_info'], name='organism_id_info_gin_idx', opclasses=['jsonb_path_ops']),
+        ),
+        irekua_organisms.utils.migrations.PostgreSQLAddIndex(
+            model_name='organism',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['additional_metadata'], name='organism_metadata_gin_idx', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='organismcapture',
+            index=models.Index(fields=['organism_capture_type', '-created_on'], name='capture_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organismcapture',
+            index=models.Index(fields=['sampling_event_device', '-created_on'], name='capture_device_created_idx'),
+        ),
+        irekua_organisms.utils.migrations.PostgreSQLAddIndex(
+            model_name='organismcapture',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['additional_metadata'], name='capture_metadata_gin_idx', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 3.1 on 2020-09-04 16:40
+
+from django.db import migrations, models
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import OuterRef
+from django.db.models import Subquery
+import django.db.models.deletion
+
+
+BATCH_SIZE = 10000
+
+
+def backfill_collections(apps, schema_editor):
+    # Frozen copy of the collection backfill as of this migration.
+    OrganismCapture = apps.get_model('irekua_organisms', 'OrganismCapture')
+    SamplingEventDevice = apps.get_model('irekua_database', 'SamplingEventDevice')
+    captures = OrganismCapture.objects.using(schema_editor.connection.alias)
+
+    devices = SamplingEventDevice.objects.filter(pk=OuterRef('sampling_event_device'))
+    values = dict(
+        collection=Subquery(
+            devices.values('sampling_event__collection')[:1]),
+        collection_type=Subquery(
+            devices.values('sampling_event__collection__collection_type')[:1]))
+
+    bounds = captures.aggregate(first=Min('id'), last=Max('id'))
+    if bounds['first'] is None:
+        return
+
+    for start in range(bounds['first'], bounds['last'] + 1, BATCH_SIZE):
+        captures.filter(id__gte=start, id__lt=start + BATCH_SIZE).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_database', '0003_auto_20200826_1946'),
+        ('irekua_organisms', '0002_organism_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organismcapture',
+            name='collection',
+            field=models.ForeignKey(blank=True, db_column='collection_id', editable=False, help_text='Collection of the sampling event device. Kept in sync automatically.', null=True, on_delete=django.db.models.deletion.PROTECT, to='irekua_database.collection', verbose_name='collection'),
+        ),
+        migrations.AddField(
+            model_name='organismcapture',
+            name='collection_type',
+            field=models.ForeignKey(blank=True, db_column='collection_type_id', editable=False, help_text='Type of the collection of the sampling event device. Kept in sync automatically.', null=True, on_delete=django.db.models.deletion.PROTECT, to='irekua_database.collectiontype', verbose_name='collection type'),
+        ),
+        migrations.RunPython(backfill_collections, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.1 on 2020-09-04 16:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0003_organismcapture_collection'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='organismcapture',
+            name='collection',
+            field=models.ForeignKey(blank=True, db_column='collection_id', editable=False, help_text='Collection of the sampling event device. Kept in sync automatically.', on_delete=django.db.models.deletion.PROTECT, to='irekua_database.collection', verbose_name='collection'),
+        ),
+        migrations.AlterField(
+            model_name='organismcapture',
+            name='collection_type',
+            field=models.ForeignKey(blank=True, db_column='collection_type_id', editable=False, help_text='Type of the collection of the sampling event device. Kept in sync automatically.', on_delete=django.db.models.deletion.PROTECT, to='irekua_database.collectiontype', verbose_name='collection type'),
+        ),
+        migrations.AddIndex(
+            model_name='organismcapture',
+            index=models.Index(fields=['collection', '-created_on'], name='capture_col_created_idx'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 3.1 on 2020-09-08 11:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_database', '0003_auto_20200826_1946'),
+        ('irekua_organisms', '0004_organismcapture_collection_not_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionOrganismStatistics',
+            fields=[
+                ('created_on', models.DateTimeField(auto_now_add=True, db_column='created_on', help_text='Date of creation', verbose_name='created on')),
+                ('modified_on', models.DateTimeField(auto_now=True, db_column='modified_on', help_text='Date of last modification', verbose_name='modified on')),
+                ('collection', models.OneToOneField(db_column='collection_id', help_text='Collection described by these statistics', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='irekua_database.collection', verbose_name='collection')),
+                ('organism_count', models.PositiveBigIntegerField(db_column='organism_count', default=0, help_text='Number of organisms in the collection', verbose_name='organism count')),
+                ('capture_count', models.PositiveBigIntegerField(db_column='capture_count', default=0, help_text='Number of organism captures in the collection', verbose_name='capture count')),
+                ('distinct_label_count', models.PositiveBigIntegerField(db_column='distinct_label_count', default=0, help_text='Number of distinct terms used to label organisms or captures', verbose_name='distinct label count')),
+                ('first_organism_on', models.DateTimeField(blank=True, db_column='first_organism_on', help_text='Creation date of the oldest organism', null=True, verbose_name='first organism on')),
+                ('last_organism_on', models.DateTimeField(blank=True, db_column='last_organism_on', help_text='Creation date of the newest organism', null=True, verbose_name='last organism on')),
+                ('first_capture_on', models.DateTimeField(blank=True, db_column='first_capture_on', help_text='Creation date of the oldest organism capture', null=True, verbose_name='first capture on')),
+                ('last_capture_on', models.DateTimeField(blank=True, db_column='last_capture_on', help_text='Creation date of the newest organism capture', null=True, verbose_name='last capture on')),
+            ],
+            options={
+                'verbose_name': 'Collection Organism Statistics',
+                'verbose_name_plural': 'Collection Organism Statistics',
+                'ordering': ['-created_on'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CollectionOrganismTypeCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_column='created_on', help_text='Date of creation', verbose_name='created on')),
+                ('modified_on', models.DateTimeField(auto_now=True, db_column='modified_on', help_text='Date of last modification', verbose_name='modified on')),
+                ('organism_count', models.PositiveBigIntegerField(db_column='organism_count', default=0, help_text='Number of organisms of this type in the collection', verbose_name='organism count')),
+                ('first_created_on', models.DateTimeField(blank=True, db_column='first_created_on', help_text='Creation date of the oldest organism', null=True, verbose_name='first created on')),
+                ('last_created_on', models.DateTimeField(blank=True, db_column='last_created_on', help_text='Creation date of the newest organism', null=True, verbose_name='last created on')),
+                ('collection', models.ForeignKey(db_column='collection_id', help_text='Collection of the counted organisms', on_delete=django.db.models.deletion.CASCADE, to='irekua_database.collection', verbose_name='collection')),
+                ('organism_type', models.ForeignKey(db_column='organism_type_id', help_text='Type of the counted organisms', on_delete=django.db.models.deletion.CASCADE, to='irekua_organisms.organismtype', verbose_name='organism type')),
+            ],
+            options={
+                'verbose_name': 'Collection Organism Type Count',
+                'verbose_name_plural': 'Collection Organism Type Counts',
+                'ordering': ['-created_on'],
+                'unique_together': {('collection', 'organism_type')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CollectionCaptureTypeCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_column='created_on', help_text='Date of creation', verbose_name='created on')),
+                ('modified_on', models.DateTimeField(auto_now=True, db_column='modified_on', help_text='Date of last modification', verbose_name='modified on')),
+                ('capture_count', models.PositiveBigIntegerField(db_column='capture_count', default=0, help_text='Number of organism captures of this type in the collection', verbose_name='capture count')),
+                ('first_created_on', models.DateTimeField(blank=True, db_column='first_created_on', help_text='Creation date of the oldest organism capture', null=True, verbose_name='first created on')),
+                ('last_created_on', models.DateTimeField(blank=True, db_column='last_created_on', help_text='Creation date of the newest organism capture', null=True, verbose_name='last created on')),
+                ('collection', models.ForeignKey(db_column='collection_id', help_text='Collection of the counted organism captures', on_delete=django.db.models.deletion.CASCADE, to='irekua_database.collection', verbose_name='collection')),
+                ('device_type', models.ForeignKey(db_column='device_type_id', help_text='Device type of the organism capture type', on_delete=django.db.models.deletion.CASCADE, to='irekua_database.devicetype', verbose_name='device type')),
+                ('organism_capture_type', models.ForeignKey(db_column='organism_capture_type_id', help_text='Type of the counted organism captures', on_delete=django.db.models.deletion.CASCADE, to='irekua_organisms.organismcapturetype', verbose_name='organism capture type')),
+            ],
+            options={
+                'verbose_name': 'Collection Capture Type Count',
+                'verbose_name_plural': 'Collection Capture Type Counts',
+                'ordering': ['-created_on'],
+                'unique_together': {('collection', 'organism_capture_type')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CollectionLabelCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_column='created_on', help_text='Date of creation', verbose_name='created on')),
+                ('modified_on', models.DateTimeField(auto_now=True, db_column='modified_on', help_text='Date of last modification', verbose_name='modified on')),
+                ('organism_count', models.PositiveBigIntegerField(db_column='organism_count', default=0, help_text='Number of organisms labeled with this term', verbose_name='organism count')),
+                ('capture_count', models.PositiveBigIntegerField(db_column='capture_count', default=0, help_text='Number of organism captures labeled with this term', verbose_name='capture count')),
+                ('collection', models.ForeignKey(db_column='collection_id', help_text='Collection in which the label is used', on_delete=django.db.models.deletion.CASCADE, to='irekua_database.collection', verbose_name='collection')),
+                ('term', models.ForeignKey(db_column='term_id', help_text='Label term', on_delete=django.db.models.deletion.CASCADE, to='irekua_database.term', verbose_name='term')),
+            ],
+            options={
+                'verbose_name': 'Collection Label Count',
+                'verbose_name_plural': 'Collection Label Counts',
+                'ordering': ['-created_on'],
+                'unique_together': {('collection', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.1 on 2020-09-10 09:51
+
+from django.db import migrations, models
+import irekua_database.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0005_collection_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganismChange',
+            fields=[
+                ('id', models.BigAutoField(db_column='id', help_text='Monotonic sequence number of the change', primary_key=True, serialize=False, verbose_name='sequence')),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_column='created_on', help_text='Date of the change', verbose_name='created on')),
+                ('model_name', models.CharField(choices=[('organism', 'organism'), ('organism_capture', 'organism capture')], db_column='model_name', help_text='Kind of object that changed', max_length=32, verbose_name='model name')),
+                ('object_id', models.BigIntegerField(db_column='object_id', help_text='Primary key of the object that changed', verbose_name='object id')),
+                ('action', models.CharField(choices=[('create', 'create'), ('update', 'update'), ('delete', 'delete'), ('add', 'add related'), ('remove', 'remove related'), ('clear', 'clear related')], db_column='action', help_text='Kind of change', max_length=16, verbose_name='action')),
+                ('payload', models.JSONField(blank=True, db_column='payload', default=irekua_database.utils.empty_JSON, help_text='Details of the change, such as changed relations', verbose_name='payload')),
+            ],
+            options={
+                'verbose_name': 'Organism Change',
+                'verbose_name_plural': 'Organism Changes',
+                'ordering': ['id'],
+            },
+        ),
+    ]
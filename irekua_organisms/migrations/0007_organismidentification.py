@@ -0,0 +1,146 @@
+# Generated by Django 3.1 on 2020-09-11 12:08
+
+import json
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+BATCH_SIZE = 5000
+MAX_KEY_LENGTH = 128
+MAX_VALUE_LENGTH = 255
+
+
+# Frozen copy of the identification indexing as of this migration.
+def find_indexable_paths(schema, prefix=()):
+    paths = []
+
+    if not isinstance(schema, dict):
+        return paths
+
+    properties = schema.get('properties', {})
+    if not isinstance(properties, dict):
+        return paths
+
+    for name, subschema in properties.items():
+        if not isinstance(subschema, dict):
+            continue
+
+        path = prefix + (name,)
+        if subschema.get('indexable') is True:
+            paths.append('.'.join(path))
+
+        paths.extend(find_indexable_paths(subschema, path))
+        paths.extend(find_indexable_paths(subschema.get('items'), path))
+
+    return paths
+
+
+def get_path_values(data, path):
+    values = [data]
+
+    for key in path.split('.'):
+        found = []
+        for value in values:
+            if isinstance(value, list):
+                found.extend(
+                    item[key] for item in value
+                    if isinstance(item, dict) and key in item)
+            elif isinstance(value, dict) and key in value:
+                found.append(value[key])
+        values = found
+
+    flat = []
+    for value in values:
+        if isinstance(value, list):
+            flat.extend(value)
+        else:
+            flat.append(value)
+
+    return flat
+
+
+def normalize_value(value):
+    if isinstance(value, str):
+        return value[:MAX_VALUE_LENGTH]
+
+    if isinstance(value, (bool, int, float)):
+        return json.dumps(value)[:MAX_VALUE_LENGTH]
+
+    return None
+
+
+def backfill_identifications(apps, schema_editor):
+    Organism = apps.get_model('irekua_organisms', 'Organism')
+    OrganismType = apps.get_model('irekua_organisms', 'OrganismType')
+    OrganismIdentification = apps.get_model('irekua_organisms', 'OrganismIdentification')
+    using = schema_editor.connection.alias
+
+    type_paths = {
+        pk: sorted({
+            path for path in find_indexable_paths(schema)
+            if len(path) <= MAX_KEY_LENGTH})
+        for pk, schema in OrganismType.objects.using(using)
+        .values_list('id', 'identification_info_schema')}
+
+    ids = list(
+        Organism.objects.using(using)
+        .order_by('id')
+        .values_list('id', flat=True))
+
+    for start in range(0, len(ids), BATCH_SIZE):
+        identifications = {}
+        for pk, organism_type_id, identification_info in (
+                Organism.objects.using(using)
+                .filter(id__in=ids[start:start + BATCH_SIZE])
+                .values_list('id', 'organism_type_id', 'identification_info')):
+            for path in type_paths.get(organism_type_id, ()):
+                for value in get_path_values(identification_info, path):
+                    value = normalize_value(value)
+                    if value is not None:
+                        identifications[(pk, path, value)] = organism_type_id
+
+        OrganismIdentification.objects.using(using).bulk_create(
+            [
+                OrganismIdentification(
+                    organism_id=pk,
+                    organism_type_id=organism_type_id,
+                    key=key,
+                    value=value)
+                for (pk, key, value), organism_type_id in identifications.items()],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0006_organismchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganismIdentification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(db_column='key', help_text='Path of the indexed field in the identification information', max_length=128, verbose_name='key')),
+                ('value', models.CharField(db_column='value', help_text='Value of the indexed field', max_length=255, verbose_name='value')),
+                ('organism', models.ForeignKey(db_column='organism_id', db_index=False, help_text='Identified organism', on_delete=django.db.models.deletion.CASCADE, related_name='identifications', to='irekua_organisms.organism', verbose_name='organism')),
+                ('organism_type', models.ForeignKey(db_column='organism_type_id', db_index=False, help_text='Type of the identified organism', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='irekua_organisms.organismtype', verbose_name='organism type')),
+            ],
+            options={
+                'verbose_name': 'Organism Identification',
+                'verbose_name_plural': 'Organism Identifications',
+                'unique_together': {('organism', 'key', 'value')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='organismidentification',
+            index=models.Index(fields=['key', 'value', 'organism'], name='organism_ident_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organismidentification',
+            index=models.Index(fields=['organism_type', 'key', 'value'], name='organism_ident_type_idx'),
+        ),
+        migrations.RunPython(backfill_identifications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.1 on 2020-09-14 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0007_organismidentification'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='organism',
+            name='organism_col_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='organism',
+            name='organism_col_type_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='organismcapture',
+            name='capture_col_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='organismcapture',
+            name='capture_type_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='organism',
+            index=models.Index(fields=['-created_on', '-id'], name='organism_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organism',
+            index=models.Index(fields=['collection', '-created_on', '-id'], name='organism_col_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organism',
+            index=models.Index(fields=['collection', 'organism_type', '-created_on', '-id'], name='organism_col_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organismcapture',
+            index=models.Index(fields=['-created_on', '-id'], name='capture_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organismcapture',
+            index=models.Index(fields=['collection', '-created_on', '-id'], name='capture_col_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organismcapture',
+            index=models.Index(fields=['collection', 'organism_capture_type', '-created_on', '-id'], name='capture_col_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organismcapture',
+            index=models.Index(fields=['organism_capture_type', '-created_on', '-id'], name='capture_type_created_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.1 on 2020-09-15 17:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0008_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organism',
+            name='schema_version',
+            field=models.CharField(blank=True, db_column='schema_version', default='', editable=False, help_text='Hash of the schemas and configuration the data was last validated against', max_length=40, verbose_name='schema version'),
+        ),
+        migrations.AddField(
+            model_name='organism',
+            name='validation_fingerprint',
+            field=models.CharField(blank=True, db_column='validation_fingerprint', default='', editable=False, help_text='Hash of the data that was last validated', max_length=40, verbose_name='validation fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='organismcapture',
+            name='schema_version',
+            field=models.CharField(blank=True, db_column='schema_version', default='', editable=False, help_text='Hash of the schemas and configuration the data was last validated against', max_length=40, verbose_name='schema version'),
+        ),
+        migrations.AddField(
+            model_name='organismcapture',
+            name='validation_fingerprint',
+            field=models.CharField(blank=True, db_column='validation_fingerprint', default='', editable=False, help_text='Hash of the data that was last validated', max_length=40, verbose_name='validation fingerprint'),
+        ),
+    ]
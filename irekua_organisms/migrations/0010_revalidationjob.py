@@ -0,0 +1,36 @@
+# Generated by Django 3.1 on 2020-09-16 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0009_validation_fingerprints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevalidationJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('organisms', 'organisms'), ('captures', 'organism captures')], db_column='kind', help_text='Kind of records being revalidated', max_length=16, verbose_name='kind')),
+                ('types', models.JSONField(blank=True, db_column='types', default=list, help_text='Organism or capture type ids to revalidate. All types if empty.', verbose_name='types')),
+                ('status', models.CharField(choices=[('running', 'running'), ('finished', 'finished')], db_column='status', default='running', help_text='Status of the job', max_length=16, verbose_name='status')),
+                ('last_id', models.BigIntegerField(db_column='last_id', default=0, help_text='Primary key of the last record checked. Jobs resume after it.', verbose_name='last id')),
+                ('checked', models.BigIntegerField(db_column='checked', default=0, help_text='Number of records checked', verbose_name='checked')),
+                ('updated', models.BigIntegerField(db_column='updated', default=0, help_text='Number of valid records whose validation state was updated', verbose_name='updated')),
+                ('invalid', models.BigIntegerField(db_column='invalid', default=0, help_text='Number of records that failed validation', verbose_name='invalid')),
+                ('report_path', models.CharField(db_column='report_path', help_text='File where violations are written as JSON Lines', max_length=255, verbose_name='report path')),
+                ('report_offset', models.BigIntegerField(db_column='report_offset', default=0, help_text='Size of the report at the last checkpoint', verbose_name='report offset')),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_column='created_on', help_text='Date of creation of the job', verbose_name='created on')),
+                ('modified_on', models.DateTimeField(auto_now=True, db_column='modified_on', help_text='Date of the last checkpoint', verbose_name='modified on')),
+                ('finished_on', models.DateTimeField(blank=True, db_column='finished_on', help_text='Date on which the job finished', null=True, verbose_name='finished on')),
+            ],
+            options={
+                'verbose_name': 'Revalidation Job',
+                'verbose_name_plural': 'Revalidation Jobs',
+                'ordering': ['-created_on'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1 on 2020-09-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0010_revalidationjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organismchange',
+            index=models.Index(fields=['model_name', 'object_id'], name='organism_change_object_idx'),
+        ),
+    ]
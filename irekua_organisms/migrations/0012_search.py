@@ -0,0 +1,89 @@
+# Generated by Django 3.1 on 2020-09-18 13:45
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+import irekua_organisms.search
+import irekua_organisms.utils.migrations
+
+
+BATCH_SIZE = 1000
+SEARCH_CONFIG = 'simple'
+
+
+def backfill_search(apps, schema_editor):
+    # Frozen copy of the search backfill as of this migration.
+    Organism = apps.get_model('irekua_organisms', 'Organism')
+    using = schema_editor.connection.alias
+    through = Organism._meta.get_field('labels').remote_field.through
+
+    ids = list(
+        Organism.objects.using(using)
+        .order_by('id')
+        .values_list('id', flat=True))
+
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = ids[start:start + BATCH_SIZE]
+
+        labels = {pk: [] for pk in batch}
+        for pk, value in (
+                through.objects.using(using)
+                .filter(organism_id__in=batch)
+                .order_by('organism_id', 'term__value')
+                .values_list('organism_id', 'term__value')):
+            labels[pk].append(value)
+
+        organisms = []
+        for pk, name, remarks in (
+                Organism.objects.using(using)
+                .filter(id__in=batch)
+                .values_list('id', 'name', 'remarks')):
+            text = ' '.join(
+                value for value in [name, remarks, *labels[pk]] if value)
+            organisms.append(Organism(id=pk, search_text=text))
+
+        Organism.objects.using(using).bulk_update(organisms, ['search_text'])
+
+        if schema_editor.connection.vendor == 'postgresql':
+            (
+                Organism.objects.using(using)
+                .filter(id__in=batch)
+                .update(search_vector=SearchVector('search_text', config=SEARCH_CONFIG))
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_database', '0003_auto_20200826_1946'),
+        ('irekua_organisms', '0011_organism_change_object_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='organism',
+            name='search_text',
+            field=models.TextField(blank=True, db_column='search_text', default='', editable=False, help_text='Name, remarks and label values. Kept in sync automatically.', verbose_name='search text'),
+        ),
+        migrations.AddField(
+            model_name='organism',
+            name='search_vector',
+            field=irekua_organisms.search.PortableSearchVectorField(blank=True, db_column='search_vector', editable=False, help_text='Full text search vector of the search text (PostgreSQL only)', null=True, verbose_name='search vector'),
+        ),
+        irekua_organisms.utils.migrations.PostgreSQLAddIndex(
+            model_name='organism',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='organism_search_idx'),
+        ),
+        irekua_organisms.utils.migrations.PostgreSQLAddIndex(
+            model_name='organismtype',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='organism_type_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        irekua_organisms.utils.migrations.PostgreSQLAddIndex(
+            model_name='organismcapturetype',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='capture_type_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(backfill_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.1 on 2020-09-21 10:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0012_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organismcapturetype',
+            name='icon_thumbnails',
+            field=models.JSONField(blank=True, db_column='icon_thumbnails', default=dict, editable=False, help_text='URL and geometry of the pre-generated icon thumbnails by size', verbose_name='icon thumbnails'),
+        ),
+        migrations.AddField(
+            model_name='organismtype',
+            name='icon_thumbnails',
+            field=models.JSONField(blank=True, db_column='icon_thumbnails', default=dict, editable=False, help_text='URL and geometry of the pre-generated icon thumbnails by size', verbose_name='icon thumbnails'),
+        ),
+    ]
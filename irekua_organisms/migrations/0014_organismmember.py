@@ -0,0 +1,34 @@
+# Generated by Django 3.1 on 2020-09-23 11:40
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import irekua_database.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0013_icon_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganismMember',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(db_column='count', default=1, help_text='Number of individuals of this member in the group', validators=[django.core.validators.MinValueValidator(1)], verbose_name='count')),
+                ('identification_info', models.JSONField(blank=True, db_column='identification_info', default=irekua_database.utils.empty_JSON, help_text='Identification information of the member organisms', verbose_name='identification info')),
+                ('group', models.ForeignKey(db_column='group_id', db_index=False, help_text='Multi organism to which these individuals belong', on_delete=django.db.models.deletion.CASCADE, related_name='members', to='irekua_organisms.organism', verbose_name='group')),
+                ('organism_type', models.ForeignKey(db_column='organism_type_id', help_text='Type of the member organisms', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='irekua_organisms.organismtype', verbose_name='organism type')),
+            ],
+            options={
+                'verbose_name': 'Organism Member',
+                'verbose_name_plural': 'Organism Members',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='organismmember',
+            index=models.Index(fields=['group', 'organism_type'], name='organism_member_group_idx'),
+        ),
+    ]
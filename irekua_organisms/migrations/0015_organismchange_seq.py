@@ -0,0 +1,35 @@
+# Generated by Django 3.1 on 2020-09-24 10:05
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_seq(apps, schema_editor):
+    # Existing changes are committed, so their insertion order is final.
+    OrganismChange = apps.get_model('irekua_organisms', 'OrganismChange')
+    OrganismChange.objects.using(schema_editor.connection.alias).update(seq=F('id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0014_organismmember'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='organismchange',
+            name='id',
+            field=models.BigAutoField(db_column='id', help_text='Insertion order of the change', primary_key=True, serialize=False, verbose_name='id'),
+        ),
+        migrations.AddField(
+            model_name='organismchange',
+            name='seq',
+            field=models.BigIntegerField(blank=True, db_column='seq', help_text='Sequence number of the change, assigned after commit', null=True, unique=True, verbose_name='sequence'),
+        ),
+        migrations.RunPython(backfill_seq, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='organismchange',
+            index=models.Index(condition=models.Q(seq__isnull=True), fields=['id'], name='organism_change_pending_idx'),
+        ),
+    ]
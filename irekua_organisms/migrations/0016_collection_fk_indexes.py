@@ -0,0 +1,25 @@
+# Generated by Django 3.1 on 2020-09-24 12:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_database', '0003_auto_20200826_1946'),
+        ('irekua_organisms', '0015_organismchange_seq'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='organism',
+            name='collection',
+            field=models.ForeignKey(db_column='collection_id', db_index=False, help_text='Collection to which this organism belongs', on_delete=django.db.models.deletion.PROTECT, to='irekua_database.collection', verbose_name='collection'),
+        ),
+        migrations.AlterField(
+            model_name='organismcapture',
+            name='collection',
+            field=models.ForeignKey(blank=True, db_column='collection_id', db_index=False, editable=False, help_text='Collection of the sampling event device. Kept in sync automatically.', on_delete=django.db.models.deletion.PROTECT, to='irekua_database.collection', verbose_name='collection'),
+        ),
+    ]
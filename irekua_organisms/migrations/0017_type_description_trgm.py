@@ -0,0 +1,24 @@
+# Generated by Django 3.1 on 2020-09-24 15:10
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+import irekua_organisms.utils.migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0016_collection_fk_indexes'),
+    ]
+
+    operations = [
+        irekua_organisms.utils.migrations.PostgreSQLAddIndex(
+            model_name='organismtype',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['description'], name='organism_type_desc_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        irekua_organisms.utils.migrations.PostgreSQLAddIndex(
+            model_name='organismcapturetype',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['description'], name='capture_type_desc_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1 on 2020-09-25 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('irekua_organisms', '0017_type_description_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collectionorganismstatistics',
+            name='change_version',
+            field=models.PositiveBigIntegerField(db_column='change_version', default=0, help_text='Increased whenever organisms or captures of the collection change', verbose_name='change version'),
+        ),
+    ]
@@ -1,3 +1,7 @@
+from irekua_organisms.models.collection_capture_type_count import CollectionCaptureTypeCount
+from irekua_organisms.models.collection_label_count import CollectionLabelCount
+from irekua_organisms.models.collection_organism_statistics import CollectionOrganismStatistics
+from irekua_organisms.models.collection_organism_type_count import CollectionOrganismTypeCount
 from irekua_organisms.models.collection_type_organism_capture_type import CollectionTypeOrganismCaptureType
 from irekua_organisms.models.collection_type_organism_config import CollectionTypeOrganismConfig
 from irekua_organisms.models.collection_type_organism_type import CollectionTypeOrganismType
@@ -5,9 +9,17 @@ from irekua_organisms.models.organism_capture_type import OrganismCaptureType
 from irekua_organisms.models.organism_capture import OrganismCapture
 from irekua_organisms.models.organism_type import OrganismType
 from irekua_organisms.models.organism import Organism
+from irekua_organisms.models.organism_change import OrganismChange
+from irekua_organisms.models.organism_identification import OrganismIdentification
+from irekua_organisms.models.organism_member import OrganismMember
+from irekua_organisms.models.revalidation_job import RevalidationJob
 
 
 __all__ = [
+    'CollectionCaptureTypeCount',
+    'CollectionLabelCount',
+    'CollectionOrganismStatistics',
+    'CollectionOrganismTypeCount',
     'CollectionTypeOrganismCaptureType',
     'CollectionTypeOrganismConfig',
     'CollectionTypeOrganismType',
@@ -15,4 +27,8 @@ __all__ = [
     'OrganismCapture',
     'OrganismType',
     'Organism',
+    'OrganismChange',
+    'OrganismIdentification',
+    'OrganismMember',
+    'RevalidationJob',
 ]
@@ -0,0 +1,59 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models.base import IrekuaModelBase
+from irekua_database.models import Collection
+from irekua_database.models import DeviceType
+
+
+class CollectionCaptureTypeCount(IrekuaModelBase):
+    collection = models.ForeignKey(
+        Collection,
+        on_delete=models.CASCADE,
+        db_column='collection_id',
+        verbose_name=_('collection'),
+        help_text=_('Collection of the counted organism captures'),
+        blank=False,
+        null=False)
+    organism_capture_type = models.ForeignKey(
+        'OrganismCaptureType',
+        on_delete=models.CASCADE,
+        db_column='organism_capture_type_id',
+        verbose_name=_('organism capture type'),
+        help_text=_('Type of the counted organism captures'),
+        blank=False,
+        null=False)
+    device_type = models.ForeignKey(
+        DeviceType,
+        on_delete=models.CASCADE,
+        db_column='device_type_id',
+        verbose_name=_('device type'),
+        help_text=_('Device type of the organism capture type'),
+        blank=False,
+        null=False)
+
+    capture_count = models.PositiveBigIntegerField(
+        db_column='capture_count',
+        verbose_name=_('capture count'),
+        help_text=_('Number of organism captures of this type in the collection'),
+        default=0)
+    first_created_on = models.DateTimeField(
+        db_column='first_created_on',
+        verbose_name=_('first created on'),
+        help_text=_('Creation date of the oldest organism capture'),
+        blank=True,
+        null=True)
+    last_created_on = models.DateTimeField(
+        db_column='last_created_on',
+        verbose_name=_('last created on'),
+        help_text=_('Creation date of the newest organism capture'),
+        blank=True,
+        null=True)
+
+    class Meta:
+        verbose_name = _('Collection Capture Type Count')
+        verbose_name_plural = _('Collection Capture Type Counts')
+        ordering = ['-created_on']
+        unique_together = (
+            ('collection', 'organism_capture_type'),
+        )
@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models.base import IrekuaModelBase
+from irekua_database.models import Collection
+from irekua_database.models import Term
+
+
+class CollectionLabelCount(IrekuaModelBase):
+    collection = models.ForeignKey(
+        Collection,
+        on_delete=models.CASCADE,
+        db_column='collection_id',
+        verbose_name=_('collection'),
+        help_text=_('Collection in which the label is used'),
+        blank=False,
+        null=False)
+    term = models.ForeignKey(
+        Term,
+        on_delete=models.CASCADE,
+        db_column='term_id',
+        verbose_name=_('term'),
+        help_text=_('Label term'),
+        blank=False,
+        null=False)
+
+    organism_count = models.PositiveBigIntegerField(
+        db_column='organism_count',
+        verbose_name=_('organism count'),
+        help_text=_('Number of organisms labeled with this term'),
+        default=0)
+    capture_count = models.PositiveBigIntegerField(
+        db_column='capture_count',
+        verbose_name=_('capture count'),
+        help_text=_('Number of organism captures labeled with this term'),
+        default=0)
+
+    class Meta:
+        verbose_name = _('Collection Label Count')
+        verbose_name_plural = _('Collection Label Counts')
+        ordering = ['-created_on']
+        unique_together = (
+            ('collection', 'term'),
+        )
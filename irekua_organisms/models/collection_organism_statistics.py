@@ -0,0 +1,71 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models.base import IrekuaModelBase
+from irekua_database.models import Collection
+
+
+class CollectionOrganismStatistics(IrekuaModelBase):
+    collection = models.OneToOneField(
+        Collection,
+        on_delete=models.CASCADE,
+        db_column='collection_id',
+        verbose_name=_('collection'),
+        help_text=_('Collection described by these statistics'),
+        primary_key=True)
+
+    organism_count = models.PositiveBigIntegerField(
+        db_column='organism_count',
+        verbose_name=_('organism count'),
+        help_text=_('Number of organisms in the collection'),
+        default=0)
+    capture_count = models.PositiveBigIntegerField(
+        db_column='capture_count',
+        verbose_name=_('capture count'),
+        help_text=_('Number of organism captures in the collection'),
+        default=0)
+    distinct_label_count = models.PositiveBigIntegerField(
+        db_column='distinct_label_count',
+        verbose_name=_('distinct label count'),
+        help_text=_('Number of distinct terms used to label organisms or captures'),
+        default=0)
+    change_version = models.PositiveBigIntegerField(
+        db_column='change_version',
+        verbose_name=_('change version'),
+        help_text=_('Increased whenever organisms or captures of the collection change'),
+        default=0)
+
+    first_organism_on = models.DateTimeField(
+        db_column='first_organism_on',
+        verbose_name=_('first organism on'),
+        help_text=_('Creation date of the oldest organism'),
+        blank=True,
+        null=True)
+    last_organism_on = models.DateTimeField(
+        db_column='last_organism_on',
+        verbose_name=_('last organism on'),
+        help_text=_('Creation date of the newest organism'),
+        blank=True,
+        null=True)
+    first_capture_on = models.DateTimeField(
+        db_column='first_capture_on',
+        verbose_name=_('first capture on'),
+        help_text=_('Creation date of the oldest organism capture'),
+        blank=True,
+        null=True)
+    last_capture_on = models.DateTimeField(
+        db_column='last_capture_on',
+        verbose_name=_('last capture on'),
+        help_text=_('Creation date of the newest organism capture'),
+        blank=True,
+        null=True)
+
+    class Meta:
+        verbose_name = _('Collection Organism Statistics')
+        verbose_name_plural = _('Collection Organism Statistics')
+        ordering = ['-created_on']
+
+    def __str__(self):
+        msg = _('%(collection)s - Organism Statistics')
+        params = dict(collection=self.collection_id)
+        return msg % params
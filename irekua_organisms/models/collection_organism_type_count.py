@@ -0,0 +1,50 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models.base import IrekuaModelBase
+from irekua_database.models import Collection
+
+
+class CollectionOrganismTypeCount(IrekuaModelBase):
+    collection = models.ForeignKey(
+        Collection,
+        on_delete=models.CASCADE,
+        db_column='collection_id',
+        verbose_name=_('collection'),
+        help_text=_('Collection of the counted organisms'),
+        blank=False,
+        null=False)
+    organism_type = models.ForeignKey(
+        'OrganismType',
+        on_delete=models.CASCADE,
+        db_column='organism_type_id',
+        verbose_name=_('organism type'),
+        help_text=_('Type of the counted organisms'),
+        blank=False,
+        null=False)
+
+    organism_count = models.PositiveBigIntegerField(
+        db_column='organism_count',
+        verbose_name=_('organism count'),
+        help_text=_('Number of organisms of this type in the collection'),
+        default=0)
+    first_created_on = models.DateTimeField(
+        db_column='first_created_on',
+        verbose_name=_('first created on'),
+        help_text=_('Creation date of the oldest organism'),
+        blank=True,
+        null=True)
+    last_created_on = models.DateTimeField(
+        db_column='last_created_on',
+        verbose_name=_('last created on'),
+        help_text=_('Creation date of the newest organism'),
+        blank=True,
+        null=True)
+
+    class Meta:
+        verbose_name = _('Collection Organism Type Count')
+        verbose_name_plural = _('Collection Organism Type Counts')
+        ordering = ['-created_on']
+        unique_together = (
+            ('collection', 'organism_type'),
+        )
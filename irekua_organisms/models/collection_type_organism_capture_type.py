@@ -5,8 +5,8 @@ from django.utils.translation import gettext_lazy as _
 from irekua_database.models.base import IrekuaModelBase
 
 from irekua_database.utils import validate_JSON_schema
-from irekua_database.utils import validate_JSON_instance
 from irekua_database.utils import simple_JSON_schema
+from irekua_organisms.utils import validate_capture_metadata
 
 
 class CollectionTypeOrganismCaptureType(IrekuaModelBase):
@@ -47,16 +47,7 @@ class CollectionTypeOrganismCaptureType(IrekuaModelBase):
         )
 
     def validate_additional_metadata(self, metadata):
-        try:
-            validate_JSON_instance(
-                schema=self.metadata_schema,
-                instance=metadata)
-        except ValidationError as error:
-            msg = _(
-                'Invalid additional metadata for organism capture '
-                'type %(type)s. Error: %(error)s')
-            params = dict(type=self.name, error=', '.join(error.messages))
-            raise ValidationError(msg, params=params)
+        validate_capture_metadata(self, self.organism_capture_type, metadata)
 
     def clean(self):
         super().clean()
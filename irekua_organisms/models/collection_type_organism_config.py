@@ -1,11 +1,9 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from django.core.exceptions import ValidationError
 
 from irekua_database.models.base import IrekuaModelBase
 from irekua_database.models import CollectionType
-from irekua_organisms.models.collection_type_organism_type import CollectionTypeOrganismType
-from irekua_organisms.models.collection_type_organism_capture_type import CollectionTypeOrganismCaptureType
+from irekua_organisms.snapshots import get_config_snapshot
 
 
 class CollectionTypeOrganismConfig(IrekuaModelBase):
@@ -55,26 +53,12 @@ class CollectionTypeOrganismConfig(IrekuaModelBase):
         params = dict(col_type=self.collection_type.name)
         return msg % params
 
+    @property
+    def snapshot(self):
+        return get_config_snapshot(self.collection_type_id)
+
     def validate_and_get_organism_type(self, organism_type):
-        try:
-            return CollectionTypeOrganismType.objects.get(organism_type=organism_type.id)
-        except CollectionTypeOrganismType.DoesNotExist:
-            msg = _(
-                'Organism type %(organism_type)s is not accepted in collections of '
-                'type %(col_type)s')
-            params = dict(
-                organism_type=organism_type.name,
-                col_type=self.collection_type.name)
-            raise ValidationError(msg % params)
+        return self.snapshot.validate_and_get_organism_type(organism_type)
 
     def validate_and_get_organism_capture_type(self, capture_type):
-        try:
-            return CollectionTypeOrganismCaptureType.objects.get(capture_type=capture_type.id)
-        except CollectionTypeOrganismCaptureType.DoesNotExist:
-            msg = _(
-                'Organism capture type %(capture_type)s is not accepted in collections '
-                'of type %(col_type)s')
-            params = dict(
-                capture_type=capture_type.name,
-                col_type=self.collection_type.name)
-            raise ValidationError(msg % params)
+        return self.snapshot.validate_and_get_organism_capture_type(capture_type)
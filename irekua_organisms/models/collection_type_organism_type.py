@@ -1,11 +1,10 @@
 from django.db import models
-from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
 from irekua_database.models.base import IrekuaModelBase
 from irekua_database.utils import validate_JSON_schema
-from irekua_database.utils import validate_JSON_instance
 from irekua_database.utils import simple_JSON_schema
+from irekua_organisms.utils import validate_organism_metadata
 
 
 class CollectionTypeOrganismType(IrekuaModelBase):
@@ -46,13 +45,4 @@ class CollectionTypeOrganismType(IrekuaModelBase):
         )
 
     def validate_additional_metadata(self, metadata):
-        try:
-            validate_JSON_instance(
-                schema=self.metadata_schema,
-                instance=metadata)
-        except ValidationError as error:
-            msg = _(
-                'Invalid additional metadata for organism '
-                'type %(type)s. Error: %(error)s')
-            params = dict(type=self.name, error=', '.join(error.messages))
-            raise ValidationError(msg, params=params)
+        validate_organism_metadata(self, self.organism_type, metadata)
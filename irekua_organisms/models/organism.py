@@ -1,13 +1,21 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
-from django.core.exceptions import ObjectDoesNotExist
 
 from irekua_database.utils import empty_JSON
 from irekua_database.models.base import IrekuaModelBaseUser
 from irekua_database.models import Collection
 from irekua_database.models import Term
 from irekua_database.models import Item
+from irekua_organisms.snapshots import get_config_snapshot
+from irekua_organisms.utils import get_organism_schema_version
+from irekua_organisms.utils import get_organism_fingerprint
+from irekua_organisms.utils import validate_identification_info
+from irekua_organisms.utils import validate_organism_metadata
+from irekua_organisms.catalog import get_organism_type_info
+from irekua_organisms.managers import OrganismManager
+from irekua_organisms.search import PortableSearchVectorField
 
 
 class Organism(IrekuaModelBaseUser):
@@ -17,6 +25,8 @@ class Organism(IrekuaModelBaseUser):
         verbose_name=_('collection'),
         help_text=_('Collection to which this organism belongs'),
         on_delete=models.PROTECT,
+        # Covered by the (collection, created_on) indexes.
+        db_index=False,
         blank=False,
         null=False)
     organism_type = models.ForeignKey(
@@ -57,6 +67,38 @@ class Organism(IrekuaModelBaseUser):
         blank=True,
         null=False)
 
+    validation_fingerprint = models.CharField(
+        max_length=40,
+        db_column='validation_fingerprint',
+        verbose_name=_('validation fingerprint'),
+        help_text=_('Hash of the data that was last validated'),
+        editable=False,
+        blank=True,
+        default='')
+    schema_version = models.CharField(
+        max_length=40,
+        db_column='schema_version',
+        verbose_name=_('schema version'),
+        help_text=_('Hash of the schemas and configuration the data was last validated against'),
+        editable=False,
+        blank=True,
+        default='')
+
+    search_text = models.TextField(
+        db_column='search_text',
+        verbose_name=_('search text'),
+        help_text=_('Name, remarks and label values. Kept in sync automatically.'),
+        editable=False,
+        blank=True,
+        default='')
+    search_vector = PortableSearchVectorField(
+        db_column='search_vector',
+        verbose_name=_('search vector'),
+        help_text=_('Full text search vector of the search text (PostgreSQL only)'),
+        editable=False,
+        blank=True,
+        null=True)
+
     labels = models.ManyToManyField(
         Term,
         verbose_name=_('labels'),
@@ -68,10 +110,34 @@ class Organism(IrekuaModelBaseUser):
         verbose_name=_('items'),
         help_text=_('Items associated to this organism'))
 
+    objects = OrganismManager()
+
     class Meta:
         verbose_name = _('Organism')
         verbose_name_plural = _('Organisms')
         ordering = ['-created_on']
+        indexes = [
+            models.Index(
+                fields=['-created_on', '-id'],
+                name='organism_created_id_idx'),
+            models.Index(
+                fields=['collection', '-created_on', '-id'],
+                name='organism_col_created_idx'),
+            models.Index(
+                fields=['collection', 'organism_type', '-created_on', '-id'],
+                name='organism_col_type_created_idx'),
+            GinIndex(
+                fields=['identification_info'],
+                opclasses=['jsonb_path_ops'],
+                name='organism_id_info_gin_idx'),
+            GinIndex(
+                fields=['additional_metadata'],
+                opclasses=['jsonb_path_ops'],
+                name='organism_metadata_gin_idx'),
+            GinIndex(
+                fields=['search_vector'],
+                name='organism_search_idx'),
+        ]
 
     def __str__(self):
         if self.name:
@@ -81,31 +147,51 @@ class Organism(IrekuaModelBaseUser):
         params = dict(id=self.id)
         return msg % params
 
+    def get_organism_type_schema(self):
+        # Served from the type catalog when it is enabled.
+        organism_type = get_organism_type_info(self.organism_type_id)
+        if organism_type is None:
+            return self.organism_type.schema
+
+        return organism_type
+
+    def get_validation_state(self, organism_config):
+        schema_version = get_organism_schema_version(
+            organism_config,
+            self.get_organism_type_schema())
+        fingerprint = get_organism_fingerprint(
+            self.organism_type_id,
+            organism_config.collection_type_id,
+            self.identification_info,
+            self.additional_metadata)
+        return schema_version, fingerprint
+
     def clean(self):
         super().clean()
 
-        collection = sampling_event.collection
-        collection_type = collection.collection_type
+        organism_config = get_config_snapshot(self.collection.collection_type_id)
 
-        try:
-            organism_config = collection_type.collectiontypeorganismconfig
-        except ObjectDoesNotExist:
-            raise ValidationError(_('This collection does not allow organisms'))
+        # Neither the data nor the schemas changed since the last validation.
+        state = self.get_validation_state(organism_config)
+        if state == (self.schema_version, self.validation_fingerprint):
+            return
 
-        if not organism_config.use_organisms:
-            raise ValidationError(_('This collection does not allow organisms'))
+        organism_config.validate_use_organisms()
+        organism_type = self.get_organism_type_schema()
 
         try:
-            self.organism_type.validate_id_info(self.identification_info)
+            validate_identification_info(organism_type, self.identification_info)
         except ValidationError as error:
-            raise ValueError({'identification_info': error})
+            raise ValidationError({'identification_info': error})
 
         try:
-            organism_type = organism_config.validate_and_get_organism_type(self.organism_type)
+            type_link = organism_config.get_organism_type_link(organism_type)
         except ValidationError as error:
             raise ValidationError({'organism_type': error})
 
         try:
-            organism_type.validate_additional_metadata(self.additional_metadata)
+            validate_organism_metadata(type_link, organism_type, self.additional_metadata)
         except ValidationError as error:
             raise ValidationError({'additional_metadata': error})
+
+        self.schema_version, self.validation_fingerprint = state
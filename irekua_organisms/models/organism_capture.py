@@ -1,13 +1,21 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
-from django.core.exceptions import ObjectDoesNotExist
 
 from irekua_database.utils import empty_JSON
 from irekua_database.models.base import IrekuaModelBaseUser
+from irekua_database.models import Collection
+from irekua_database.models import CollectionType
 from irekua_database.models import SamplingEventDevice
 from irekua_database.models import Item
 from irekua_database.models import Term
+from irekua_organisms.snapshots import get_config_snapshot
+from irekua_organisms.utils import get_capture_schema_version
+from irekua_organisms.utils import get_capture_fingerprint
+from irekua_organisms.utils import validate_capture_metadata
+from irekua_organisms.catalog import get_capture_type_info
+from irekua_organisms.managers import OrganismCaptureManager
 
 
 class OrganismCapture(IrekuaModelBaseUser):
@@ -28,6 +36,30 @@ class OrganismCapture(IrekuaModelBaseUser):
         on_delete=models.PROTECT,
         blank=False,
         null=False)
+    collection = models.ForeignKey(
+        Collection,
+        db_column='collection_id',
+        verbose_name=_('collection'),
+        help_text=_(
+            'Collection of the sampling event device. Kept in sync '
+            'automatically.'),
+        on_delete=models.PROTECT,
+        # Covered by the (collection, created_on) indexes.
+        db_index=False,
+        editable=False,
+        blank=True,
+        null=False)
+    collection_type = models.ForeignKey(
+        CollectionType,
+        db_column='collection_type_id',
+        verbose_name=_('collection type'),
+        help_text=_(
+            'Type of the collection of the sampling event device. Kept in '
+            'sync automatically.'),
+        on_delete=models.PROTECT,
+        editable=False,
+        blank=True,
+        null=False)
     organism = models.ForeignKey(
         'Organism',
         db_column='organism_id',
@@ -45,6 +77,23 @@ class OrganismCapture(IrekuaModelBaseUser):
         blank=True,
         null=False)
 
+    validation_fingerprint = models.CharField(
+        max_length=40,
+        db_column='validation_fingerprint',
+        verbose_name=_('validation fingerprint'),
+        help_text=_('Hash of the data that was last validated'),
+        editable=False,
+        blank=True,
+        default='')
+    schema_version = models.CharField(
+        max_length=40,
+        db_column='schema_version',
+        verbose_name=_('schema version'),
+        help_text=_('Hash of the schemas and configuration the data was last validated against'),
+        editable=False,
+        blank=True,
+        default='')
+
     labels = models.ManyToManyField(
         Term,
         verbose_name=_('labels'),
@@ -55,35 +104,111 @@ class OrganismCapture(IrekuaModelBaseUser):
         verbose_name=_('items'),
         help_text=_('Items associated to this organism'))
 
+    objects = OrganismCaptureManager()
+
     class Meta:
         verbose_name =_('Organism Capture')
         verbose_name_plural =_('Organism Captures')
         ordering = ['-created_on']
+        indexes = [
+            models.Index(
+                fields=['-created_on', '-id'],
+                name='capture_created_id_idx'),
+            models.Index(
+                fields=['collection', '-created_on', '-id'],
+                name='capture_col_created_idx'),
+            models.Index(
+                fields=['collection', 'organism_capture_type', '-created_on', '-id'],
+                name='capture_col_type_created_idx'),
+            models.Index(
+                fields=['organism_capture_type', '-created_on', '-id'],
+                name='capture_type_created_idx'),
+            models.Index(
+                fields=['sampling_event_device', '-created_on'],
+                name='capture_device_created_idx'),
+            GinIndex(
+                fields=['additional_metadata'],
+                opclasses=['jsonb_path_ops'],
+                name='capture_metadata_gin_idx'),
+        ]
 
     def __str__(self):
-        return f'{self.organism_capture_type.name} {self.id}'
+        return f'{self.get_capture_type().name} {self.id}'
+
+    def get_capture_type(self):
+        # Served from the type catalog when it is enabled.
+        capture_type = get_capture_type_info(self.organism_capture_type_id)
+        if capture_type is None:
+            return self.organism_capture_type
+
+        return capture_type
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._collection_device_id = instance.__dict__.get('sampling_event_device_id')
+        return instance
+
+    def set_collection(self, collection_id, collection_type_id):
+        self.collection_id = collection_id
+        self.collection_type_id = collection_type_id
+        self._collection_device_id = self.sampling_event_device_id
+
+    def resolve_collection(self):
+        device_id = self.sampling_event_device_id
+        if device_id is not None and getattr(self, '_collection_device_id', None) == device_id:
+            return
+
+        collection_id, collection_type_id = (
+            SamplingEventDevice.objects
+            .filter(pk=device_id)
+            .values_list(
+                'sampling_event__collection_id',
+                'sampling_event__collection__collection_type_id')
+            .get())
+        self.set_collection(collection_id, collection_type_id)
+
+    def save(self, *args, **kwargs):
+        self.resolve_collection()
+        super().save(*args, **kwargs)
+
+    def get_validation_state(self, organism_config):
+        schema_version = get_capture_schema_version(
+            organism_config,
+            self.organism_capture_type_id)
+        fingerprint = get_capture_fingerprint(
+            self.organism_capture_type_id,
+            organism_config.collection_type_id,
+            self.additional_metadata)
+        return schema_version, fingerprint
 
     def clean(self):
         super().clean()
 
-        sampling_event = sampling_event_device.sampling_event
-        collection = sampling_event.collection
-        collection_type = collection.collection_type
-
         try:
-            organism_config = collection_type.collectiontypeorganismconfig
-        except ObjectDoesNotExist:
-            raise ValidationError(_('This collection does not allow organisms'))
+            self.resolve_collection()
+        except SamplingEventDevice.DoesNotExist:
+            msg = _('The sampling event device does not exist')
+            raise ValidationError({'sampling_event_device': msg})
+
+        organism_config = get_config_snapshot(self.collection_type_id)
 
-        if not organism_config.use_organisms:
-            raise ValidationError(_('This collection does not allow organisms'))
+        # Neither the data nor the schemas changed since the last validation.
+        state = self.get_validation_state(organism_config)
+        if state == (self.schema_version, self.validation_fingerprint):
+            return
+
+        organism_config.validate_use_organisms()
+        capture_type = self.get_capture_type()
 
         try:
-            capture_type = organism_config.validate_and_get_organism_capture_type(self.organism_capture_type)
+            type_link = organism_config.get_organism_capture_type_link(capture_type)
         except ValidationError as error:
             raise ValidationError({'organism_capture_type': error})
 
         try:
-            capture_type.validate_additional_metadata(self.additional_metadata)
+            validate_capture_metadata(type_link, capture_type, self.additional_metadata)
         except ValidationError as error:
             raise ValidationError({'additional_metadata': error})
+
+        self.schema_version, self.validation_fingerprint = state
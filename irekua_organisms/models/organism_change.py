@@ -0,0 +1,97 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.utils import empty_JSON
+
+
+class OrganismChange(models.Model):
+    ORGANISM = 'organism'
+    ORGANISM_CAPTURE = 'organism_capture'
+    MODEL_CHOICES = [
+        (ORGANISM, _('organism')),
+        (ORGANISM_CAPTURE, _('organism capture')),
+    ]
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ADD = 'add'
+    REMOVE = 'remove'
+    CLEAR = 'clear'
+    ACTION_CHOICES = [
+        (CREATE, _('create')),
+        (UPDATE, _('update')),
+        (DELETE, _('delete')),
+        (ADD, _('add related')),
+        (REMOVE, _('remove related')),
+        (CLEAR, _('clear related')),
+    ]
+
+    id = models.BigAutoField(
+        primary_key=True,
+        db_column='id',
+        verbose_name=_('id'),
+        help_text=_('Insertion order of the change'))
+    seq = models.BigIntegerField(
+        db_column='seq',
+        verbose_name=_('sequence'),
+        help_text=_('Sequence number of the change, assigned after commit'),
+        unique=True,
+        blank=True,
+        null=True)
+    created_on = models.DateTimeField(
+        db_column='created_on',
+        verbose_name=_('created on'),
+        help_text=_('Date of the change'),
+        auto_now_add=True)
+
+    model_name = models.CharField(
+        max_length=32,
+        db_column='model_name',
+        verbose_name=_('model name'),
+        help_text=_('Kind of object that changed'),
+        choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField(
+        db_column='object_id',
+        verbose_name=_('object id'),
+        help_text=_('Primary key of the object that changed'))
+    action = models.CharField(
+        max_length=16,
+        db_column='action',
+        verbose_name=_('action'),
+        help_text=_('Kind of change'),
+        choices=ACTION_CHOICES)
+    payload = models.JSONField(
+        db_column='payload',
+        verbose_name=_('payload'),
+        help_text=_('Details of the change, such as changed relations'),
+        default=empty_JSON,
+        blank=True,
+        null=False)
+
+    class Meta:
+        verbose_name = _('Organism Change')
+        verbose_name_plural = _('Organism Changes')
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['model_name', 'object_id'],
+                name='organism_change_object_idx'),
+            models.Index(
+                fields=['id'],
+                name='organism_change_pending_idx',
+                condition=models.Q(seq__isnull=True)),
+        ]
+
+    def __str__(self):
+        return f'{self.seq} {self.action} {self.model_name} {self.object_id}'
+
+    def to_dict(self):
+        return {
+            'seq': self.seq,
+            'created_on': self.created_on.isoformat(),
+            'model': self.model_name,
+            'object_id': self.object_id,
+            'action': self.action,
+            'payload': self.payload,
+        }
@@ -0,0 +1,56 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class OrganismIdentification(models.Model):
+    organism = models.ForeignKey(
+        'Organism',
+        related_name='identifications',
+        on_delete=models.CASCADE,
+        db_column='organism_id',
+        db_index=False,
+        verbose_name=_('organism'),
+        help_text=_('Identified organism'),
+        blank=False,
+        null=False)
+    organism_type = models.ForeignKey(
+        'OrganismType',
+        related_name='+',
+        on_delete=models.CASCADE,
+        db_column='organism_type_id',
+        db_index=False,
+        verbose_name=_('organism type'),
+        help_text=_('Type of the identified organism'),
+        blank=False,
+        null=False)
+
+    key = models.CharField(
+        max_length=128,
+        db_column='key',
+        verbose_name=_('key'),
+        help_text=_('Path of the indexed field in the identification information'),
+        blank=False)
+    value = models.CharField(
+        max_length=255,
+        db_column='value',
+        verbose_name=_('value'),
+        help_text=_('Value of the indexed field'),
+        blank=False)
+
+    class Meta:
+        verbose_name = _('Organism Identification')
+        verbose_name_plural = _('Organism Identifications')
+        unique_together = (
+            ('organism', 'key', 'value'),
+        )
+        indexes = [
+            models.Index(
+                fields=['key', 'value', 'organism'],
+                name='organism_ident_lookup_idx'),
+            models.Index(
+                fields=['organism_type', 'key', 'value'],
+                name='organism_ident_type_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.organism_id} {self.key}={self.value}'
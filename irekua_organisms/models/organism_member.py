@@ -0,0 +1,87 @@
+from django.db import models
+from django.core.validators import MinValueValidator
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.utils import empty_JSON
+from irekua_organisms.utils import validate_identification_info
+from irekua_organisms.catalog import get_organism_type_info
+from irekua_organisms.managers import OrganismMemberManager
+
+
+class OrganismMember(models.Model):
+    group = models.ForeignKey(
+        'Organism',
+        related_name='members',
+        on_delete=models.CASCADE,
+        db_column='group_id',
+        db_index=False,
+        verbose_name=_('group'),
+        help_text=_('Multi organism to which these individuals belong'),
+        blank=False,
+        null=False)
+    organism_type = models.ForeignKey(
+        'OrganismType',
+        related_name='+',
+        on_delete=models.PROTECT,
+        db_column='organism_type_id',
+        verbose_name=_('organism type'),
+        help_text=_('Type of the member organisms'),
+        blank=False,
+        null=False)
+
+    count = models.PositiveIntegerField(
+        db_column='count',
+        verbose_name=_('count'),
+        help_text=_('Number of individuals of this member in the group'),
+        validators=[MinValueValidator(1)],
+        default=1,
+        blank=False,
+        null=False)
+    identification_info = models.JSONField(
+        db_column='identification_info',
+        default=empty_JSON,
+        verbose_name=_('identification info'),
+        help_text=_('Identification information of the member organisms'),
+        blank=True,
+        null=False)
+
+    objects = OrganismMemberManager()
+
+    class Meta:
+        verbose_name = _('Organism Member')
+        verbose_name_plural = _('Organism Members')
+        indexes = [
+            models.Index(
+                fields=['group', 'organism_type'],
+                name='organism_member_group_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.group_id} {self.organism_type_id} x{self.count}'
+
+    def get_organism_type_schema(self):
+        # Served from the type catalog when it is enabled.
+        organism_type = get_organism_type_info(self.organism_type_id)
+        if organism_type is None:
+            return self.organism_type.schema
+
+        return organism_type
+
+    def clean(self):
+        super().clean()
+
+        if not self.group.organism_type.is_multi_organism:
+            msg = _('Organisms of type %(type)s cannot have members')
+            params = dict(type=self.group.organism_type.name)
+            raise ValidationError({'group': msg % params})
+
+        if not self.identification_info:
+            return
+
+        try:
+            validate_identification_info(
+                self.get_organism_type_schema(),
+                self.identification_info)
+        except ValidationError as error:
+            raise ValidationError({'identification_info': error})
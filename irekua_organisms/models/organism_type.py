@@ -1,12 +1,19 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 
 from irekua_database.models.base import IrekuaModelBase
 from irekua_database.models import TermType
 from irekua_database.utils import validate_JSON_schema
-from irekua_database.utils import validate_JSON_instance
 from irekua_database.utils import simple_JSON_schema
+from irekua_organisms.utils import TypeSchema
+from irekua_organisms.utils import validate_identification_info
+from irekua_organisms.utils import get_disallowed_terms
+from irekua_organisms.identification import validate_indexable_paths
+from irekua_organisms.thumbnails import get_thumbnail_url
+from irekua_organisms.thumbnails import get_saved_fields
+from irekua_organisms.managers import OrganismTypeManager
 
 
 class OrganismType(IrekuaModelBase):
@@ -30,6 +37,14 @@ class OrganismType(IrekuaModelBase):
         upload_to='images/organism_types/',
         blank=True,
         null=True)
+    icon_thumbnails = models.JSONField(
+        db_column='icon_thumbnails',
+        verbose_name=_('icon thumbnails'),
+        help_text=_('URL and geometry of the pre-generated icon thumbnails by size'),
+        editable=False,
+        blank=True,
+        null=False,
+        default=dict)
 
     term_types = models.ManyToManyField(
         TermType,
@@ -55,33 +70,73 @@ class OrganismType(IrekuaModelBase):
         null=False,
         default=False)
 
+    objects = OrganismTypeManager()
+
     class Meta:
         verbose_name =_('Organism Type')
         verbose_name_plural =_('Organism Types')
         ordering = ['-created_on']
+        indexes = [
+            GinIndex(
+                fields=['name'],
+                opclasses=['gin_trgm_ops'],
+                name='organism_type_name_trgm_idx'),
+            GinIndex(
+                fields=['description'],
+                opclasses=['gin_trgm_ops'],
+                name='organism_type_desc_trgm_idx'),
+        ]
 
     def __str__(self):
         return str(self.name)
 
-    def validate_id_info(self, id_info):
+    def save(self, *args, **kwargs):
+        regular = not args and not kwargs.get('force_insert') and kwargs.get('update_fields') is None
+        if regular and not self._state.adding:
+            kwargs['update_fields'] = get_saved_fields(self)
+        super().save(*args, **kwargs)
+
+    def clean(self):
+        super().clean()
+
         try:
-            validate_JSON_instance(
-                schema=self.additional_id_info_schema,
-                instance=id_info)
+            validate_indexable_paths(self.identification_info_schema)
         except ValidationError as error:
-            msg = _(
-                'Invalid identification information for organism '
-                'type %(type)s. Error: %(error)s')
-            params = dict(type=self.name, error=', '.join(error.messages))
-            raise ValidationError(msg, params=params)
+            raise ValidationError({'identification_info_schema': error})
 
-    def validate_term(self, term):
-        if not self.term_types.filter(id=term.term_type.id).exists():
+    def get_icon_url(self, size):
+        """Return the URL of a pre-generated icon thumbnail.
+
+        Falls back to the original icon when the thumbnail has not been
+        generated yet.
+        """
+        url = get_thumbnail_url(self.icon_thumbnails, size)
+        if url is None and self.icon:
+            url = self.icon.url
+        return url
+
+    def validate_id_info(self, id_info):
+        validate_identification_info(self.schema, id_info)
+
+    @property
+    def schema(self):
+        return TypeSchema(self.pk, self.name, self.identification_info_schema)
+
+    def validate_terms(self, terms):
+        errors = []
+
+        for term in get_disallowed_terms(self, terms):
             msg = _(
-                'Terms of type %(term_type)s are not allowed for organism '
+                'Terms of type %(term_type)s are not allowed for organism'
                 ' of type %(capture_type)s. Term: %(term)s')
             params = dict(
                 term_type=term.term_type.name,
                 capture_type=self.name,
                 term=term.value)
-            raise ValidationError(msg % params)
+            errors.append(ValidationError(msg % params))
+
+        if errors:
+            raise ValidationError(errors)
+
+    def validate_term(self, term):
+        self.validate_terms([term])
@@ -0,0 +1,116 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class RevalidationJob(models.Model):
+    ORGANISMS = 'organisms'
+    ORGANISM_CAPTURES = 'captures'
+    KIND_CHOICES = [
+        (ORGANISMS, _('organisms')),
+        (ORGANISM_CAPTURES, _('organism captures')),
+    ]
+
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    STATUS_CHOICES = [
+        (RUNNING, _('running')),
+        (FINISHED, _('finished')),
+    ]
+
+    kind = models.CharField(
+        max_length=16,
+        db_column='kind',
+        verbose_name=_('kind'),
+        help_text=_('Kind of records being revalidated'),
+        choices=KIND_CHOICES)
+    types = models.JSONField(
+        db_column='types',
+        verbose_name=_('types'),
+        help_text=_('Organism or capture type ids to revalidate. All types if empty.'),
+        default=list,
+        blank=True,
+        null=False)
+    status = models.CharField(
+        max_length=16,
+        db_column='status',
+        verbose_name=_('status'),
+        help_text=_('Status of the job'),
+        choices=STATUS_CHOICES,
+        default=RUNNING)
+
+    last_id = models.BigIntegerField(
+        db_column='last_id',
+        verbose_name=_('last id'),
+        help_text=_('Primary key of the last record checked. Jobs resume after it.'),
+        default=0)
+    checked = models.BigIntegerField(
+        db_column='checked',
+        verbose_name=_('checked'),
+        help_text=_('Number of records checked'),
+        default=0)
+    updated = models.BigIntegerField(
+        db_column='updated',
+        verbose_name=_('updated'),
+        help_text=_('Number of valid records whose validation state was updated'),
+        default=0)
+    invalid = models.BigIntegerField(
+        db_column='invalid',
+        verbose_name=_('invalid'),
+        help_text=_('Number of records that failed validation'),
+        default=0)
+
+    report_path = models.CharField(
+        max_length=255,
+        db_column='report_path',
+        verbose_name=_('report path'),
+        help_text=_('File where violations are written as JSON Lines'))
+    report_offset = models.BigIntegerField(
+        db_column='report_offset',
+        verbose_name=_('report offset'),
+        help_text=_('Size of the report at the last checkpoint'),
+        default=0)
+
+    created_on = models.DateTimeField(
+        db_column='created_on',
+        verbose_name=_('created on'),
+        help_text=_('Date of creation of the job'),
+        auto_now_add=True)
+    modified_on = models.DateTimeField(
+        db_column='modified_on',
+        verbose_name=_('modified on'),
+        help_text=_('Date of the last checkpoint'),
+        auto_now=True)
+    finished_on = models.DateTimeField(
+        db_column='finished_on',
+        verbose_name=_('finished on'),
+        help_text=_('Date on which the job finished'),
+        blank=True,
+        null=True)
+
+    class Meta:
+        verbose_name = _('Revalidation Job')
+        verbose_name_plural = _('Revalidation Jobs')
+        ordering = ['-created_on']
+
+    def __str__(self):
+        return f'{self.id} {self.kind} {self.status}'
+
+    def checkpoint(self, last_id, checked, updated, invalid, report_offset):
+        self.last_id = last_id
+        self.checked += checked
+        self.updated += updated
+        self.invalid += invalid
+        self.report_offset = report_offset
+        self.save(update_fields=[
+            'last_id',
+            'checked',
+            'updated',
+            'invalid',
+            'report_offset',
+            'modified_on'])
+
+    def finish(self):
+        self.status = self.FINISHED
+        self.finished_on = timezone.now()
+        self.save(update_fields=['status', 'finished_on', 'modified_on'])
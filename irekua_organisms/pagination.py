@@ -0,0 +1,103 @@
+import json
+import base64
+from collections import namedtuple
+
+from django.db.models import Q
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+Page = namedtuple('Page', ['items', 'next_cursor', 'previous_cursor'])
+
+
+def get_key(item):
+    if isinstance(item, dict):
+        return item['created_on'], item['id']
+
+    return item.created_on, item.pk
+
+
+def encode_cursor(created_on, pk):
+    data = json.dumps([created_on.isoformat(), pk], separators=(',', ':'))
+    token = base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+    return token.rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padding = '=' * (-len(token) % 4)
+        data = base64.urlsafe_b64decode((token + padding).encode('ascii'))
+        created_on, pk = json.loads(data.decode('utf-8'))
+        created_on = parse_datetime(created_on)
+        pk = int(pk)
+    except (TypeError, ValueError, UnicodeError):
+        created_on = None
+
+    if created_on is None:
+        msg = _('Invalid pagination cursor %(cursor)s')
+        params = dict(cursor=token)
+        raise ValidationError(msg, params=params)
+
+    return created_on, pk
+
+
+def get_cursor(item):
+    return encode_cursor(*get_key(item))
+
+
+def get_page(queryset, limit=DEFAULT_PAGE_SIZE, after=None, before=None):
+    """Return a page of queryset ordered by newest first.
+
+    Pages are delimited by (created_on, id) keys instead of offsets, so
+    every page costs the same as the first one when an index on
+    (..., created_on DESC, id DESC) matches the queryset filters. Pass the
+    next_cursor of a page as after to get the following (older) page and
+    its previous_cursor as before to go back. Cursors are opaque tokens.
+    """
+    if after is not None and before is not None:
+        raise ValidationError(_('Only one of after and before can be given'))
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    backward = before is not None
+    cursor = before if backward else after
+
+    if cursor is not None:
+        created_on, pk = decode_cursor(cursor)
+
+        # The first condition is redundant but gives the database a range
+        # on the indexed column; the second breaks ties on the id.
+        if backward:
+            queryset = queryset.filter(created_on__gte=created_on).filter(
+                Q(created_on__gt=created_on) | Q(id__gt=pk))
+        else:
+            queryset = queryset.filter(created_on__lte=created_on).filter(
+                Q(created_on__lt=created_on) | Q(id__lt=pk))
+
+    if backward:
+        queryset = queryset.order_by('created_on', 'id')
+    else:
+        queryset = queryset.order_by('-created_on', '-id')
+
+    items = list(queryset[:limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    if backward:
+        items.reverse()
+
+    if not items:
+        return Page(items, None, None)
+
+    if backward:
+        next_cursor = get_cursor(items[-1])
+        previous_cursor = get_cursor(items[0]) if has_more else None
+    else:
+        next_cursor = get_cursor(items[-1]) if has_more else None
+        previous_cursor = get_cursor(items[0]) if cursor is not None else None
+
+    return Page(items, next_cursor, previous_cursor)
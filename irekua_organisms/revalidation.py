@@ -0,0 +1,328 @@
+import os
+import json
+
+from django.db.models import Q
+from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS
+
+from irekua_organisms.bulk.organisms import OrganismBatchContext
+from irekua_organisms.bulk.captures import OrganismCaptureBatchContext
+from irekua_organisms.bulk.validation import validate_records
+from irekua_organisms.export import ORGANISMS
+from irekua_organisms.export import ORGANISM_CAPTURES
+from irekua_organisms.snapshots import get_config_snapshots
+from irekua_organisms.utils import TypeSchema
+from irekua_organisms.utils import get_organism_schema_version
+from irekua_organisms.utils import get_capture_schema_version
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+ORGANISM_RECORD_FIELDS = (
+    'id',
+    'collection',
+    'organism_type',
+    'identification_info',
+    'additional_metadata',
+)
+
+CAPTURE_RECORD_FIELDS = (
+    'id',
+    'sampling_event_device',
+    'organism_capture_type',
+    'collection_type',
+    'additional_metadata',
+)
+
+
+class RevalidationResult:
+    def __init__(self):
+        self.checked = 0
+        self.updated = 0
+        self.errors = {}
+
+    def __repr__(self):
+        return '<RevalidationResult checked={} updated={} errors={}>'.format(
+            self.checked,
+            self.updated,
+            len(self.errors))
+
+
+def get_organism_versions(organism_types=None, using=DEFAULT_DB_ALIAS):
+    """Return the current schema version of each organism group in use.
+
+    Groups are (organism type id, collection type id) pairs.
+    """
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import OrganismType
+
+    groups = Organism.objects.using(using).order_by().values_list(
+        'organism_type_id',
+        'collection__collection_type_id').distinct()
+    if organism_types is not None:
+        groups = groups.filter(organism_type__in=organism_types)
+    groups = list(groups)
+
+    configs = get_config_snapshots(
+        {collection_type_id for unused, collection_type_id in groups},
+        using=using)
+    types = {
+        pk: TypeSchema(pk, name, schema)
+        for pk, name, schema in OrganismType.objects.using(using)
+        .filter(id__in={organism_type_id for organism_type_id, unused in groups})
+        .values_list('id', 'name', 'identification_info_schema')}
+
+    return {
+        (organism_type_id, collection_type_id): get_organism_schema_version(
+            configs[collection_type_id],
+            types[organism_type_id])
+        for organism_type_id, collection_type_id in groups}
+
+
+def get_capture_versions(capture_types=None, using=DEFAULT_DB_ALIAS):
+    from irekua_organisms.models import OrganismCapture
+
+    groups = OrganismCapture.objects.using(using).order_by().values_list(
+        'organism_capture_type_id',
+        'collection_type_id').distinct()
+    if capture_types is not None:
+        groups = groups.filter(organism_capture_type__in=capture_types)
+    groups = list(groups)
+
+    configs = get_config_snapshots(
+        {collection_type_id for unused, collection_type_id in groups},
+        using=using)
+
+    return {
+        (capture_type_id, collection_type_id): get_capture_schema_version(
+            configs[collection_type_id],
+            capture_type_id)
+        for capture_type_id, collection_type_id in groups}
+
+
+def get_stale_organisms(organism_types=None, using=DEFAULT_DB_ALIAS):
+    """Return organisms not validated against their current schemas."""
+    from irekua_organisms.models import Organism
+
+    condition = Q()
+    for (organism_type_id, collection_type_id), version in get_organism_versions(
+            organism_types=organism_types,
+            using=using).items():
+        condition |= (
+            Q(organism_type=organism_type_id, collection__collection_type=collection_type_id) &
+            ~Q(schema_version=version))
+
+    if not condition:
+        return Organism.objects.using(using).none()
+
+    return Organism.objects.using(using).filter(condition)
+
+
+def get_stale_organism_captures(capture_types=None, using=DEFAULT_DB_ALIAS):
+    """Return organism captures not validated against their current schemas."""
+    from irekua_organisms.models import OrganismCapture
+
+    condition = Q()
+    for (capture_type_id, collection_type_id), version in get_capture_versions(
+            capture_types=capture_types,
+            using=using).items():
+        condition |= (
+            Q(organism_capture_type=capture_type_id, collection_type=collection_type_id) &
+            ~Q(schema_version=version))
+
+    if not condition:
+        return OrganismCapture.objects.using(using).none()
+
+    return OrganismCapture.objects.using(using).filter(condition)
+
+
+def build_organism(row):
+    from irekua_organisms.models import Organism
+
+    return Organism(
+        id=row['id'],
+        collection_id=row['collection'],
+        organism_type_id=row['organism_type'],
+        identification_info=row['identification_info'],
+        additional_metadata=row['additional_metadata'])
+
+
+def build_organism_capture(row):
+    from irekua_organisms.models import OrganismCapture
+
+    return OrganismCapture(
+        id=row['id'],
+        organism_capture_type_id=row['organism_capture_type'],
+        collection_type_id=row['collection_type'],
+        additional_metadata=row['additional_metadata'])
+
+
+def revalidate_batch(context, rows, build, result, workers=None, using=DEFAULT_DB_ALIAS):
+    """Validate rows and store the validation state of the valid ones.
+
+    Errors are added to result keyed by primary key. Rows are updated
+    with bulk_update, so no signals are sent and modification dates are
+    left untouched.
+    """
+    errors = validate_records(
+        context.check,
+        [(row['id'], row) for row in rows],
+        context.snapshot,
+        workers=workers)
+
+    valid = []
+    for row in rows:
+        if row['id'] in errors:
+            result.errors[row['id']] = errors[row['id']]
+            continue
+
+        instance = build(row)
+        context.set_validation_state(instance)
+        valid.append(instance)
+
+    if valid:
+        type(valid[0]).objects.using(using).bulk_update(
+            valid,
+            ['schema_version', 'validation_fingerprint'])
+
+    result.checked += len(rows)
+    result.updated += len(valid)
+
+
+def iter_batches(queryset, fields, batch_size=DEFAULT_BATCH_SIZE, last_id=None):
+    """Yield the rows of a queryset in primary key order, batch by batch.
+
+    Each batch is read with its own keyset query starting after the last
+    id of the previous one, so no cursor stays open while batches are
+    updated and committed.
+    """
+    while True:
+        batch = queryset
+        if last_id is not None:
+            batch = batch.filter(id__gt=last_id)
+
+        batch = list(batch.order_by('id').values(*fields)[:batch_size])
+        if not batch:
+            return
+
+        yield batch
+        last_id = batch[-1]['id']
+
+
+def revalidate(queryset, context_class, fields, build, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    using = queryset.db
+    result = RevalidationResult()
+
+    for batch in iter_batches(queryset, fields, batch_size=batch_size):
+        context = context_class(batch, using=using)
+        revalidate_batch(context, batch, build, result, workers=workers, using=using)
+
+    return result
+
+
+def revalidate_organisms(queryset, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    """Validate organisms in batches and update their validation state.
+
+    Organisms that pass get the current schema version and fingerprint,
+    so clean() skips them until their data or schemas change. Invalid
+    organisms are left untouched and reported in the result.
+    """
+    return revalidate(
+        queryset,
+        OrganismBatchContext,
+        ORGANISM_RECORD_FIELDS,
+        build_organism,
+        batch_size=batch_size,
+        workers=workers)
+
+
+def revalidate_organism_captures(queryset, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    return revalidate(
+        queryset,
+        OrganismCaptureBatchContext,
+        CAPTURE_RECORD_FIELDS,
+        build_organism_capture,
+        batch_size=batch_size,
+        workers=workers)
+
+
+REVALIDATIONS = {
+    ORGANISMS: (
+        get_stale_organisms,
+        OrganismBatchContext,
+        ORGANISM_RECORD_FIELDS,
+        build_organism),
+    ORGANISM_CAPTURES: (
+        get_stale_organism_captures,
+        OrganismCaptureBatchContext,
+        CAPTURE_RECORD_FIELDS,
+        build_organism_capture),
+}
+
+
+def open_report(path, offset):
+    # Anything written after the last checkpoint belongs to a batch that
+    # was not committed and will be checked again.
+    report = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+    report.seek(offset)
+    report.truncate()
+    return report
+
+
+def write_violations(report, errors):
+    for pk, messages in sorted(errors.items()):
+        line = json.dumps(
+            {'id': pk, 'errors': messages},
+            separators=(',', ':'),
+            ensure_ascii=False)
+        report.write(line.encode('utf-8') + b'\n')
+
+    report.flush()
+    os.fsync(report.fileno())
+    return report.tell()
+
+
+def start_revalidation_job(kind, report_path, types=None):
+    from irekua_organisms.models import RevalidationJob
+
+    return RevalidationJob.objects.create(
+        kind=kind,
+        report_path=report_path,
+        types=sorted(types or []))
+
+
+def run_revalidation_job(job, batch_size=DEFAULT_BATCH_SIZE, workers=None, using=DEFAULT_DB_ALIAS):
+    """Run or resume a revalidation job until every stale record is checked.
+
+    The current schema versions are computed once, then stale records
+    are read in primary key order, one keyset query per batch starting
+    after the last checkpoint, and validated in parallel.
+    No cursor is held across commits, which PostgreSQL would otherwise
+    materialize in full. After each batch, the validation state of the
+    valid records, the job counters and the last checked id are committed
+    together, and the violations are appended to the job report. A job
+    interrupted at any point resumes after its last checkpoint.
+    """
+    get_stale, context_class, fields, build = REVALIDATIONS[job.kind]
+
+    # The current schema versions are computed once for the whole job.
+    stale = get_stale(job.types or None, using=using)
+    batches = iter_batches(stale, fields, batch_size=batch_size, last_id=job.last_id)
+
+    with open_report(job.report_path, job.report_offset) as report:
+        for batch in batches:
+            result = RevalidationResult()
+            context = context_class(batch, using=using)
+
+            with transaction.atomic(using=using):
+                revalidate_batch(context, batch, build, result, workers=workers, using=using)
+                offset = write_violations(report, result.errors)
+                job.checkpoint(
+                    batch[-1]['id'],
+                    result.checked,
+                    result.updated,
+                    len(result.errors),
+                    offset)
+
+    job.finish()
+    return job
@@ -0,0 +1,194 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Case
+from django.db.models import When
+from django.db.models import Value
+from django.db.models import FloatField
+from django.db.models import CharField
+from django.db.models import TextField
+from django.db.models.lookups import IContains
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import SearchVectorField
+from django.contrib.postgres.search import TrigramSimilarity
+
+from irekua_organisms.utils.iterables import chunked
+
+
+DEFAULT_SEARCH_CONFIG = 'simple'
+DEFAULT_BATCH_SIZE = 1000
+
+
+class PortableSearchVectorField(SearchVectorField):
+    """tsvector column on PostgreSQL and an unused text column elsewhere."""
+
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return 'tsvector'
+
+        return 'text'
+
+
+class TrigramContains(IContains):
+    """Case insensitive substring match that trigram indexes can serve.
+
+    icontains compiles to UPPER(column) LIKE UPPER(pattern) on
+    PostgreSQL, which gin_trgm_ops indexes cannot answer, so this lookup
+    uses ILIKE instead. Other databases run a regular icontains.
+    """
+
+    lookup_name = 'trigram_contains'
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return '%s ILIKE %s' % (lhs_sql, rhs_sql), lhs_params + rhs_params
+
+
+CharField.register_lookup(TrigramContains)
+TextField.register_lookup(TrigramContains)
+
+
+def get_search_config():
+    return getattr(settings, 'IREKUA_ORGANISMS_SEARCH_CONFIG', DEFAULT_SEARCH_CONFIG)
+
+
+def is_postgresql(using):
+    return connections[using].vendor == 'postgresql'
+
+
+def build_search_text(name, remarks, labels):
+    return ' '.join(value for value in [name, remarks, *labels] if value)
+
+
+def update_search(queryset, batch_size=DEFAULT_BATCH_SIZE):
+    """Recompute the search columns of the organisms in queryset.
+
+    The search text joins name, remarks and label term values. On
+    PostgreSQL the search vector is then computed from it in the
+    database. Rows are written with update queries, so no signals are
+    sent. Works with historical models in migrations.
+    """
+    model = queryset.model
+    using = queryset.db
+    labels_field = model._meta.get_field('labels')
+    through = labels_field.remote_field.through
+    source = labels_field.m2m_field_name()
+    target = labels_field.m2m_reverse_field_name()
+
+    rows = (
+        queryset
+        .order_by('id')
+        .values_list('id', 'name', 'remarks')
+        .iterator(chunk_size=batch_size))
+
+    count = 0
+    for batch in chunked(rows, batch_size):
+        ids = [row[0] for row in batch]
+
+        labels = {pk: [] for pk in ids}
+        for pk, value in (
+                through.objects.using(using)
+                .filter(**{source + '__in': ids})
+                .order_by(source, target + '__value')
+                .values_list(source, target + '__value')):
+            labels[pk].append(value)
+
+        model.objects.using(using).bulk_update(
+            [
+                model(id=pk, search_text=build_search_text(name, remarks, labels[pk]))
+                for pk, name, remarks in batch
+            ],
+            ['search_text'])
+
+        if is_postgresql(using):
+            (
+                model.objects.using(using)
+                .filter(id__in=ids)
+                .update(search_vector=SearchVector('search_text', config=get_search_config()))
+            )
+
+        count += len(batch)
+
+    return count
+
+
+def update_organism_search(organism_ids, using=None):
+    from irekua_organisms.models import Organism
+
+    queryset = Organism.objects.filter(id__in=list(organism_ids))
+    if using is not None:
+        queryset = queryset.using(using)
+
+    return update_search(queryset)
+
+
+def search_organisms(queryset, q):
+    """Filter organisms matching q and annotate them with a rank.
+
+    On PostgreSQL this is a full text search on the GIN indexed search
+    vector, ranked by ts_rank and accepting web search syntax. Other
+    databases match every word of q in the search text.
+    """
+    if is_postgresql(queryset.db):
+        query = SearchQuery(q, config=get_search_config(), search_type='websearch')
+        return (
+            queryset
+            .filter(search_vector=query)
+            .annotate(rank=SearchRank(F('search_vector'), query))
+            .order_by('-rank', '-created_on', '-id'))
+
+    for word in q.split():
+        queryset = queryset.filter(search_text__icontains=word)
+
+    return (
+        queryset
+        .annotate(rank=Case(
+            When(name__iexact=q, then=Value(1.0)),
+            When(name__icontains=q, then=Value(0.5)),
+            default=Value(0.1),
+            output_field=FloatField()))
+        .order_by('-rank', '-created_on', '-id'))
+
+
+def search_types(queryset, q):
+    """Filter organism or capture types by name and description.
+
+    On PostgreSQL names and descriptions are matched with the pg_trgm
+    word similarity operator or as a substring with ILIKE, all served by
+    the trigram indexes on both columns, so typos are tolerated. Matches
+    are ranked by the trigram similarity of the name plus the full text
+    rank of the name and description. Other databases match q as a
+    substring of the name or description.
+    """
+    if is_postgresql(queryset.db):
+        config = get_search_config()
+        query = SearchQuery(q, config=config, search_type='websearch')
+
+        return (
+            queryset
+            .filter(
+                Q(name__trigram_word_similar=q) |
+                Q(name__trigram_contains=q) |
+                Q(description__trigram_word_similar=q) |
+                Q(description__trigram_contains=q))
+            .annotate(rank=(
+                TrigramSimilarity('name', q) +
+                SearchRank(SearchVector('name', 'description', config=config), query)))
+            .order_by('-rank', 'name'))
+
+    return (
+        queryset
+        .filter(Q(name__icontains=q) | Q(description__icontains=q))
+        .annotate(rank=Case(
+            When(name__iexact=q, then=Value(1.0)),
+            When(name__icontains=q, then=Value(0.5)),
+            default=Value(0.1),
+            output_field=FloatField()))
+        .order_by('-rank', 'name'))
@@ -0,0 +1,559 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import pre_save
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.db.models.signals import post_delete
+from django.db.models.signals import m2m_changed
+from django.core.signals import setting_changed
+
+from irekua_database.models import Collection
+from irekua_database.models import SamplingEvent
+from irekua_database.models import SamplingEventDevice
+from irekua_database.models import Term
+
+from irekua_organisms.models import Organism
+from irekua_organisms.models import OrganismType
+from irekua_organisms.models import OrganismCapture
+from irekua_organisms.models import OrganismCaptureType
+from irekua_organisms.models import CollectionTypeOrganismConfig
+from irekua_organisms.models import CollectionTypeOrganismType
+from irekua_organisms.models import CollectionTypeOrganismCaptureType
+from irekua_organisms.models import OrganismChange
+from irekua_organisms.utils import invalidate_validators
+from irekua_organisms.utils import invalidate_allowed_term_types
+from irekua_organisms.snapshots import invalidate_config_snapshot
+from irekua_organisms.catalog import bump_catalog_version
+from irekua_organisms.catalog import clear_type_catalog
+from irekua_organisms.utils.denormalization import sync_capture_collections
+from irekua_organisms.utils.deferral import signals_deferred
+from irekua_organisms import identification
+from irekua_organisms import search
+from irekua_organisms import statistics
+from irekua_organisms import changes
+from irekua_organisms import thumbnails
+
+
+SCHEMA_MODELS = (
+    OrganismType,
+    CollectionTypeOrganismType,
+    CollectionTypeOrganismCaptureType,
+)
+
+CONFIG_LINK_MODELS = (
+    CollectionTypeOrganismType,
+    CollectionTypeOrganismCaptureType,
+)
+
+CATALOG_SETTINGS = (
+    'DATABASES',
+    'CACHES',
+    'IREKUA_ORGANISMS_CONFIG_CACHE',
+    'IREKUA_ORGANISMS_TYPE_CATALOG',
+)
+
+TERM_TYPE_MODELS = (
+    OrganismType,
+    OrganismCaptureType,
+)
+
+ICON_MODELS = (
+    OrganismType,
+    OrganismCaptureType,
+)
+
+STATISTICS = {
+    Organism: (
+        ('collection_id', 'organism_type_id'),
+        statistics.ORGANISM_COUNT,
+        statistics.record_organisms,
+        statistics.remove_organisms),
+    OrganismCapture: (
+        ('collection_id', 'organism_capture_type_id'),
+        statistics.CAPTURE_COUNT,
+        statistics.record_captures,
+        statistics.remove_captures),
+}
+
+CHANGE_RELATIONS = {
+    Organism.labels.through: (Organism, 'labels'),
+    Organism.items.through: (Organism, 'items'),
+    OrganismCapture.labels.through: (OrganismCapture, 'labels'),
+    OrganismCapture.items.through: (OrganismCapture, 'items'),
+}
+
+CHANGE_ACTIONS = {
+    'post_add': OrganismChange.ADD,
+    'post_remove': OrganismChange.REMOVE,
+    'post_clear': OrganismChange.CLEAR,
+}
+
+
+def invalidate_schema_validators(sender, instance, **kwargs):
+    invalidate_validators(instance)
+
+
+def invalidate_config_after_commit(collection_type_id):
+    # Invalidated now for this transaction and again after commit, since
+    # another process could cache the previous configuration in between.
+    invalidate_config_snapshot(collection_type_id)
+    transaction.on_commit(lambda: invalidate_config_snapshot(collection_type_id))
+
+
+def invalidate_config(sender, instance, **kwargs):
+    invalidate_config_after_commit(instance.collection_type_id)
+
+
+def invalidate_config_link(sender, instance, **kwargs):
+    invalidate_config_after_commit(instance.collection_type_organism_config_id)
+
+
+def invalidate_term_types_after_commit(model, pks):
+    # Invalidated now and after commit, like configuration snapshots.
+    pks = set(pks)
+    invalidate_allowed_term_types(model, pks)
+    transaction.on_commit(lambda: invalidate_allowed_term_types(model, pks))
+
+
+def invalidate_type_term_types(sender, instance, **kwargs):
+    invalidate_term_types_after_commit(sender, {instance.pk})
+
+
+def invalidate_term_types_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action in ('pre_clear', 'post_clear') and reverse:
+        # pk_set is not sent when clearing, so the related types are read
+        # before the relations are removed.
+        if action == 'pre_clear':
+            instance._cleared_type_pks = list(
+                model.objects
+                .filter(term_types=instance.pk)
+                .values_list('pk', flat=True))
+        else:
+            invalidate_term_types_after_commit(
+                model,
+                getattr(instance, '_cleared_type_pks', []))
+        return
+
+    if not action.startswith('post_'):
+        return
+
+    if not reverse:
+        invalidate_term_types_after_commit(type(instance), {instance.pk})
+    else:
+        invalidate_term_types_after_commit(model, pk_set)
+
+
+def bump_type_catalog(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    # Only after commit, so that no process caches rows that could still
+    # be rolled back.
+    transaction.on_commit(bump_catalog_version)
+
+
+def bump_type_catalog_term_types(sender, instance, action, **kwargs):
+    if not action.startswith('post_'):
+        return
+
+    transaction.on_commit(bump_catalog_version)
+
+
+def clear_type_catalog_setting(sender, setting, **kwargs):
+    if setting in CATALOG_SETTINGS:
+        clear_type_catalog()
+
+
+def sync_collection_captures(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    sync_capture_collections(
+        OrganismCapture.objects.filter(collection=instance.pk),
+        instance.pk,
+        instance.collection_type_id)
+
+
+def sync_sampling_event_captures(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    sync_capture_collections(
+        OrganismCapture.objects.filter(sampling_event_device__sampling_event=instance.pk),
+        instance.collection_id,
+        instance.collection.collection_type_id)
+
+
+def sync_sampling_event_device_captures(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    collection = instance.sampling_event.collection
+    sync_capture_collections(
+        OrganismCapture.objects.filter(sampling_event_device=instance.pk),
+        collection.pk,
+        collection.collection_type_id)
+
+
+def get_statistics_key(sender, instance):
+    fields, unused, unused, unused = STATISTICS[sender]
+    return tuple(getattr(instance, field) for field in fields)
+
+
+def remember_statistics_key(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None or signals_deferred():
+        return
+
+    fields, unused, unused, unused = STATISTICS[sender]
+    instance._previous_statistics_key = (
+        sender.objects
+        .filter(pk=instance.pk)
+        .values_list(*fields)
+        .first())
+
+
+def update_statistics(sender, instance, created, raw=False, **kwargs):
+    if raw or signals_deferred():
+        return
+
+    unused, field, record, remove = STATISTICS[sender]
+    key = get_statistics_key(sender, instance)
+    group = (1, instance.created_on, instance.created_on)
+    using = instance._state.db
+
+    if created:
+        record({key: group}, using=using)
+        return
+
+    previous = getattr(instance, '_previous_statistics_key', None)
+    if previous is None or previous == key:
+        return
+
+    remove({previous: group}, using=using)
+    record({key: group}, using=using)
+
+    if previous[0] != key[0]:
+        term_ids = list(instance.labels.values_list('id', flat=True))
+        statistics.record_labels(previous[0], term_ids, field, delta=-1, using=using)
+        statistics.record_labels(key[0], term_ids, field, using=using)
+
+
+def remember_statistics_labels(sender, instance, **kwargs):
+    if signals_deferred():
+        return
+
+    instance._statistics_labels = list(instance.labels.values_list('id', flat=True))
+
+
+def remove_statistics(sender, instance, **kwargs):
+    if signals_deferred():
+        return
+
+    unused, field, unused, remove = STATISTICS[sender]
+    key = get_statistics_key(sender, instance)
+
+    using = instance._state.db
+
+    remove({key: (1, instance.created_on, instance.created_on)}, using=using)
+    statistics.record_labels(
+        key[0],
+        getattr(instance, '_statistics_labels', []),
+        field,
+        delta=-1,
+        using=using)
+
+
+def update_label_statistics(
+        sender, instance, action, reverse, model, pk_set, using=DEFAULT_DB_ALIAS, **kwargs):
+    if signals_deferred():
+        return
+
+    labeled_model = Organism if sender is Organism.labels.through else OrganismCapture
+    unused, field, unused, unused = STATISTICS[labeled_model]
+
+    if action in ('pre_remove', 'pre_clear'):
+        # pk_set holds every requested pk, also those that are not
+        # related, so the relations actually removed are read first.
+        if reverse:
+            removed = labeled_model.objects.filter(labels=instance.pk)
+            if action == 'pre_remove':
+                removed = removed.filter(pk__in=pk_set)
+            instance._removed_labels = list(removed.values_list('collection_id', flat=True))
+        else:
+            removed = instance.labels.all()
+            if action == 'pre_remove':
+                removed = removed.filter(pk__in=pk_set)
+            instance._removed_labels = list(removed.values_list('id', flat=True))
+        return
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    delta = 1 if action == 'post_add' else -1
+
+    if not reverse:
+        if action != 'post_add':
+            pk_set = getattr(instance, '_removed_labels', [])
+
+        statistics.record_labels(
+            instance.collection_id, pk_set, field, delta=delta, using=using)
+        return
+
+    if action != 'post_add':
+        collections = getattr(instance, '_removed_labels', [])
+    else:
+        collections = (
+            labeled_model.objects
+            .filter(pk__in=pk_set)
+            .values_list('collection_id', flat=True))
+
+    for collection_id, count in Counter(collections).items():
+        statistics.record_labels(
+            collection_id, [instance.pk] * count, field, delta=delta, using=using)
+
+
+def index_identification(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or signals_deferred():
+        return
+
+    if update_fields is not None and not {
+            'organism_type', 'identification_info'}.intersection(update_fields):
+        return
+
+    identification.index_organisms([instance], using=instance._state.db)
+
+
+def remember_indexable_paths(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+
+    schema = (
+        sender.objects
+        .filter(pk=instance.pk)
+        .values_list('identification_info_schema', flat=True)
+        .first())
+
+    if schema is not None:
+        instance._previous_indexable_paths = identification.get_indexable_paths(schema)
+
+
+def reindex_organism_type(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+
+    paths = identification.get_indexable_paths(instance.identification_info_schema)
+    if getattr(instance, '_previous_indexable_paths', None) == paths:
+        return
+
+    identification.reindex_organisms(Organism.objects.filter(organism_type=instance.pk))
+
+
+def update_search(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or signals_deferred():
+        return
+
+    if update_fields is not None and not {'name', 'remarks'}.intersection(update_fields):
+        return
+
+    search.update_organism_search([instance.pk], using=instance._state.db)
+
+
+def update_label_search(sender, instance, action, reverse, pk_set, **kwargs):
+    if signals_deferred():
+        return
+
+    if action == 'pre_clear' and reverse:
+        instance._cleared_search_ids = list(
+            Organism.objects
+            .filter(labels=instance.pk)
+            .values_list('id', flat=True))
+        return
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        organism_ids = [instance.pk]
+    elif action == 'post_clear':
+        organism_ids = getattr(instance, '_cleared_search_ids', [])
+    else:
+        organism_ids = pk_set
+
+    search.update_organism_search(organism_ids)
+
+
+def update_term_search(sender, instance, created, raw=False, **kwargs):
+    if raw or created or signals_deferred():
+        return
+
+    search.update_search(Organism.objects.filter(labels=instance.pk))
+
+
+def remember_icon(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+
+    instance._previous_icon = (
+        sender.objects
+        .filter(pk=instance.pk)
+        .values_list('icon', flat=True)
+        .first())
+
+
+def generate_icon_thumbnails(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+
+    if update_fields is not None and 'icon' not in update_fields:
+        return
+
+    icon = instance.icon.name if instance.icon else None
+    if not created and getattr(instance, '_previous_icon', None) == icon:
+        return
+
+    if icon:
+        thumbnails.schedule_icon_thumbnails(sender, instance.pk)
+    elif instance.icon_thumbnails:
+        sender.objects.filter(pk=instance.pk).update(icon_thumbnails={})
+        instance.icon_thumbnails = {}
+
+
+def record_saved_change(sender, instance, created, raw=False, **kwargs):
+    if raw or signals_deferred():
+        return
+
+    action = OrganismChange.CREATE if created else OrganismChange.UPDATE
+    collections = [instance.collection_id]
+
+    previous = getattr(instance, '_previous_statistics_key', None)
+    if not created and previous is not None:
+        collections.append(previous[0])
+
+    changes.record_change(
+        sender,
+        instance.pk,
+        action,
+        collections=collections,
+        using=instance._state.db)
+
+
+def record_deleted_change(sender, instance, **kwargs):
+    if signals_deferred():
+        return
+
+    changes.record_change(
+        sender,
+        instance.pk,
+        OrganismChange.DELETE,
+        {'collection_id': instance.collection_id},
+        collections=[instance.collection_id],
+        using=instance._state.db)
+
+
+def record_relation_change(
+        sender, instance, action, reverse, pk_set, using=DEFAULT_DB_ALIAS, **kwargs):
+    if signals_deferred():
+        return
+
+    model, field = CHANGE_RELATIONS[sender]
+
+    if action == 'pre_clear' and reverse:
+        instance._cleared_change_ids = list(
+            model.objects
+            .filter(**{field: instance.pk})
+            .values_list('id', 'collection_id'))
+        return
+
+    if action not in CHANGE_ACTIONS:
+        return
+
+    change_action = CHANGE_ACTIONS[action]
+
+    if not reverse:
+        payload = {'field': field}
+        if pk_set is not None:
+            payload['ids'] = sorted(pk_set)
+
+        changes.record_change(
+            model,
+            instance.pk,
+            change_action,
+            payload,
+            collections=[instance.collection_id],
+            using=using)
+        return
+
+    if action == 'post_clear':
+        cleared = getattr(instance, '_cleared_change_ids', [])
+        object_ids = [object_id for object_id, unused in cleared]
+        collections = [collection_id for unused, collection_id in cleared]
+        change_action = OrganismChange.REMOVE
+    else:
+        object_ids = sorted(pk_set)
+        collections = (
+            model.objects.using(using)
+            .filter(pk__in=object_ids)
+            .order_by()
+            .values_list('collection_id', flat=True)
+            .distinct())
+
+    changes.record_changes(
+        model,
+        object_ids,
+        change_action,
+        {'field': field, 'ids': [instance.pk]},
+        collections=collections,
+        using=using)
+
+
+for model in SCHEMA_MODELS:
+    post_save.connect(invalidate_schema_validators, sender=model)
+    post_delete.connect(invalidate_schema_validators, sender=model)
+
+post_save.connect(invalidate_config, sender=CollectionTypeOrganismConfig)
+post_delete.connect(invalidate_config, sender=CollectionTypeOrganismConfig)
+
+for model in CONFIG_LINK_MODELS:
+    post_save.connect(invalidate_config_link, sender=model)
+    post_delete.connect(invalidate_config_link, sender=model)
+
+for model in TERM_TYPE_MODELS:
+    post_delete.connect(invalidate_type_term_types, sender=model)
+    m2m_changed.connect(invalidate_term_types_change, sender=model.term_types.through)
+    post_save.connect(bump_type_catalog, sender=model)
+    post_delete.connect(bump_type_catalog, sender=model)
+    m2m_changed.connect(bump_type_catalog_term_types, sender=model.term_types.through)
+
+setting_changed.connect(clear_type_catalog_setting)
+
+post_save.connect(sync_collection_captures, sender=Collection)
+post_save.connect(sync_sampling_event_captures, sender=SamplingEvent)
+post_save.connect(sync_sampling_event_device_captures, sender=SamplingEventDevice)
+
+for model in STATISTICS:
+    pre_save.connect(remember_statistics_key, sender=model)
+    post_save.connect(update_statistics, sender=model)
+    pre_delete.connect(remember_statistics_labels, sender=model)
+    post_delete.connect(remove_statistics, sender=model)
+    m2m_changed.connect(update_label_statistics, sender=model.labels.through)
+
+post_save.connect(index_identification, sender=Organism)
+pre_save.connect(remember_indexable_paths, sender=OrganismType)
+post_save.connect(reindex_organism_type, sender=OrganismType)
+
+post_save.connect(update_search, sender=Organism)
+m2m_changed.connect(update_label_search, sender=Organism.labels.through)
+post_save.connect(update_term_search, sender=Term)
+
+for model in ICON_MODELS:
+    pre_save.connect(remember_icon, sender=model)
+    post_save.connect(generate_icon_thumbnails, sender=model)
+
+for model in STATISTICS:
+    post_save.connect(record_saved_change, sender=model)
+    post_delete.connect(record_deleted_change, sender=model)
+
+for through in CHANGE_RELATIONS:
+    m2m_changed.connect(record_relation_change, sender=through)
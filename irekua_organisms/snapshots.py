@@ -0,0 +1,223 @@
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models import CollectionType
+
+
+CACHE_KEY = 'irekua_organisms:organism_config:{}'
+
+
+TypeLink = namedtuple('TypeLink', ['id', 'metadata_schema'])
+
+
+class OrganismConfigSnapshot(namedtuple('OrganismConfigSnapshot', [
+        'collection_type_id',
+        'collection_type_name',
+        'use_organisms',
+        'organism_types',
+        'capture_types'])):
+    """Immutable view of the organism configuration of a collection type.
+
+    Allowed organism and capture types are mappings from type id to a
+    TypeLink holding the primary key and metadata schema of the
+    collection type link, so membership checks need no queries.
+    """
+
+    __slots__ = ()
+
+    def __new__(
+            cls,
+            collection_type_id,
+            collection_type_name,
+            use_organisms,
+            organism_types,
+            capture_types):
+        return super().__new__(
+            cls,
+            collection_type_id,
+            collection_type_name,
+            bool(use_organisms),
+            MappingProxyType(dict(organism_types)),
+            MappingProxyType(dict(capture_types)))
+
+    def __reduce__(self):
+        args = (
+            self.collection_type_id,
+            self.collection_type_name,
+            self.use_organisms,
+            dict(self.organism_types),
+            dict(self.capture_types))
+        return (self.__class__, args)
+
+    def validate_use_organisms(self):
+        if not self.use_organisms:
+            raise ValidationError(_('This collection does not allow organisms'))
+
+    def get_organism_type_link(self, organism_type):
+        try:
+            return self.organism_types[organism_type.pk]
+        except KeyError:
+            msg = _(
+                'Organism type %(organism_type)s is not accepted in collections of '
+                'type %(col_type)s')
+            params = dict(
+                organism_type=organism_type.name,
+                col_type=self.collection_type_name)
+            raise ValidationError(msg % params)
+
+    def validate_and_get_organism_type(self, organism_type):
+        from irekua_organisms.models import CollectionTypeOrganismType
+
+        link = self.get_organism_type_link(organism_type)
+        return CollectionTypeOrganismType(
+            id=link.id,
+            collection_type_organism_config_id=self.collection_type_id,
+            organism_type=organism_type,
+            metadata_schema=link.metadata_schema)
+
+    def get_organism_capture_type_link(self, capture_type):
+        try:
+            return self.capture_types[capture_type.pk]
+        except KeyError:
+            msg = _(
+                'Organism capture type %(capture_type)s is not accepted in collections '
+                'of type %(col_type)s')
+            params = dict(
+                capture_type=capture_type.name,
+                col_type=self.collection_type_name)
+            raise ValidationError(msg % params)
+
+    def validate_and_get_organism_capture_type(self, capture_type):
+        from irekua_organisms.models import CollectionTypeOrganismCaptureType
+
+        link = self.get_organism_capture_type_link(capture_type)
+        return CollectionTypeOrganismCaptureType(
+            id=link.id,
+            collection_type_organism_config_id=self.collection_type_id,
+            organism_capture_type=capture_type,
+            metadata_schema=link.metadata_schema)
+
+
+_snapshots = {}
+_lock = threading.Lock()
+
+
+def get_shared_cache():
+    alias = getattr(settings, 'IREKUA_ORGANISMS_CONFIG_CACHE', None)
+
+    if alias is None:
+        return None
+
+    return caches[alias]
+
+
+def load_config_snapshots(collection_type_ids, using=DEFAULT_DB_ALIAS):
+    from irekua_organisms.models import CollectionTypeOrganismType
+    from irekua_organisms.models import CollectionTypeOrganismCaptureType
+
+    organism_types = {pk: {} for pk in collection_type_ids}
+    capture_types = {pk: {} for pk in collection_type_ids}
+
+    links = (
+        CollectionTypeOrganismType.objects.using(using)
+        .filter(collection_type_organism_config__in=collection_type_ids)
+        .values_list(
+            'collection_type_organism_config_id',
+            'organism_type_id',
+            'id',
+            'metadata_schema'))
+    for collection_type_id, organism_type_id, link_id, schema in links:
+        organism_types[collection_type_id][organism_type_id] = TypeLink(link_id, schema)
+
+    links = (
+        CollectionTypeOrganismCaptureType.objects.using(using)
+        .filter(collection_type_organism_config__in=collection_type_ids)
+        .values_list(
+            'collection_type_organism_config_id',
+            'organism_capture_type_id',
+            'id',
+            'metadata_schema'))
+    for collection_type_id, capture_type_id, link_id, schema in links:
+        capture_types[collection_type_id][capture_type_id] = TypeLink(link_id, schema)
+
+    collection_types = (
+        CollectionType.objects.using(using)
+        .filter(id__in=collection_type_ids)
+        .values_list('id', 'name', 'collectiontypeorganismconfig__use_organisms'))
+
+    return {
+        collection_type_id: OrganismConfigSnapshot(
+            collection_type_id,
+            name,
+            use_organisms,
+            organism_types[collection_type_id],
+            capture_types[collection_type_id])
+        for collection_type_id, name, use_organisms in collection_types
+    }
+
+
+def get_config_snapshots(collection_type_ids, using=DEFAULT_DB_ALIAS):
+    """Return organism configuration snapshots for the given collection types.
+
+    Snapshots are kept in process memory, or in the Django cache named by
+    the IREKUA_ORGANISMS_CONFIG_CACHE setting when it is set, so that all
+    worker processes share them. Missing snapshots are loaded together.
+    Collection types that do not exist are left out of the result.
+    """
+    collection_type_ids = set(collection_type_ids)
+    shared_cache = get_shared_cache()
+
+    if shared_cache is not None:
+        keys = {CACHE_KEY.format(pk): pk for pk in collection_type_ids}
+        snapshots = {
+            keys[key]: snapshot
+            for key, snapshot in shared_cache.get_many(list(keys)).items()}
+    else:
+        with _lock:
+            snapshots = {
+                pk: _snapshots[pk]
+                for pk in collection_type_ids
+                if pk in _snapshots}
+
+    missing = collection_type_ids.difference(snapshots)
+    if not missing:
+        return snapshots
+
+    loaded = load_config_snapshots(missing, using=using)
+    snapshots.update(loaded)
+
+    if shared_cache is not None:
+        shared_cache.set_many({
+            CACHE_KEY.format(pk): snapshot
+            for pk, snapshot in loaded.items()}, timeout=None)
+    else:
+        with _lock:
+            _snapshots.update(loaded)
+
+    return snapshots
+
+
+def get_config_snapshot(collection_type_id, using=DEFAULT_DB_ALIAS):
+    snapshots = get_config_snapshots([collection_type_id], using=using)
+    return snapshots[collection_type_id]
+
+
+def invalidate_config_snapshot(collection_type_id):
+    with _lock:
+        _snapshots.pop(collection_type_id, None)
+
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(CACHE_KEY.format(collection_type_id))
+
+
+def clear_config_snapshots():
+    with _lock:
+        _snapshots.clear()
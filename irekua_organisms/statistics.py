@@ -0,0 +1,582 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import Count
+from django.db.models import Min
+from django.db.models import Max
+from django.db.models import Sum
+from django.db.models import DateTimeField
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Greatest
+from django.db.models.functions import Least
+from django.utils import timezone
+
+
+ORGANISM_COUNT = 'organism_count'
+CAPTURE_COUNT = 'capture_count'
+CHANGE_VERSION = 'change_version'
+
+
+def get_id(value):
+    return getattr(value, 'pk', value)
+
+
+def merge_range(first, last, other_first, other_last):
+    firsts = [date for date in (first, other_first) if date is not None]
+    lasts = [date for date in (last, other_last) if date is not None]
+    return (min(firsts, default=None), max(lasts, default=None))
+
+
+def group_created_on(instances, key):
+    """Group instances into {key: (count, first created_on, last created_on)}."""
+    groups = {}
+
+    for instance in instances:
+        group = key(instance)
+        count, first, last = groups.get(group, (0, None, None))
+        first, last = merge_range(first, last, instance.created_on, instance.created_on)
+        groups[group] = (count + 1, first, last)
+
+    return groups
+
+
+def increment(
+        model,
+        rows,
+        field,
+        delta,
+        first_field=None,
+        last_field=None,
+        using=DEFAULT_DB_ALIAS):
+    """Add delta to a counter of existing or new rows.
+
+    rows maps the lookup of every row to a (first, last) created_on range
+    that extends the stored range. Missing rows are created first with
+    the counter at zero, so concurrent writers never lose increments.
+    """
+    if not rows:
+        return
+
+    model.objects.using(using).bulk_create(
+        [model(**lookup) for lookup, unused in rows],
+        ignore_conflicts=True)
+
+    for lookup, (first, last) in rows:
+        updates = {field: F(field) + delta, 'modified_on': timezone.now()}
+
+        if first_field is not None and first is not None:
+            first = Value(first, output_field=DateTimeField())
+            updates[first_field] = Coalesce(Least(first_field, first), first)
+
+        if last_field is not None and last is not None:
+            last = Value(last, output_field=DateTimeField())
+            updates[last_field] = Coalesce(Greatest(last_field, last), last)
+
+        model.objects.using(using).filter(**lookup).update(**updates)
+
+
+def record_organisms(groups, using=DEFAULT_DB_ALIAS):
+    """Count new organisms grouped by (collection id, organism type id)."""
+    from irekua_organisms.models import CollectionOrganismStatistics
+    from irekua_organisms.models import CollectionOrganismTypeCount
+
+    summaries = {}
+    for (collection_id, organism_type_id), (count, first, last) in groups.items():
+        increment(
+            CollectionOrganismTypeCount,
+            [(dict(collection_id=collection_id, organism_type_id=organism_type_id), (first, last))],
+            ORGANISM_COUNT,
+            count,
+            'first_created_on',
+            'last_created_on',
+            using=using)
+
+        total, summary_first, summary_last = summaries.get(collection_id, (0, None, None))
+        summaries[collection_id] = (
+            total + count,
+            *merge_range(summary_first, summary_last, first, last))
+
+    for collection_id, (count, first, last) in summaries.items():
+        increment(
+            CollectionOrganismStatistics,
+            [(dict(collection_id=collection_id), (first, last))],
+            ORGANISM_COUNT,
+            count,
+            'first_organism_on',
+            'last_organism_on',
+            using=using)
+
+
+def record_captures(groups, using=DEFAULT_DB_ALIAS):
+    """Count new captures grouped by (collection id, capture type id)."""
+    from irekua_organisms.models import OrganismCaptureType
+    from irekua_organisms.models import CollectionOrganismStatistics
+    from irekua_organisms.models import CollectionCaptureTypeCount
+
+    if not groups:
+        return
+
+    device_types = dict(
+        OrganismCaptureType.objects.using(using)
+        .filter(id__in={capture_type_id for unused, capture_type_id in groups})
+        .values_list('id', 'device_type_id'))
+
+    summaries = {}
+    for (collection_id, capture_type_id), (count, first, last) in groups.items():
+        lookup = dict(
+            collection_id=collection_id,
+            organism_capture_type_id=capture_type_id,
+            device_type_id=device_types[capture_type_id])
+        increment(
+            CollectionCaptureTypeCount,
+            [(lookup, (first, last))],
+            CAPTURE_COUNT,
+            count,
+            'first_created_on',
+            'last_created_on',
+            using=using)
+
+        total, summary_first, summary_last = summaries.get(collection_id, (0, None, None))
+        summaries[collection_id] = (
+            total + count,
+            *merge_range(summary_first, summary_last, first, last))
+
+    for collection_id, (count, first, last) in summaries.items():
+        increment(
+            CollectionOrganismStatistics,
+            [(dict(collection_id=collection_id), (first, last))],
+            CAPTURE_COUNT,
+            count,
+            'first_capture_on',
+            'last_capture_on',
+            using=using)
+
+
+def record_labels(collection_id, term_ids, field, delta=1, using=DEFAULT_DB_ALIAS):
+    """Update label usage counts of a collection.
+
+    field is ORGANISM_COUNT or CAPTURE_COUNT. Term ids may repeat, once
+    per labeled object.
+    """
+    from irekua_organisms.models import CollectionLabelCount
+
+    counts = {}
+    for term_id in term_ids:
+        counts[term_id] = counts.get(term_id, 0) + delta
+
+    if not counts:
+        return
+
+    added = [term_id for term_id, count in counts.items() if count > 0]
+    if added:
+        existing = set(
+            CollectionLabelCount.objects.using(using)
+            .filter(collection_id=collection_id, term_id__in=added)
+            .values_list('term_id', flat=True))
+        CollectionLabelCount.objects.using(using).bulk_create(
+            [
+                CollectionLabelCount(collection_id=collection_id, term_id=term_id)
+                for term_id in added if term_id not in existing],
+            ignore_conflicts=True)
+
+    by_delta = {}
+    for term_id, count in counts.items():
+        by_delta.setdefault(count, []).append(term_id)
+
+    for count, terms in by_delta.items():
+        queryset = CollectionLabelCount.objects.using(using).filter(
+            collection_id=collection_id,
+            term_id__in=terms)
+
+        if count < 0:
+            # Statistics that were never built must not become negative.
+            queryset = queryset.filter(**{field + '__gte': -count})
+
+        queryset.update(**{field: F(field) + count, 'modified_on': timezone.now()})
+
+    removed = [term_id for term_id, count in counts.items() if count < 0]
+    deleted = 0
+    if removed:
+        deleted, unused = (
+            CollectionLabelCount.objects.using(using)
+            .filter(
+                collection_id=collection_id,
+                term_id__in=removed,
+                organism_count=0,
+                capture_count=0)
+            .delete())
+
+    # The distinct count is only recounted when labels were added or
+    # dropped, never for changes in the usage of known labels.
+    if deleted or (added and len(existing) < len(added)):
+        refresh_distinct_labels(collection_id, using=using)
+
+
+def refresh_distinct_labels(collection_id, using=DEFAULT_DB_ALIAS):
+    from irekua_organisms.models import CollectionOrganismStatistics
+    from irekua_organisms.models import CollectionLabelCount
+
+    distinct = (
+        CollectionLabelCount.objects.using(using)
+        .filter(collection_id=collection_id)
+        .count())
+    CollectionOrganismStatistics.objects.using(using).update_or_create(
+        collection_id=collection_id,
+        defaults={'distinct_label_count': distinct})
+
+
+def decrement(
+        model,
+        lookup,
+        field,
+        delta,
+        first,
+        last,
+        first_field,
+        last_field,
+        remaining,
+        using=DEFAULT_DB_ALIAS):
+    """Subtract delta from a counter after objects were removed.
+
+    first and last are the created_on range of the removed objects. The
+    stored range is only recomputed when a removed object sat on one of
+    its bounds, from the remaining objects, which must be covered by an
+    index on created_on. Returns the counter after the update, or None
+    if the row does not exist.
+    """
+    queryset = model.objects.using(using).filter(**lookup)
+
+    # Statistics that were never built must not become negative.
+    queryset.filter(**{field + '__gte': delta}).update(**{
+        field: F(field) - delta,
+        'modified_on': timezone.now()})
+
+    row = queryset.values(field, first_field, last_field).first()
+    if row is None:
+        return None
+
+    updates = {}
+    if row[field] == 0:
+        updates = {first_field: None, last_field: None}
+    else:
+        if first is not None and row[first_field] is not None and first <= row[first_field]:
+            updates[first_field] = remaining.aggregate(first=Min('created_on'))['first']
+
+        if last is not None and row[last_field] is not None and last >= row[last_field]:
+            updates[last_field] = remaining.aggregate(last=Max('created_on'))['last']
+
+    if updates:
+        queryset.update(**updates)
+
+    return row[field]
+
+
+def remove_organisms(groups, using=DEFAULT_DB_ALIAS):
+    """Uncount removed organisms grouped by (collection id, organism type id).
+
+    groups has the same form as for record_organisms.
+    """
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import CollectionOrganismStatistics
+    from irekua_organisms.models import CollectionOrganismTypeCount
+
+    summaries = {}
+    for (collection_id, organism_type_id), (count, first, last) in groups.items():
+        lookup = dict(collection_id=collection_id, organism_type_id=organism_type_id)
+        remaining = decrement(
+            CollectionOrganismTypeCount,
+            lookup,
+            ORGANISM_COUNT,
+            count,
+            first,
+            last,
+            'first_created_on',
+            'last_created_on',
+            Organism.objects.using(using).filter(**lookup),
+            using=using)
+
+        if remaining == 0:
+            CollectionOrganismTypeCount.objects.using(using).filter(**lookup).delete()
+
+        total, summary_first, summary_last = summaries.get(collection_id, (0, None, None))
+        summaries[collection_id] = (
+            total + count,
+            *merge_range(summary_first, summary_last, first, last))
+
+    for collection_id, (count, first, last) in summaries.items():
+        decrement(
+            CollectionOrganismStatistics,
+            dict(collection_id=collection_id),
+            ORGANISM_COUNT,
+            count,
+            first,
+            last,
+            'first_organism_on',
+            'last_organism_on',
+            Organism.objects.using(using).filter(collection_id=collection_id),
+            using=using)
+
+
+def remove_captures(groups, using=DEFAULT_DB_ALIAS):
+    """Uncount removed captures grouped by (collection id, capture type id)."""
+    from irekua_organisms.models import OrganismCapture
+    from irekua_organisms.models import CollectionOrganismStatistics
+    from irekua_organisms.models import CollectionCaptureTypeCount
+
+    summaries = {}
+    for (collection_id, capture_type_id), (count, first, last) in groups.items():
+        lookup = dict(collection_id=collection_id, organism_capture_type_id=capture_type_id)
+        remaining = decrement(
+            CollectionCaptureTypeCount,
+            lookup,
+            CAPTURE_COUNT,
+            count,
+            first,
+            last,
+            'first_created_on',
+            'last_created_on',
+            OrganismCapture.objects.using(using).filter(**lookup),
+            using=using)
+
+        if remaining == 0:
+            CollectionCaptureTypeCount.objects.using(using).filter(**lookup).delete()
+
+        total, summary_first, summary_last = summaries.get(collection_id, (0, None, None))
+        summaries[collection_id] = (
+            total + count,
+            *merge_range(summary_first, summary_last, first, last))
+
+    for collection_id, (count, first, last) in summaries.items():
+        decrement(
+            CollectionOrganismStatistics,
+            dict(collection_id=collection_id),
+            CAPTURE_COUNT,
+            count,
+            first,
+            last,
+            'first_capture_on',
+            'last_capture_on',
+            OrganismCapture.objects.using(using).filter(collection_id=collection_id),
+            using=using)
+
+
+def record_collection_changes(collections, using=DEFAULT_DB_ALIAS):
+    """Increase the change version of collections whose objects changed.
+
+    Caches of collection data use the version to find out cheaply
+    whether they are stale, instead of searching the change feed.
+    """
+    from irekua_organisms.models import CollectionOrganismStatistics
+
+    collection_ids = sorted({
+        get_id(collection)
+        for collection in collections
+        if collection is not None})
+
+    increment(
+        CollectionOrganismStatistics,
+        [(dict(collection_id=collection_id), (None, None)) for collection_id in collection_ids],
+        CHANGE_VERSION,
+        1,
+        using=using)
+
+
+def refresh_summary(collection_id, using=DEFAULT_DB_ALIAS):
+    from irekua_organisms.models import CollectionOrganismStatistics
+    from irekua_organisms.models import CollectionOrganismTypeCount
+    from irekua_organisms.models import CollectionCaptureTypeCount
+    from irekua_organisms.models import CollectionLabelCount
+
+    organisms = (
+        CollectionOrganismTypeCount.objects.using(using)
+        .filter(collection_id=collection_id)
+        .aggregate(
+            count=Sum('organism_count'),
+            first=Min('first_created_on'),
+            last=Max('last_created_on')))
+    captures = (
+        CollectionCaptureTypeCount.objects.using(using)
+        .filter(collection_id=collection_id)
+        .aggregate(
+            count=Sum('capture_count'),
+            first=Min('first_created_on'),
+            last=Max('last_created_on')))
+
+    CollectionOrganismStatistics.objects.using(using).update_or_create(
+        collection_id=collection_id,
+        defaults=dict(
+            organism_count=organisms['count'] or 0,
+            first_organism_on=organisms['first'],
+            last_organism_on=organisms['last'],
+            capture_count=captures['count'] or 0,
+            first_capture_on=captures['first'],
+            last_capture_on=captures['last'],
+            distinct_label_count=(
+                CollectionLabelCount.objects.using(using)
+                .filter(collection_id=collection_id)
+                .count())))
+
+
+def record_bulk_organisms(organisms, label_pairs, using=DEFAULT_DB_ALIAS):
+    """Update statistics after a bulk insert of organisms.
+
+    label_pairs are the (organism id, term id) pairs that were inserted.
+    """
+    record_organisms(group_created_on(
+        organisms,
+        lambda organism: (organism.collection_id, organism.organism_type_id)),
+        using=using)
+
+    collections = {organism.pk: organism.collection_id for organism in organisms}
+    record_bulk_labels(collections, label_pairs, ORGANISM_COUNT, using=using)
+
+
+def record_bulk_captures(captures, label_pairs, using=DEFAULT_DB_ALIAS):
+    """Update statistics after a bulk insert of organism captures."""
+    record_captures(group_created_on(
+        captures,
+        lambda capture: (capture.collection_id, capture.organism_capture_type_id)),
+        using=using)
+
+    collections = {capture.pk: capture.collection_id for capture in captures}
+    record_bulk_labels(collections, label_pairs, CAPTURE_COUNT, using=using)
+
+
+def record_bulk_labels(collections, label_pairs, field, delta=1, using=DEFAULT_DB_ALIAS):
+    terms = {}
+    for pk, term_id in label_pairs:
+        terms.setdefault(collections[pk], []).append(term_id)
+
+    for collection_id, term_ids in terms.items():
+        record_labels(collection_id, term_ids, field, delta=delta, using=using)
+
+
+def rebuild_statistics(collections=None, using=DEFAULT_DB_ALIAS):
+    """Recompute all statistics from the organism and capture tables.
+
+    Summary rows are refreshed instead of recreated, so the change
+    versions of the collections are kept.
+    """
+    from irekua_organisms.models import Organism
+    from irekua_organisms.models import OrganismCapture
+    from irekua_organisms.models import CollectionOrganismStatistics
+    from irekua_organisms.models import CollectionOrganismTypeCount
+    from irekua_organisms.models import CollectionCaptureTypeCount
+    from irekua_organisms.models import CollectionLabelCount
+
+    scope = Q()
+    if collections is not None:
+        scope = Q(collection__in=[get_id(collection) for collection in collections])
+
+    organisms = Organism.objects.using(using).filter(scope).order_by()
+    captures = OrganismCapture.objects.using(using).filter(scope).order_by()
+    organism_labels = Organism.labels.through.objects.using(using).filter(
+        organism__in=organisms.values('id'))
+    capture_labels = OrganismCapture.labels.through.objects.using(using).filter(
+        organismcapture__in=captures.values('id'))
+
+    with transaction.atomic(using=using):
+        for model in (
+                CollectionOrganismTypeCount,
+                CollectionCaptureTypeCount,
+                CollectionLabelCount):
+            model.objects.using(using).filter(scope).delete()
+
+        CollectionOrganismTypeCount.objects.using(using).bulk_create([
+            CollectionOrganismTypeCount(
+                collection_id=row['collection'],
+                organism_type_id=row['organism_type'],
+                organism_count=row['count'],
+                first_created_on=row['first'],
+                last_created_on=row['last'])
+            for row in organisms
+            .values('collection', 'organism_type')
+            .annotate(count=Count('id'), first=Min('created_on'), last=Max('created_on'))])
+
+        CollectionCaptureTypeCount.objects.using(using).bulk_create([
+            CollectionCaptureTypeCount(
+                collection_id=row['collection'],
+                organism_capture_type_id=row['organism_capture_type'],
+                device_type_id=row['organism_capture_type__device_type'],
+                capture_count=row['count'],
+                first_created_on=row['first'],
+                last_created_on=row['last'])
+            for row in captures
+            .values('collection', 'organism_capture_type', 'organism_capture_type__device_type')
+            .annotate(count=Count('id'), first=Min('created_on'), last=Max('created_on'))])
+
+        label_counts = {}
+        for queryset, path, field in (
+                (organism_labels, 'organism__collection', ORGANISM_COUNT),
+                (capture_labels, 'organismcapture__collection', CAPTURE_COUNT)):
+            rows = (
+                queryset
+                .values_list(path, 'term')
+                .annotate(count=Count('id'))
+                .order_by())
+            for collection_id, term_id, count in rows:
+                label = label_counts.setdefault((collection_id, term_id), {})
+                label[field] = count
+
+        CollectionLabelCount.objects.using(using).bulk_create([
+            CollectionLabelCount(collection_id=collection_id, term_id=term_id, **counts)
+            for (collection_id, term_id), counts in label_counts.items()])
+
+        collection_ids = set(
+            CollectionOrganismTypeCount.objects.using(using)
+            .filter(scope)
+            .values_list('collection', flat=True))
+        collection_ids.update(
+            CollectionCaptureTypeCount.objects.using(using)
+            .filter(scope)
+            .values_list('collection', flat=True))
+        collection_ids.update(
+            CollectionOrganismStatistics.objects.using(using)
+            .filter(scope)
+            .values_list('collection', flat=True))
+
+        for collection_id in collection_ids:
+            refresh_summary(collection_id, using=using)
+
+
+def get_collection_statistics(collection, using=DEFAULT_DB_ALIAS):
+    """Return the statistics of a collection with a single primary key lookup."""
+    from irekua_organisms.models import CollectionOrganismStatistics
+
+    collection_id = get_id(collection)
+
+    try:
+        return CollectionOrganismStatistics.objects.using(using).get(collection_id=collection_id)
+    except CollectionOrganismStatistics.DoesNotExist:
+        return CollectionOrganismStatistics(collection_id=collection_id)
+
+
+def get_organism_type_counts(collection, using=DEFAULT_DB_ALIAS):
+    from irekua_organisms.models import CollectionOrganismTypeCount
+
+    return dict(
+        CollectionOrganismTypeCount.objects.using(using)
+        .filter(collection_id=get_id(collection))
+        .values_list('organism_type_id', 'organism_count'))
+
+
+def get_capture_type_counts(collection, using=DEFAULT_DB_ALIAS):
+    from irekua_organisms.models import CollectionCaptureTypeCount
+
+    return dict(
+        CollectionCaptureTypeCount.objects.using(using)
+        .filter(collection_id=get_id(collection))
+        .values_list('organism_capture_type_id', 'capture_count'))
+
+
+def get_device_type_counts(collection, using=DEFAULT_DB_ALIAS):
+    from irekua_organisms.models import CollectionCaptureTypeCount
+
+    return dict(
+        CollectionCaptureTypeCount.objects.using(using)
+        .filter(collection_id=get_id(collection))
+        .values_list('device_type_id')
+        .annotate(count=Sum('capture_count'))
+        .order_by())
@@ -0,0 +1,106 @@
+from django.test import TestCase
+
+from irekua_database.models import Collection
+from irekua_database.models import CollectionType
+from irekua_database.models import DeviceType
+from irekua_database.models import SamplingEvent
+from irekua_database.models import SamplingEventDevice
+from irekua_database.models import SamplingEventType
+from irekua_database.models import Term
+from irekua_database.models import TermType
+
+from irekua_organisms.benchmarks.fixtures import BenchmarkData
+from irekua_organisms.snapshots import clear_config_snapshots
+
+
+def create_collection(name, collection_type=None):
+    """Create a collection with one sampling event device."""
+    if collection_type is None:
+        collection_type = CollectionType.objects.create(
+            name='{} collection type'.format(name),
+            description='Collection type used in tests')
+
+    collection = Collection.objects.create(
+        collection_type=collection_type,
+        name='{} collection'.format(name),
+        description='Collection used in tests')
+    sampling_event = SamplingEvent.objects.create(
+        sampling_event_type=SamplingEventType.objects.create(
+            name='{} sampling event type'.format(name)),
+        collection=collection)
+    SamplingEventDevice.objects.create(sampling_event=sampling_event)
+
+    return collection
+
+
+def create_term(name, term_type=None):
+    if term_type is None:
+        term_type = TermType.objects.create(
+            name='{} term type'.format(name),
+            description='Term type used in tests',
+            is_categorical=True)
+
+    return Term.objects.create(term_type=term_type, value='{} term'.format(name))
+
+
+class OrganismTestCase(TestCase):
+    """Organism types, configurations and one organism with a capture.
+
+    The data is built with the benchmark fixtures on top of a collection
+    with a sampling event device, a device type and a term. Rows created
+    by the fixtures are bulk inserted, so they are not counted in the
+    statistics nor recorded in the change feed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        name = cls.__name__.lower()
+
+        DeviceType.objects.create(
+            name='{} device type'.format(name),
+            description='Device type used in tests')
+        create_term(name)
+
+        cls.collection_id = create_collection(name).pk
+
+    def setUp(self):
+        # Snapshots cached by previous tests may describe rolled back rows.
+        clear_config_snapshots()
+
+        self.data = BenchmarkData(collection=self.collection_id)
+        self.data.setup()
+
+    def organism_record(self, **fields):
+        record = {
+            'collection': self.data.collection.pk,
+            'organism_type': self.data.organism_type.pk,
+            'identification_info': {'scientific_name': 'Puma concolor'},
+            'additional_metadata': {'count': 1},
+        }
+        record.update(fields)
+        return record
+
+    def capture_record(self, organism, **fields):
+        record = {
+            'organism': organism,
+            'organism_capture_type': self.data.capture_type.pk,
+            'sampling_event_device': self.data.sampling_event_device.pk,
+            'additional_metadata': {'count': 1},
+        }
+        record.update(fields)
+        return record
+
+    def create_organism(self, **fields):
+        from irekua_organisms.models import Organism
+
+        fields.setdefault('collection', self.data.collection)
+        fields.setdefault('organism_type', self.data.organism_type)
+        fields.setdefault('identification_info', {'scientific_name': 'Puma concolor'})
+        return Organism.objects.create(**fields)
+
+    def create_capture(self, organism, **fields):
+        from irekua_organisms.models import OrganismCapture
+
+        fields.setdefault('organism_capture_type', self.data.capture_type)
+        fields.setdefault('sampling_event_device', self.data.sampling_event_device)
+        return OrganismCapture.objects.create(organism=organism, **fields)
@@ -0,0 +1,156 @@
+from irekua_organisms.bulk import bulk_ingest_organisms
+from irekua_organisms.bulk import bulk_ingest_organism_captures
+from irekua_organisms.bulk import validate_organism_records
+from irekua_organisms.models import Organism
+from irekua_organisms.models import OrganismCapture
+from irekua_organisms.models import OrganismChange
+from irekua_organisms.models import CollectionLabelCount
+from irekua_organisms import statistics
+from irekua_organisms.tests.base import OrganismTestCase
+
+
+class BulkIngestOrganismTests(OrganismTestCase):
+    def test_ingest_stores_valid_records(self):
+        result = bulk_ingest_organisms(
+            [
+                self.organism_record(name='bulk organism 1', labels=[self.data.term]),
+                self.organism_record(name='bulk organism 2'),
+            ],
+            batch_size=1)
+
+        self.assertFalse(result.has_errors)
+        self.assertEqual(len(result.created), 2)
+        self.assertEqual(
+            set(Organism.objects.filter(name__startswith='bulk organism')
+                .values_list('id', flat=True)),
+            {organism.pk for organism in result.created})
+        self.assertEqual(
+            list(result.created[0].labels.values_list('id', flat=True)),
+            [self.data.term.pk])
+
+    def test_ingest_reports_invalid_records(self):
+        result = bulk_ingest_organisms([
+            self.organism_record(identification_info={}),
+            self.organism_record(name='bulk valid organism'),
+            self.organism_record(organism_type=0),
+        ])
+
+        self.assertEqual(set(result.errors), {0, 2})
+        self.assertIn('identification_info', result.errors[0])
+        self.assertIn('organism_type', result.errors[2])
+        self.assertEqual([organism.name for organism in result.created], ['bulk valid organism'])
+
+    def test_ingest_rejects_repeated_names(self):
+        self.create_organism(name='bulk taken name')
+
+        result = bulk_ingest_organisms([
+            self.organism_record(name='bulk taken name'),
+            self.organism_record(name='bulk new name'),
+            self.organism_record(name='bulk new name'),
+        ])
+
+        self.assertEqual(set(result.errors), {0, 2})
+        self.assertEqual(len(result.created), 1)
+
+    def test_validate_does_not_store(self):
+        count = Organism.objects.count()
+
+        result = validate_organism_records([
+            self.organism_record(),
+            self.organism_record(identification_info={}),
+        ])
+
+        self.assertEqual(set(result.errors), {1})
+        self.assertEqual(Organism.objects.count(), count)
+
+    def test_ingest_updates_statistics(self):
+        before = statistics.get_collection_statistics(self.data.collection)
+
+        bulk_ingest_organisms([
+            self.organism_record(labels=[self.data.term]),
+            self.organism_record(labels=[self.data.term]),
+        ])
+
+        after = statistics.get_collection_statistics(self.data.collection)
+        self.assertEqual(after.organism_count, before.organism_count + 2)
+        self.assertEqual(after.distinct_label_count, 1)
+        self.assertGreater(after.change_version, before.change_version)
+        self.assertEqual(
+            statistics.get_organism_type_counts(self.data.collection)[self.data.organism_type.pk],
+            2)
+        self.assertEqual(
+            CollectionLabelCount.objects
+            .get(collection=self.data.collection, term=self.data.term)
+            .organism_count,
+            2)
+
+    def test_ingest_records_changes(self):
+        result = bulk_ingest_organisms([self.organism_record(), self.organism_record()])
+
+        self.assertEqual(
+            set(
+                OrganismChange.objects
+                .filter(model_name=OrganismChange.ORGANISM, action=OrganismChange.CREATE)
+                .values_list('object_id', flat=True)),
+            {organism.pk for organism in result.created})
+
+    def test_ingest_updates_search(self):
+        result = bulk_ingest_organisms([
+            self.organism_record(name='bulk searchable', labels=[self.data.term]),
+        ])
+
+        organism = Organism.objects.get(pk=result.created[0].pk)
+        self.assertIn('bulk searchable', organism.search_text)
+        self.assertIn(self.data.term.value, organism.search_text)
+
+
+class BulkIngestOrganismCaptureTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+        self.organism = self.create_organism()
+
+    def test_ingest_sets_collection(self):
+        result = bulk_ingest_organism_captures([self.capture_record(self.organism.pk)])
+
+        self.assertFalse(result.has_errors)
+        capture = OrganismCapture.objects.get(pk=result.created[0].pk)
+        self.assertEqual(capture.collection_id, self.data.collection.pk)
+        self.assertEqual(capture.collection_type_id, self.data.collection.collection_type_id)
+        self.assertTrue(capture.schema_version)
+
+    def test_ingest_reports_invalid_records(self):
+        result = bulk_ingest_organism_captures([
+            self.capture_record(self.organism.pk, sampling_event_device=0),
+            self.capture_record(0),
+            self.capture_record(self.organism.pk, additional_metadata={'count': -1}),
+            self.capture_record(self.organism.pk),
+        ])
+
+        self.assertEqual(set(result.errors), {0, 1, 2})
+        self.assertIn('sampling_event_device', result.errors[0])
+        self.assertIn('organism', result.errors[1])
+        self.assertIn('additional_metadata', result.errors[2])
+        self.assertEqual(len(result.created), 1)
+
+    def test_ingest_updates_statistics_and_changes(self):
+        before = statistics.get_collection_statistics(self.data.collection)
+
+        result = bulk_ingest_organism_captures([
+            self.capture_record(self.organism.pk, labels=[self.data.term]),
+            self.capture_record(self.organism.pk),
+        ])
+
+        after = statistics.get_collection_statistics(self.data.collection)
+        self.assertEqual(after.capture_count, before.capture_count + 2)
+        self.assertGreater(after.change_version, before.change_version)
+        self.assertEqual(
+            statistics.get_capture_type_counts(self.data.collection)[self.data.capture_type.pk],
+            2)
+        self.assertEqual(
+            set(
+                OrganismChange.objects
+                .filter(
+                    model_name=OrganismChange.ORGANISM_CAPTURE,
+                    action=OrganismChange.CREATE)
+                .values_list('object_id', flat=True)),
+            {capture.pk for capture in result.created})
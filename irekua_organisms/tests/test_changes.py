@@ -0,0 +1,96 @@
+from irekua_organisms.models import OrganismChange
+from irekua_organisms.tests.base import OrganismTestCase
+from irekua_organisms import changes
+
+
+class ChangeFeedTests(OrganismTestCase):
+    def get_last_seq(self):
+        feed = changes.changes_since(0, limit=100000)
+        return feed[-1].seq if feed else 0
+
+    def test_saves_and_deletes_are_recorded(self):
+        last = self.get_last_seq()
+
+        organism = self.create_organism()
+        organism.remarks = 'Updated remarks'
+        organism.save()
+        organism_id = organism.pk
+        organism.delete()
+
+        feed = changes.changes_since(last)
+        self.assertEqual(
+            [(change.object_id, change.action) for change in feed],
+            [
+                (organism_id, OrganismChange.CREATE),
+                (organism_id, OrganismChange.UPDATE),
+                (organism_id, OrganismChange.DELETE),
+            ])
+        self.assertEqual(feed[-1].payload, {'collection_id': self.data.collection.pk})
+
+    def test_relation_changes_are_recorded(self):
+        organism = self.create_organism()
+        last = self.get_last_seq()
+
+        organism.labels.add(self.data.term)
+        organism.labels.clear()
+
+        feed = changes.changes_since(last)
+        self.assertEqual(
+            [(change.action, change.payload) for change in feed],
+            [
+                (OrganismChange.ADD, {'field': 'labels', 'ids': [self.data.term.pk]}),
+                (OrganismChange.CLEAR, {'field': 'labels'}),
+            ])
+
+    def test_sequence_numbers_are_consecutive(self):
+        last = self.get_last_seq()
+        for unused in range(3):
+            self.create_organism()
+
+        feed = changes.changes_since(last)
+
+        self.assertEqual(
+            [change.seq for change in feed],
+            list(range(last + 1, last + 4)))
+
+    def test_late_changes_come_after_returned_changes(self):
+        self.create_organism()
+        returned = changes.changes_since(0, limit=100000)
+        last = returned[-1]
+
+        # A change inserted before the last returned one, by id, but
+        # committed after it was read.
+        late = OrganismChange.objects.create(
+            id=min(change.id for change in returned) - 1,
+            model_name=OrganismChange.ORGANISM,
+            object_id=0,
+            action=OrganismChange.UPDATE)
+
+        feed = changes.changes_since(last.seq)
+
+        self.assertEqual([change.pk for change in feed], [late.pk])
+        self.assertGreater(feed[0].seq, last.seq)
+
+    def test_limit_and_model_names(self):
+        last = self.get_last_seq()
+        organism = self.create_organism()
+        self.create_capture(organism)
+        self.create_organism()
+
+        self.assertEqual(len(changes.changes_since(last, limit=2)), 2)
+        self.assertEqual(
+            [
+                change.model_name
+                for change in changes.changes_since(
+                    last,
+                    model_names=[OrganismChange.ORGANISM_CAPTURE])],
+            [OrganismChange.ORGANISM_CAPTURE])
+
+    def test_iter_changes_pages_through_the_feed(self):
+        last = self.get_last_seq()
+        for unused in range(5):
+            self.create_organism()
+
+        seqs = [change.seq for change in changes.iter_changes(last, chunk_size=2)]
+
+        self.assertEqual(seqs, list(range(last + 1, last + 6)))
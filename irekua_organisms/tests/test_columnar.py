@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from irekua_organisms.export import ORGANISMS
+from irekua_organisms.export import ORGANISM_CAPTURES
+from irekua_organisms.export.columnar import SnapshotReader
+from irekua_organisms.export.columnar import read_manifest
+from irekua_organisms.export.columnar import write_snapshot
+from irekua_organisms.models import Organism
+from irekua_organisms.models import OrganismCapture
+from irekua_organisms.tests.base import OrganismTestCase
+
+
+class ColumnarSnapshotTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+        self.data.grow(5)
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        super().tearDown()
+
+    def organisms(self):
+        return Organism.objects.filter(organism_type=self.data.organism_type).order_by('id')
+
+    def get_partition(self, table=ORGANISMS):
+        partitions = SnapshotReader(self.root).partitions(
+            table,
+            collections=[self.data.collection.pk],
+            organism_types=[self.data.organism_type.pk])
+        self.assertEqual(len(partitions), 1)
+        return partitions[0]
+
+    def test_columns(self):
+        write_snapshot(self.root, chunk_size=2)
+
+        partition = self.get_partition()
+        organisms = list(self.organisms())
+        self.assertEqual(partition.rows, len(organisms))
+        self.assertEqual(
+            list(partition.column('id')),
+            [organism.pk for organism in organisms])
+        self.assertEqual(
+            partition.json('identification_info'),
+            [organism.identification_info for organism in organisms])
+        self.assertEqual(
+            partition.texts('remarks', 2),
+            organisms[2].remarks)
+        self.assertEqual(
+            partition.column('created_on')[0],
+            np.datetime64(organisms[0].created_on.replace(tzinfo=None), 'us'))
+
+        for index, organism in enumerate(organisms):
+            self.assertEqual(
+                list(partition.related('labels', index)),
+                list(organism.labels.order_by('id').values_list('id', flat=True)))
+
+    def test_capture_table(self):
+        write_snapshot(self.root, tables=[ORGANISM_CAPTURES])
+
+        partition = self.get_partition(ORGANISM_CAPTURES)
+        self.assertEqual(
+            sorted(partition.column('organism_id')),
+            [organism.pk for organism in self.organisms()])
+        self.assertNotIn(ORGANISMS, read_manifest(self.root)['tables'])
+
+    def test_unchanged_partitions_are_kept(self):
+        write_snapshot(self.root)
+        path = self.get_partition().path
+
+        stats = write_snapshot(self.root)
+
+        self.assertEqual(stats[ORGANISMS].written, 0)
+        self.assertEqual(stats[ORGANISMS].unchanged, 1)
+        self.assertEqual(self.get_partition().path, path)
+
+    def test_changed_partitions_get_a_new_version(self):
+        write_snapshot(self.root)
+        previous = self.get_partition().path
+
+        self.data.grow(6)
+        stats = write_snapshot(self.root)
+
+        partition = self.get_partition()
+        self.assertEqual(stats[ORGANISMS].written, 1)
+        self.assertNotEqual(partition.path, previous)
+        self.assertEqual(partition.rows, 6)
+        self.assertEqual(len(partition.column('id')), 6)
+
+        # Readers of the previous manifest can still open its partitions
+        # until the next snapshot.
+        self.assertTrue(os.path.isdir(previous))
+        write_snapshot(self.root)
+        self.assertFalse(os.path.isdir(previous))
+        self.assertTrue(os.path.isdir(partition.path))
+
+    def test_relinked_partitions_are_rewritten(self):
+        write_snapshot(self.root)
+        organism = self.organisms().first()
+
+        organism.labels.clear()
+        stats = write_snapshot(self.root)
+
+        self.assertEqual(stats[ORGANISMS].written, 1)
+        self.assertEqual(len(self.get_partition().related('labels', 0)), 0)
+
+    def test_removed_partitions(self):
+        write_snapshot(self.root)
+        path = self.get_partition().path
+
+        OrganismCapture.objects.filter(organism__in=self.organisms()).delete()
+        self.organisms().delete()
+        stats = write_snapshot(self.root)
+
+        self.assertEqual(stats[ORGANISMS].removed, 1)
+        self.assertEqual(
+            SnapshotReader(self.root).partitions(
+                ORGANISMS,
+                organism_types=[self.data.organism_type.pk]),
+            [])
+
+        write_snapshot(self.root)
+        self.assertFalse(os.path.isdir(path))
@@ -0,0 +1,104 @@
+from irekua_database.models import SamplingEvent
+
+from irekua_organisms.models import CollectionLabelCount
+from irekua_organisms.models import OrganismCapture
+from irekua_organisms.models import OrganismChange
+from irekua_organisms.tests.base import OrganismTestCase
+from irekua_organisms.tests.base import create_collection
+from irekua_organisms.utils.denormalization import get_inconsistent_captures
+from irekua_organisms.utils.denormalization import sync_capture_collections
+from irekua_organisms import changes
+from irekua_organisms import statistics
+
+
+class CaptureCollectionSyncTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.other = create_collection(
+            'denormalization other',
+            collection_type=self.data.collection.collection_type)
+        self.organism = self.create_organism()
+        for unused in range(3):
+            self.create_capture(self.organism).labels.add(self.data.term)
+
+        # Count the capture created by the fixtures too.
+        statistics.rebuild_statistics([self.data.collection])
+
+        # Every capture of the sampling event, labeled by the fixtures or above.
+        self.captures = list(OrganismCapture.objects.filter(
+            sampling_event_device=self.data.sampling_event_device))
+
+        self.last_seq = changes.changes_since(0, limit=100000)[-1].seq
+
+    def move_sampling_event(self):
+        sampling_event = SamplingEvent.objects.get(
+            pk=self.data.sampling_event_device.sampling_event_id)
+        sampling_event.collection = self.other
+        sampling_event.save()
+
+    def get_capture_label_count(self, collection):
+        return (
+            CollectionLabelCount.objects
+            .filter(collection=collection, term=self.data.term)
+            .values_list('capture_count', flat=True)
+            .first()) or 0
+
+    def test_moving_a_sampling_event_moves_its_captures(self):
+        self.move_sampling_event()
+
+        ids = [capture.pk for capture in self.captures]
+        self.assertEqual(
+            set(
+                OrganismCapture.objects
+                .filter(id__in=ids)
+                .values_list('collection', flat=True)),
+            {self.other.pk})
+        self.assertFalse(get_inconsistent_captures(OrganismCapture.objects.all()).exists())
+
+    def test_moving_captures_updates_statistics(self):
+        before = statistics.get_collection_statistics(self.data.collection)
+
+        self.move_sampling_event()
+
+        after = statistics.get_collection_statistics(self.data.collection)
+        moved = statistics.get_collection_statistics(self.other)
+        count = len(self.captures)
+        self.assertEqual(after.capture_count, before.capture_count - count)
+        self.assertEqual(moved.capture_count, count)
+        self.assertGreater(after.change_version, before.change_version)
+        self.assertEqual(
+            statistics.get_capture_type_counts(self.other),
+            {self.data.capture_type.pk: count})
+        self.assertEqual(self.get_capture_label_count(self.data.collection), 0)
+        self.assertEqual(self.get_capture_label_count(self.other), count)
+
+    def test_moving_captures_records_changes(self):
+        self.move_sampling_event()
+
+        feed = changes.changes_since(self.last_seq)
+        self.assertEqual(
+            sorted(change.object_id for change in feed),
+            sorted(capture.pk for capture in self.captures))
+        for change in feed:
+            self.assertEqual(change.action, OrganismChange.UPDATE)
+            self.assertEqual(change.payload, {'fields': ['collection', 'collection_type']})
+
+    def test_sync_in_batches(self):
+        moved = sync_capture_collections(
+            OrganismCapture.objects.filter(organism=self.organism),
+            self.other.pk,
+            self.other.collection_type_id,
+            batch_size=2)
+
+        self.assertEqual(moved, 3)
+        self.assertEqual(statistics.get_collection_statistics(self.other).capture_count, 3)
+
+    def test_sync_skips_captures_in_place(self):
+        moved = sync_capture_collections(
+            OrganismCapture.objects.filter(organism=self.organism),
+            self.data.collection.pk,
+            self.data.collection.collection_type_id)
+
+        self.assertEqual(moved, 0)
+        self.assertEqual(changes.changes_since(self.last_seq), [])
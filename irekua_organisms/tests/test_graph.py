@@ -0,0 +1,99 @@
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from irekua_organisms.graph import build_adjacency
+from irekua_organisms.graph import get_capture_adjacency
+from irekua_organisms.graph import get_graph_labels
+from irekua_organisms.graph import get_neighbors
+from irekua_organisms.graph import invert_adjacency
+from irekua_organisms.graph import load_organism_graph
+from irekua_organisms.models import Organism
+from irekua_organisms.models import OrganismCapture
+from irekua_organisms.tests.base import OrganismTestCase
+
+
+class AdjacencyTests(SimpleTestCase):
+    def setUp(self):
+        ids = np.array([1, 2, 5], dtype=np.int64)
+        links = np.array([[1, 10], [1, 11], [5, 10], [7, 12]], dtype=np.int64)
+        self.adjacency = build_adjacency(ids, links)
+
+    def test_neighbors(self):
+        self.assertEqual(list(get_neighbors(self.adjacency, 1)), [10, 11])
+        self.assertEqual(list(get_neighbors(self.adjacency, 2)), [])
+        self.assertEqual(list(get_neighbors(self.adjacency, 5)), [10])
+
+    def test_unknown_sources_are_ignored(self):
+        self.assertEqual(list(get_neighbors(self.adjacency, 7)), [])
+        self.assertEqual(list(get_neighbors(self.adjacency, 3)), [])
+
+    def test_invert(self):
+        inverted = invert_adjacency(self.adjacency)
+
+        self.assertEqual(list(inverted.ids), [10, 11])
+        self.assertEqual(list(get_neighbors(inverted, 10)), [1, 5])
+        self.assertEqual(list(get_neighbors(inverted, 11)), [1])
+
+
+class OrganismGraphTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+        self.data.grow(5)
+        self.organisms = Organism.objects.filter(organism_type=self.data.organism_type)
+        self.ids = list(self.organisms.order_by('id').values_list('id', flat=True))
+
+    def assertGraphsEqual(self, graph, other):
+        for field, array in graph._asdict().items():
+            if isinstance(array, np.ndarray):
+                np.testing.assert_array_equal(array, getattr(other, field), err_msg=field)
+                continue
+
+            for name, values in array._asdict().items():
+                np.testing.assert_array_equal(
+                    values,
+                    getattr(getattr(other, field), name),
+                    err_msg='{}.{}'.format(field, name))
+
+    def test_graph_of_queryset(self):
+        with self.assertNumQueries(6):
+            graph = load_organism_graph(self.organisms)
+
+        captures = list(
+            OrganismCapture.objects
+            .filter(organism__in=self.ids)
+            .order_by('id')
+            .values_list('id', 'organism_id'))
+
+        self.assertEqual(list(graph.organism_ids), self.ids)
+        self.assertEqual(list(graph.capture_ids), [pk for pk, unused in captures])
+        self.assertEqual(
+            list(graph.capture_organisms),
+            [organism_id for unused, organism_id in captures])
+        self.assertEqual(list(get_graph_labels(graph)), [self.data.term.pk])
+
+        adjacency = get_capture_adjacency(graph)
+        for capture_id, organism_id in captures:
+            self.assertIn(capture_id, get_neighbors(adjacency, organism_id))
+
+    def test_ids_and_querysets_load_the_same_graph(self):
+        self.assertGraphsEqual(
+            load_organism_graph(self.ids),
+            load_organism_graph(self.organisms))
+
+    def test_id_batches_load_the_same_graph(self):
+        expected = load_organism_graph(self.ids)
+
+        with mock.patch('irekua_organisms.graph.get_id_batch_size', return_value=2):
+            with self.assertNumQueries(18):
+                graph = load_organism_graph(list(reversed(self.ids)))
+
+        self.assertGraphsEqual(graph, expected)
+
+    def test_empty_graph(self):
+        graph = load_organism_graph([])
+
+        self.assertEqual(len(graph.organism_ids), 0)
+        self.assertEqual(len(graph.capture_ids), 0)
+        self.assertEqual(len(graph.organism_labels.values), 0)
@@ -0,0 +1,100 @@
+from irekua_organisms.bulk import bulk_ingest_organism_members
+from irekua_organisms.models import Organism
+from irekua_organisms.models import OrganismMember
+from irekua_organisms.models import OrganismType
+from irekua_organisms.tests.base import OrganismTestCase
+from irekua_organisms.tests.base import create_collection
+
+
+class OrganismMemberTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.group_type = OrganismType.objects.create(
+            name='members group type',
+            description='Multi organism type used in member tests',
+            identification_info_schema={},
+            is_multi_organism=True)
+        self.member_type = OrganismType.objects.create(
+            name='members member type',
+            description='Member organism type used in member tests',
+            identification_info_schema=self.data.organism_type.identification_info_schema)
+
+        self.group = self.create_organism(organism_type=self.group_type)
+        self.single = self.create_organism()
+
+    def member_record(self, **fields):
+        record = {
+            'group': self.group.pk,
+            'organism_type': self.member_type.pk,
+            'count': 3,
+            'identification_info': {'scientific_name': 'Puma concolor'},
+        }
+        record.update(fields)
+        return record
+
+    def organisms(self):
+        return Organism.objects.filter(pk__in=[self.group.pk, self.single.pk])
+
+    def test_ingest_members(self):
+        result = bulk_ingest_organism_members([
+            self.member_record(),
+            self.member_record(count=2, identification_info={}),
+        ])
+
+        self.assertFalse(result.has_errors)
+        self.assertEqual(self.group.members.total_individuals(), 5)
+
+    def test_ingest_reports_invalid_members(self):
+        result = bulk_ingest_organism_members([
+            self.member_record(group=self.single.pk),
+            self.member_record(count=0),
+            self.member_record(identification_info={'confidence': 2}),
+            self.member_record(organism_type=0),
+            self.member_record(),
+        ])
+
+        self.assertEqual(set(result.errors), {0, 1, 2, 3})
+        self.assertIn('group', result.errors[0])
+        self.assertIn('count', result.errors[1])
+        self.assertIn('identification_info', result.errors[2])
+        self.assertIn('organism_type', result.errors[3])
+        self.assertEqual(OrganismMember.objects.filter(group=self.group).count(), 1)
+
+    def test_individuals(self):
+        OrganismMember.objects.create(group=self.group, organism_type=self.member_type, count=3)
+        OrganismMember.objects.create(group=self.group, organism_type=self.group_type, count=2)
+
+        self.assertEqual(
+            dict(self.organisms().with_individuals().values_list('id', 'individuals')),
+            {self.group.pk: 5, self.single.pk: 1})
+        self.assertEqual(self.organisms().total_individuals(), 6)
+        self.assertEqual(
+            self.organisms().individuals_by_organism_type(),
+            {
+                self.member_type.pk: 3,
+                self.group_type.pk: 2,
+                self.data.organism_type.pk: 1,
+            })
+
+    def test_individuals_by_collection(self):
+        other = create_collection(
+            'members other',
+            collection_type=self.data.collection.collection_type)
+        group = self.create_organism(collection=other, organism_type=self.group_type)
+        OrganismMember.objects.create(group=group, organism_type=self.member_type, count=4)
+
+        self.assertEqual(
+            Organism.objects
+            .filter(pk__in=[self.group.pk, self.single.pk, group.pk])
+            .individuals_by_collection(),
+            {self.data.collection.pk: 2, other.pk: 4})
+
+    def test_aggregations_use_one_query(self):
+        OrganismMember.objects.create(group=self.group, organism_type=self.member_type, count=3)
+
+        with self.assertNumQueries(1):
+            self.organisms().total_individuals()
+
+        with self.assertNumQueries(1):
+            self.organisms().individuals_by_organism_type()
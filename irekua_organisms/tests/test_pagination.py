@@ -0,0 +1,81 @@
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from irekua_organisms.models import Organism
+from irekua_organisms.pagination import decode_cursor
+from irekua_organisms.pagination import encode_cursor
+from irekua_organisms.pagination import get_page
+from irekua_organisms.tests.base import OrganismTestCase
+
+
+class KeysetPaginationTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+        self.data.grow(7)
+
+        # Half of the organisms share a creation date, so pages must
+        # break ties on the id.
+        organisms = self.organisms()
+        tied = list(organisms.order_by('id').values_list('id', flat=True)[:4])
+        organisms.filter(id__in=tied).update(created_on=timezone.now())
+
+        self.expected = list(
+            organisms
+            .order_by('-created_on', '-id')
+            .values_list('id', flat=True))
+
+    def organisms(self):
+        return Organism.objects.filter(organism_type=self.data.organism_type)
+
+    def get_ids(self, page):
+        return [organism.pk for organism in page.items]
+
+    def test_pages_cover_every_row_once(self):
+        ids = []
+        page = get_page(self.organisms(), limit=3)
+        ids.extend(self.get_ids(page))
+        self.assertIsNone(page.previous_cursor)
+
+        while page.next_cursor is not None:
+            page = get_page(self.organisms(), limit=3, after=page.next_cursor)
+            ids.extend(self.get_ids(page))
+
+        self.assertEqual(ids, self.expected)
+
+    def test_previous_page(self):
+        first = get_page(self.organisms(), limit=3)
+        second = get_page(self.organisms(), limit=3, after=first.next_cursor)
+
+        previous = get_page(self.organisms(), limit=3, before=second.previous_cursor)
+
+        self.assertEqual(self.get_ids(previous), self.get_ids(first))
+        self.assertIsNone(previous.previous_cursor)
+        self.assertEqual(previous.next_cursor, first.next_cursor)
+
+    def test_keyset_page_filters(self):
+        page = Organism.objects.keyset_page(
+            limit=100,
+            collection=self.data.collection,
+            organism_type=self.data.organism_type)
+
+        self.assertEqual(self.get_ids(page), self.expected)
+        self.assertIsNone(page.next_cursor)
+
+    def test_empty_page(self):
+        page = get_page(self.organisms().none())
+
+        self.assertEqual(page.items, [])
+        self.assertIsNone(page.next_cursor)
+        self.assertIsNone(page.previous_cursor)
+
+    def test_cursor_round_trip(self):
+        created_on = timezone.now()
+
+        self.assertEqual(decode_cursor(encode_cursor(created_on, 42)), (created_on, 42))
+
+    def test_invalid_cursors(self):
+        with self.assertRaises(ValidationError):
+            get_page(self.organisms(), after='not a cursor')
+
+        with self.assertRaises(ValidationError):
+            get_page(self.organisms(), after='a', before='b')
@@ -0,0 +1,135 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from irekua_database.models import Collection
+from irekua_database.models import CollectionType
+from irekua_database.models import DeviceType
+from irekua_database.models import SamplingEvent
+from irekua_database.models import SamplingEventDevice
+from irekua_database.models import SamplingEventType
+from irekua_database.models import Term
+from irekua_database.models import TermType
+
+from irekua_organisms.benchmarks.fixtures import BenchmarkData
+from irekua_organisms.models import Organism
+from irekua_organisms.models import OrganismCapture
+from irekua_organisms.snapshots import clear_config_snapshots
+
+
+SMALL_SIZE = 1
+LARGE_SIZE = 50
+
+
+def list_organisms(queryset):
+    for organism in queryset:
+        list(organism.labels.all())
+        list(organism.items.all())
+
+
+def list_captures(queryset):
+    for capture in queryset:
+        list(capture.labels.all())
+        list(capture.items.all())
+
+
+def str_all(queryset):
+    for instance in queryset:
+        str(instance)
+
+
+def clean_all(queryset):
+    for instance in queryset:
+        instance.clean()
+
+
+class QuerysetPresetQueryCountTests(TestCase):
+    """Listing, str() and clean() on the queryset presets must use a
+    number of queries that does not depend on the number of rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        collection_type = CollectionType.objects.create(
+            name='query count collection type',
+            description='Collection type used in query count tests')
+        collection = Collection.objects.create(
+            collection_type=collection_type,
+            name='query count collection',
+            description='Collection used in query count tests')
+        sampling_event = SamplingEvent.objects.create(
+            sampling_event_type=SamplingEventType.objects.create(
+                name='query count sampling event type'),
+            collection=collection)
+        SamplingEventDevice.objects.create(sampling_event=sampling_event)
+
+        DeviceType.objects.create(
+            name='query count device type',
+            description='Device type used in query count tests')
+        Term.objects.create(
+            term_type=TermType.objects.create(
+                name='query count term type',
+                description='Term type used in query count tests',
+                is_categorical=True),
+            value='query count term')
+
+        cls.collection_id = collection.pk
+
+    def setUp(self):
+        self.data = BenchmarkData(collection=self.collection_id)
+        self.data.setup()
+
+    def grow(self, size):
+        # Configuration snapshots are cleared so that both runs load them.
+        self.data.grow(size)
+        clear_config_snapshots()
+
+    def assertConstantQueries(self, func):
+        self.grow(SMALL_SIZE)
+        with CaptureQueriesContext(connection) as context:
+            func()
+
+        self.grow(LARGE_SIZE)
+        with self.assertNumQueries(len(context.captured_queries)):
+            func()
+
+    def organisms(self):
+        return (
+            Organism.objects
+            .with_context()
+            .filter(organism_type=self.data.organism_type))
+
+    def captures(self):
+        return (
+            OrganismCapture.objects
+            .with_context()
+            .filter(organism_capture_type=self.data.capture_type))
+
+    def test_list_organisms(self):
+        self.assertConstantQueries(lambda: list_organisms(self.organisms()))
+
+    def test_str_organisms(self):
+        self.assertConstantQueries(lambda: str_all(self.organisms()))
+
+    def test_clean_organisms(self):
+        self.assertConstantQueries(lambda: clean_all(self.organisms()))
+
+    def test_list_organisms_with_labels_and_items(self):
+        self.assertConstantQueries(lambda: list_organisms(
+            Organism.objects
+            .with_labels_and_items()
+            .filter(organism_type=self.data.organism_type)))
+
+    def test_list_captures(self):
+        self.assertConstantQueries(lambda: list_captures(self.captures()))
+
+    def test_str_captures(self):
+        self.assertConstantQueries(lambda: str_all(self.captures()))
+
+    def test_clean_captures(self):
+        self.assertConstantQueries(lambda: clean_all(self.captures()))
+
+    def test_list_captures_with_labels_and_items(self):
+        self.assertConstantQueries(lambda: list_captures(
+            OrganismCapture.objects
+            .with_labels_and_items()
+            .filter(organism_capture_type=self.data.capture_type)))
@@ -0,0 +1,101 @@
+import os
+import json
+import shutil
+import tempfile
+
+from irekua_organisms.export import ORGANISMS
+from irekua_organisms.models import Organism
+from irekua_organisms.models import RevalidationJob
+from irekua_organisms.revalidation import get_stale_organisms
+from irekua_organisms.revalidation import iter_batches
+from irekua_organisms.revalidation import revalidate_organisms
+from irekua_organisms.revalidation import run_revalidation_job
+from irekua_organisms.revalidation import start_revalidation_job
+from irekua_organisms.tests.base import OrganismTestCase
+
+
+class RevalidationTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # Organisms created by the fixtures were never validated.
+        self.data.grow(5)
+        self.ids = list(
+            Organism.objects
+            .filter(organism_type=self.data.organism_type)
+            .order_by('id')
+            .values_list('id', flat=True))
+
+        self.tmp = tempfile.mkdtemp()
+        self.report_path = os.path.join(self.tmp, 'report.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        super().tearDown()
+
+    def stale_ids(self):
+        return list(
+            get_stale_organisms([self.data.organism_type.pk])
+            .order_by('id')
+            .values_list('id', flat=True))
+
+    def read_report(self):
+        with open(self.report_path, encoding='utf-8') as report:
+            return [json.loads(line) for line in report]
+
+    def test_iter_batches(self):
+        batches = list(iter_batches(
+            Organism.objects.filter(id__in=self.ids),
+            ('id',),
+            batch_size=2))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([row['id'] for batch in batches for row in batch], self.ids)
+
+    def test_iter_batches_after_last_id(self):
+        batches = iter_batches(
+            Organism.objects.filter(id__in=self.ids),
+            ('id',),
+            batch_size=2,
+            last_id=self.ids[2])
+
+        self.assertEqual([row['id'] for batch in batches for row in batch], self.ids[3:])
+
+    def test_revalidate_updates_valid_organisms(self):
+        self.assertEqual(self.stale_ids(), self.ids)
+
+        result = revalidate_organisms(Organism.objects.filter(id__in=self.ids), batch_size=2)
+
+        self.assertEqual(result.checked, 5)
+        self.assertEqual(result.updated, 5)
+        self.assertEqual(self.stale_ids(), [])
+
+    def test_job_reports_violations(self):
+        Organism.objects.filter(pk=self.ids[1]).update(identification_info={})
+        job = start_revalidation_job(ORGANISMS, self.report_path, [self.data.organism_type.pk])
+
+        run_revalidation_job(job, batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, RevalidationJob.FINISHED)
+        self.assertEqual((job.checked, job.updated, job.invalid), (5, 4, 1))
+        self.assertEqual(job.last_id, self.ids[-1])
+        self.assertEqual([line['id'] for line in self.read_report()], [self.ids[1]])
+        self.assertEqual(self.stale_ids(), [self.ids[1]])
+
+    def test_job_resumes_after_checkpoint(self):
+        Organism.objects.filter(pk=self.ids[3]).update(identification_info={})
+        job = start_revalidation_job(ORGANISMS, self.report_path, [self.data.organism_type.pk])
+
+        # An interrupted run that checked the first two organisms, and
+        # wrote part of a report line for a batch it did not commit.
+        job.checkpoint(self.ids[1], 2, 2, 0, 0)
+        with open(self.report_path, 'wb') as report:
+            report.write(b'{"id":')
+
+        run_revalidation_job(job, batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual((job.checked, job.updated, job.invalid), (5, 4, 1))
+        self.assertEqual([line['id'] for line in self.read_report()], [self.ids[3]])
+        self.assertEqual(self.stale_ids(), self.ids[:2] + [self.ids[3]])
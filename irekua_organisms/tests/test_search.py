@@ -0,0 +1,79 @@
+from irekua_organisms.models import Organism
+from irekua_organisms.models import OrganismType
+from irekua_organisms.search import search_types
+from irekua_organisms.search import update_search
+from irekua_organisms.tests.base import OrganismTestCase
+
+
+class OrganismSearchTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.jaguar = self.create_organism(
+            name='search jaguar',
+            remarks='Seen near the river')
+        self.ocelot = self.create_organism(
+            name='search ocelot',
+            remarks='Jaguar tracks nearby')
+        self.other = self.create_organism(name='search tapir')
+
+    def search(self, q):
+        return list(
+            Organism.objects
+            .filter(name__startswith='search')
+            .search(q)
+            .values_list('id', flat=True))
+
+    def test_matches_name_and_remarks(self):
+        self.assertEqual(set(self.search('jaguar')), {self.jaguar.pk, self.ocelot.pk})
+        self.assertEqual(self.search('river'), [self.jaguar.pk])
+        self.assertEqual(self.search('capybara'), [])
+
+    def test_labels_are_searchable(self):
+        self.assertEqual(self.search(self.data.term.value), [])
+
+        self.other.labels.add(self.data.term)
+
+        self.assertEqual(self.search(self.data.term.value), [self.other.pk])
+
+    def test_update_search_rebuilds_text(self):
+        Organism.objects.filter(pk=self.other.pk).update(remarks='Drinking at dusk')
+
+        updated = update_search(Organism.objects.filter(pk=self.other.pk))
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(self.search('dusk'), [self.other.pk])
+
+
+class TypeSearchTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.feline = OrganismType.objects.create(
+            name='search felinae',
+            description='Small wild cats of the Americas',
+            identification_info_schema={})
+        self.bird = OrganismType.objects.create(
+            name='search passeriformes',
+            description='Perching birds',
+            identification_info_schema={})
+
+    def search(self, q):
+        return list(
+            search_types(OrganismType.objects.filter(name__startswith='search'), q)
+            .values_list('id', flat=True))
+
+    def test_matches_name(self):
+        self.assertEqual(self.search('felinae'), [self.feline.pk])
+
+    def test_matches_description(self):
+        self.assertEqual(self.search('perching'), [self.bird.pk])
+        self.assertEqual(self.search('wild cats'), [self.feline.pk])
+
+    def test_trigram_contains_lookup(self):
+        self.assertEqual(
+            list(
+                OrganismType.objects
+                .filter(description__trigram_contains='WILD CA')
+                .values_list('id', flat=True)),
+            [self.feline.pk])
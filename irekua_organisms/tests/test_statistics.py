@@ -0,0 +1,150 @@
+from irekua_organisms.models import CollectionLabelCount
+from irekua_organisms.models import CollectionOrganismTypeCount
+from irekua_organisms.tests.base import OrganismTestCase
+from irekua_organisms.tests.base import create_collection
+from irekua_organisms.tests.base import create_term
+from irekua_organisms import statistics
+
+
+class StatisticsTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+
+        # Count the organisms and captures created by the fixtures too.
+        statistics.rebuild_statistics([self.data.collection])
+
+    def get_statistics(self, collection=None):
+        return statistics.get_collection_statistics(collection or self.data.collection)
+
+    def get_label_count(self, term, collection=None):
+        return (
+            CollectionLabelCount.objects
+            .filter(collection=collection or self.data.collection, term=term)
+            .values_list('organism_count', flat=True)
+            .first())
+
+    def test_create_and_delete_organisms(self):
+        before = self.get_statistics()
+
+        first = self.create_organism()
+        last = self.create_organism()
+
+        summary = self.get_statistics()
+        self.assertEqual(summary.organism_count, before.organism_count + 2)
+        self.assertEqual(summary.last_organism_on, last.created_on)
+
+        last.delete()
+
+        summary = self.get_statistics()
+        self.assertEqual(summary.organism_count, before.organism_count + 1)
+        self.assertEqual(summary.last_organism_on, first.created_on)
+
+    def test_delete_last_organism_of_type_removes_its_row(self):
+        from irekua_organisms.models import OrganismType
+
+        organism_type = OrganismType.objects.create(
+            name='statistics organism type',
+            description='Organism type used in statistics tests',
+            identification_info_schema={})
+        organism = self.create_organism(organism_type=organism_type)
+
+        self.assertEqual(
+            statistics.get_organism_type_counts(self.data.collection)[organism_type.pk],
+            1)
+
+        organism.delete()
+
+        self.assertFalse(
+            CollectionOrganismTypeCount.objects
+            .filter(collection=self.data.collection, organism_type=organism_type)
+            .exists())
+
+    def test_move_organism_between_collections(self):
+        other = create_collection(
+            'statistics other',
+            collection_type=self.data.collection.collection_type)
+        organism = self.create_organism()
+        organism.labels.add(self.data.term)
+        before = self.get_statistics()
+
+        organism.collection = other
+        organism.save()
+
+        self.assertEqual(self.get_statistics().organism_count, before.organism_count - 1)
+        self.assertEqual(self.get_statistics(other).organism_count, 1)
+        self.assertEqual(self.get_label_count(self.data.term, other), 1)
+
+    def test_label_counts(self):
+        term = create_term('statistics', term_type=self.data.term.term_type)
+        organism = self.create_organism()
+        distinct = self.get_statistics().distinct_label_count
+
+        organism.labels.add(term)
+        self.assertEqual(self.get_label_count(term), 1)
+        self.assertEqual(self.get_statistics().distinct_label_count, distinct + 1)
+
+        organism.labels.remove(term)
+        self.assertIsNone(self.get_label_count(term))
+        self.assertEqual(self.get_statistics().distinct_label_count, distinct)
+
+    def test_removing_unrelated_labels_keeps_counts(self):
+        term = create_term('statistics unrelated', term_type=self.data.term.term_type)
+        labeled = self.create_organism()
+        labeled.labels.add(term)
+        unlabeled = self.create_organism()
+
+        unlabeled.labels.remove(term)
+
+        self.assertEqual(self.get_label_count(term), 1)
+
+    def test_clear_labels_from_term(self):
+        term = create_term('statistics clear', term_type=self.data.term.term_type)
+        for unused in range(2):
+            self.create_organism().labels.add(term)
+        self.assertEqual(self.get_label_count(term), 2)
+
+        term.organism_set.clear()
+
+        self.assertIsNone(self.get_label_count(term))
+
+    def test_rebuild_matches_incremental_statistics(self):
+        organism = self.create_organism()
+        organism.labels.add(self.data.term)
+        self.create_capture(organism)
+        self.create_organism().delete()
+
+        incremental = self.get_statistics()
+        type_counts = statistics.get_organism_type_counts(self.data.collection)
+        capture_counts = statistics.get_capture_type_counts(self.data.collection)
+
+        statistics.rebuild_statistics([self.data.collection])
+
+        rebuilt = self.get_statistics()
+        for field in (
+                'organism_count',
+                'capture_count',
+                'distinct_label_count',
+                'first_organism_on',
+                'last_organism_on',
+                'first_capture_on',
+                'last_capture_on',
+                'change_version'):
+            self.assertEqual(getattr(rebuilt, field), getattr(incremental, field), field)
+
+        self.assertEqual(statistics.get_organism_type_counts(self.data.collection), type_counts)
+        self.assertEqual(statistics.get_capture_type_counts(self.data.collection), capture_counts)
+
+    def test_changes_increase_change_version(self):
+        version = self.get_statistics().change_version
+
+        organism = self.create_organism()
+        self.assertGreater(self.get_statistics().change_version, version)
+
+        version = self.get_statistics().change_version
+        organism.remarks = 'Updated remarks'
+        organism.save()
+        self.assertGreater(self.get_statistics().change_version, version)
+
+        version = self.get_statistics().change_version
+        organism.labels.add(self.data.term)
+        self.assertGreater(self.get_statistics().change_version, version)
@@ -0,0 +1,76 @@
+from django.test import override_settings
+
+from irekua_organisms.bulk import validation
+from irekua_organisms.bulk.organisms import OrganismBatchContext
+from irekua_organisms.bulk.validation import check_organism
+from irekua_organisms.bulk.validation import get_process_pool
+from irekua_organisms.bulk.validation import get_record_ids
+from irekua_organisms.bulk.validation import get_validation_workers
+from irekua_organisms.bulk.validation import shutdown_process_pool
+from irekua_organisms.bulk.validation import validate_records
+from irekua_organisms.tests.base import OrganismTestCase
+
+
+class ValidationPoolTests(OrganismTestCase):
+    def setUp(self):
+        super().setUp()
+
+        records = [
+            self.organism_record(),
+            self.organism_record(identification_info={}),
+            self.organism_record(additional_metadata={'count': -1}),
+            self.organism_record(),
+        ]
+        self.snapshot = OrganismBatchContext(records).snapshot
+        self.records = [
+            (index, get_record_ids(record))
+            for index, record in enumerate(records)]
+
+    def tearDown(self):
+        shutdown_process_pool()
+        super().tearDown()
+
+    def test_validates_in_process_by_default(self):
+        self.assertEqual(get_validation_workers(), 1)
+
+        errors = validate_records(check_organism, self.records, self.snapshot)
+
+        self.assertEqual(set(errors), {1, 2})
+        self.assertEqual(validation._pools, {})
+
+    @override_settings(IREKUA_ORGANISMS_VALIDATION_WORKERS=3)
+    def test_workers_setting(self):
+        self.assertEqual(get_validation_workers(), 3)
+
+    def test_workers_match_in_process_validation(self):
+        expected = validate_records(check_organism, self.records, self.snapshot, workers=1)
+
+        errors = validate_records(
+            check_organism,
+            self.records,
+            self.snapshot,
+            workers=2,
+            chunk_size=1)
+
+        self.assertEqual(errors, expected)
+        self.assertIn(2, validation._pools)
+
+    def test_pools_are_shared_by_worker_count(self):
+        pool = get_process_pool(2)
+
+        self.assertIs(get_process_pool(2), pool)
+
+        other = get_process_pool(3)
+        self.assertIsNot(other, pool)
+
+        # Asking for another worker count must not shut down the first pool.
+        self.assertEqual(pool.submit(abs, -1).result(), 1)
+        self.assertEqual(other.submit(abs, -2).result(), 2)
+
+    def test_shutdown_removes_all_pools(self):
+        get_process_pool(2)
+        get_process_pool(3)
+
+        shutdown_process_pool()
+
+        self.assertEqual(validation._pools, {})
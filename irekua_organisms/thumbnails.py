@@ -0,0 +1,164 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+
+DEFAULT_ICON_SIZES = {
+    'small': '32x32',
+    'medium': '64x64',
+    'large': '128x128',
+}
+DEFAULT_THUMBNAIL_OPTIONS = {
+    'crop': 'center',
+    'format': 'PNG',
+}
+DEFAULT_WORKERS = 4
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_icon_sizes():
+    return getattr(settings, 'IREKUA_ORGANISMS_ICON_SIZES', DEFAULT_ICON_SIZES)
+
+
+def get_thumbnail_options():
+    return getattr(settings, 'IREKUA_ORGANISMS_ICON_THUMBNAIL_OPTIONS', DEFAULT_THUMBNAIL_OPTIONS)
+
+
+def get_type_models():
+    from irekua_organisms.models import OrganismType
+    from irekua_organisms.models import OrganismCaptureType
+
+    return (OrganismType, OrganismCaptureType)
+
+
+def render_icon_thumbnails(icon):
+    """Generate the configured thumbnails of an icon.
+
+    Returns the URL and geometry of each size, so that changing the
+    geometry of a size can be detected later.
+    """
+    from sorl.thumbnail import get_thumbnail
+
+    if not icon:
+        return {}
+
+    options = get_thumbnail_options()
+    return {
+        size: {
+            'geometry': geometry,
+            'url': get_thumbnail(icon, geometry, **options).url,
+        }
+        for size, geometry in get_icon_sizes().items()}
+
+
+def get_thumbnail_url(thumbnails, size):
+    """Return the stored URL of an icon size, or None if not generated."""
+    thumbnail = (thumbnails or {}).get(size)
+    if not isinstance(thumbnail, dict):
+        return None
+
+    return thumbnail.get('url')
+
+
+def generate_icon_thumbnails(model, pk):
+    """Render the icon thumbnails of a type and store their URLs.
+
+    The URLs are written with an update query, so no signals are sent.
+    """
+    instance = model.objects.filter(pk=pk).only('id', 'icon').first()
+    if instance is None:
+        return {}
+
+    thumbnails = render_icon_thumbnails(instance.icon)
+    model.objects.filter(pk=pk).update(icon_thumbnails=thumbnails)
+    return thumbnails
+
+
+def generate_icon_thumbnails_safely(model, pk):
+    # Runs after the commit of the request that changed the icon, so a
+    # broken image must not fail that request.
+    try:
+        return generate_icon_thumbnails(model, pk)
+    except Exception:
+        logger.exception(
+            'Could not generate the icon thumbnails of %s %s',
+            model._meta.label,
+            pk)
+        return {}
+
+
+def schedule_icon_thumbnails(model, pk):
+    # Rendered after commit so the icon file and row are in place.
+    transaction.on_commit(lambda: generate_icon_thumbnails_safely(model, pk))
+
+
+def get_saved_fields(instance):
+    """Return the fields written by a regular save of a type.
+
+    icon_thumbnails is left out: it is only written by the thumbnail
+    functions, so that saving an instance loaded before they ran does
+    not restore the previous thumbnails.
+    """
+    return [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name != 'icon_thumbnails']
+
+
+def is_stale(icon, thumbnails):
+    if not icon:
+        return bool(thumbnails)
+
+    stored = {
+        size: thumbnail.get('geometry')
+        for size, thumbnail in (thumbnails or {}).items()
+        if isinstance(thumbnail, dict)}
+    return stored != get_icon_sizes()
+
+
+def warm_icon_thumbnails(models=None, workers=DEFAULT_WORKERS, force=False):
+    """Render missing icon thumbnails of all types in parallel.
+
+    Types whose stored thumbnails already match the configured sizes and
+    geometries are skipped unless force is set. Returns the number of
+    types rendered.
+    """
+    from irekua_organisms.asynchronous import call_with_connection
+
+    pending = []
+    for model in models or get_type_models():
+        for pk, icon, thumbnails in model.objects.values_list('id', 'icon', 'icon_thumbnails'):
+            if force or is_stale(icon, thumbnails):
+                pending.append((model, pk))
+
+    if not pending:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for unused in executor.map(
+                lambda task: call_with_connection(generate_icon_thumbnails, *task),
+                pending):
+            pass
+
+    return len(pending)
+
+
+def get_icon_urls(queryset, size):
+    """Map type ids to the stored URL of an icon size, in a single query.
+
+    Types without thumbnails fall back to the original icon URL, so
+    listings never render images.
+    """
+    storage = queryset.model._meta.get_field('icon').storage
+
+    urls = {}
+    for pk, icon, thumbnails in queryset.values_list('id', 'icon', 'icon_thumbnails'):
+        url = get_thumbnail_url(thumbnails, size)
+        if url is None and icon:
+            url = storage.url(icon)
+        urls[pk] = url
+
+    return urls
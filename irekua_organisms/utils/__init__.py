@@ -0,0 +1,36 @@
+from irekua_organisms.utils.json_schemas import validator_cache
+from irekua_organisms.utils.json_schemas import get_validator
+from irekua_organisms.utils.json_schemas import validate_cached_JSON_instance
+from irekua_organisms.utils.json_schemas import invalidate_validators
+from irekua_organisms.utils.term_types import get_allowed_term_types
+from irekua_organisms.utils.term_types import get_disallowed_terms
+from irekua_organisms.utils.term_types import invalidate_allowed_term_types
+from irekua_organisms.utils.validation import TypeSchema
+from irekua_organisms.utils.validation import validate_identification_info
+from irekua_organisms.utils.validation import validate_organism_metadata
+from irekua_organisms.utils.validation import validate_capture_metadata
+from irekua_organisms.utils.validation import get_error_messages
+from irekua_organisms.utils.fingerprints import get_organism_schema_version
+from irekua_organisms.utils.fingerprints import get_capture_schema_version
+from irekua_organisms.utils.fingerprints import get_organism_fingerprint
+from irekua_organisms.utils.fingerprints import get_capture_fingerprint
+
+
+__all__ = [
+    'validator_cache',
+    'get_validator',
+    'validate_cached_JSON_instance',
+    'invalidate_validators',
+    'get_allowed_term_types',
+    'get_disallowed_terms',
+    'invalidate_allowed_term_types',
+    'TypeSchema',
+    'validate_identification_info',
+    'validate_organism_metadata',
+    'validate_capture_metadata',
+    'get_error_messages',
+    'get_organism_schema_version',
+    'get_capture_schema_version',
+    'get_organism_fingerprint',
+    'get_capture_fingerprint',
+]
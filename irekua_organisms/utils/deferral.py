@@ -0,0 +1,25 @@
+import threading
+from contextlib import contextmanager
+
+
+_state = threading.local()
+
+
+@contextmanager
+def deferred_signals():
+    """Disable the app's signal driven bookkeeping in the current thread.
+
+    Used by bulk paths, which record statistics and changes once per
+    batch instead of once per row.
+    """
+    previous = signals_deferred()
+    _state.deferred = True
+
+    try:
+        yield
+    finally:
+        _state.deferred = previous
+
+
+def signals_deferred():
+    return getattr(_state, 'deferred', False)
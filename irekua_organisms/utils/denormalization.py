@@ -0,0 +1,169 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import OuterRef
+from django.db.models import Subquery
+
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def get_collection_subqueries(sampling_event_device_model):
+    devices = sampling_event_device_model.objects.filter(
+        pk=OuterRef('sampling_event_device'))
+
+    return dict(
+        collection=Subquery(
+            devices.values('sampling_event__collection')[:1]),
+        collection_type=Subquery(
+            devices.values('sampling_event__collection__collection_type')[:1]))
+
+
+def backfill_capture_collections(
+        queryset,
+        sampling_event_device_model,
+        batch_size=DEFAULT_BATCH_SIZE):
+    """Copy collection and collection type from the sampling event device.
+
+    Rows are updated with one UPDATE statement per range of primary keys
+    so that very large tables are not rewritten in a single statement.
+    Receives the model classes so it can be used from migrations.
+    """
+    values = get_collection_subqueries(sampling_event_device_model)
+    bounds = queryset.aggregate(first=Min('id'), last=Max('id'))
+
+    if bounds['first'] is None:
+        return 0
+
+    updated = 0
+    for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+        updated += (
+            queryset
+            .filter(id__gte=start, id__lt=start + batch_size)
+            .update(**values))
+
+    return updated
+
+
+def get_inconsistent_captures(queryset):
+    collection = F('sampling_event_device__sampling_event__collection')
+    collection_type = F('sampling_event_device__sampling_event__collection__collection_type')
+
+    return queryset.filter(
+        Q(collection__isnull=True) |
+        Q(collection_type__isnull=True) |
+        ~Q(collection=collection) |
+        ~Q(collection_type=collection_type))
+
+
+def get_moved_groups(queryset):
+    # Statistics groups of the captures, as used by the statistics module.
+    return {
+        (row['collection'], row['organism_capture_type']): (
+            row['count'],
+            row['first'],
+            row['last'])
+        for row in queryset
+        .order_by()
+        .values('collection', 'organism_capture_type')
+        .annotate(count=Count('id'), first=Min('created_on'), last=Max('created_on'))}
+
+
+def get_moved_labels(queryset):
+    # Label term ids of the captures by collection, once per capture.
+    from irekua_organisms.models import OrganismCapture
+
+    labels = {}
+    for collection_id, term_id, count in (
+            OrganismCapture.labels.through.objects
+            .filter(organismcapture__in=queryset.values('id'))
+            .order_by()
+            .values_list('organismcapture__collection', 'term')
+            .annotate(count=Count('id'))):
+        labels.setdefault(collection_id, []).extend([term_id] * count)
+
+    return labels
+
+
+def sync_capture_collections(
+        queryset,
+        collection_id,
+        collection_type_id,
+        batch_size=DEFAULT_BATCH_SIZE):
+    """Move captures to a collection and collection type.
+
+    Captures are moved in batches of primary keys. The capture
+    statistics of the collections that the captures leave and join are
+    updated, and an update of every moved capture is recorded in the
+    change feed. Returns the number of moved captures.
+    """
+    from irekua_organisms import changes
+    from irekua_organisms import statistics
+    from irekua_organisms.models import OrganismCapture
+    from irekua_organisms.models import OrganismChange
+
+    using = queryset.db
+    moved = (
+        queryset
+        .exclude(collection=collection_id, collection_type=collection_type_id)
+        .order_by('id')
+        .values_list('id', flat=True))
+
+    total = 0
+    last_id = None
+
+    with transaction.atomic(using=using):
+        while True:
+            ids = moved if last_id is None else moved.filter(id__gt=last_id)
+            ids = list(ids[:batch_size])
+            if not ids:
+                break
+
+            batch = OrganismCapture.objects.using(using).filter(id__in=ids)
+            leaving = batch.exclude(collection=collection_id)
+            groups = get_moved_groups(leaving)
+            labels = get_moved_labels(leaving)
+
+            batch.update(collection=collection_id, collection_type=collection_type_id)
+
+            if groups:
+                statistics.remove_captures(groups, using=using)
+
+                joining = {}
+                for (unused, capture_type_id), (count, first, last) in groups.items():
+                    key = (collection_id, capture_type_id)
+                    previous_count, previous_first, previous_last = joining.get(
+                        key, (0, None, None))
+                    joining[key] = (
+                        previous_count + count,
+                        *statistics.merge_range(previous_first, previous_last, first, last))
+                statistics.record_captures(joining, using=using)
+
+            for previous_id, term_ids in labels.items():
+                statistics.record_labels(
+                    previous_id,
+                    term_ids,
+                    statistics.CAPTURE_COUNT,
+                    delta=-1,
+                    using=using)
+                statistics.record_labels(
+                    collection_id,
+                    term_ids,
+                    statistics.CAPTURE_COUNT,
+                    using=using)
+
+            changes.record_changes(
+                OrganismCapture,
+                ids,
+                OrganismChange.UPDATE,
+                {'fields': ['collection', 'collection_type']},
+                collections=[collection_id, *(key[0] for key in groups)],
+                using=using)
+
+            total += len(ids)
+            last_id = ids[-1]
+
+    return total
@@ -0,0 +1,50 @@
+import json
+import hashlib
+
+from irekua_organisms.utils.json_schemas import schema_hash
+
+
+def get_fingerprint(*parts):
+    dump = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(dump.encode('utf-8')).hexdigest()
+
+
+def get_link_version(link):
+    if link is None:
+        return None
+
+    return [link.id, schema_hash(link.metadata_schema)]
+
+
+def get_organism_schema_version(organism_config, organism_type):
+    """Hash what organism validation depends on besides the record data.
+
+    This covers the organism type schema and the organism configuration
+    of the collection type, so any change to them changes the version.
+    """
+    return get_fingerprint(
+        organism_config.use_organisms,
+        schema_hash(organism_type.schema),
+        get_link_version(organism_config.organism_types.get(organism_type.pk)))
+
+
+def get_capture_schema_version(organism_config, capture_type_id):
+    return get_fingerprint(
+        organism_config.use_organisms,
+        get_link_version(organism_config.capture_types.get(capture_type_id)))
+
+
+def get_organism_fingerprint(
+        organism_type_id,
+        collection_type_id,
+        identification_info,
+        additional_metadata):
+    return get_fingerprint(
+        organism_type_id,
+        collection_type_id,
+        identification_info,
+        additional_metadata)
+
+
+def get_capture_fingerprint(capture_type_id, collection_type_id, additional_metadata):
+    return get_fingerprint(capture_type_id, collection_type_id, additional_metadata)
@@ -0,0 +1,120 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from jsonschema.validators import validator_for
+from jsonschema.exceptions import best_match
+
+
+DEFAULT_VALIDATOR_CACHE_SIZE = 1024
+
+
+def schema_hash(schema):
+    dump = json.dumps(schema, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(dump.encode('utf-8')).hexdigest()
+
+
+def compile_schema(schema):
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+class ValidatorCache:
+    """Process wide LRU cache of compiled JSON Schema validators.
+
+    Validators are keyed by (model label, primary key, schema hash) so
+    that unsaved changes to a schema never reuse a stale validator.
+    """
+
+    def __init__(self, maxsize=None):
+        self._maxsize = maxsize
+        self._validators = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        if self._maxsize is not None:
+            return self._maxsize
+
+        return getattr(
+            settings,
+            'IREKUA_ORGANISMS_VALIDATOR_CACHE_SIZE',
+            DEFAULT_VALIDATOR_CACHE_SIZE)
+
+    def __len__(self):
+        return len(self._validators)
+
+    def get(self, model, pk, schema):
+        key = (model, pk, schema_hash(schema))
+
+        with self._lock:
+            try:
+                validator = self._validators[key]
+                self._validators.move_to_end(key)
+                self.hits += 1
+                return validator
+            except KeyError:
+                self.misses += 1
+
+        validator = compile_schema(schema)
+
+        with self._lock:
+            self._validators[key] = validator
+            self._validators.move_to_end(key)
+
+            while len(self._validators) > self.maxsize:
+                self._validators.popitem(last=False)
+
+        return validator
+
+    def invalidate(self, model, pk=None):
+        with self._lock:
+            keys = [
+                key for key in self._validators
+                if key[0] == model and (pk is None or key[1] == pk)]
+
+            for key in keys:
+                del self._validators[key]
+
+    def clear(self):
+        with self._lock:
+            self._validators.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+validator_cache = ValidatorCache()
+
+
+def get_validator(instance, field):
+    return validator_cache.get(
+        instance._meta.label_lower,
+        instance.pk,
+        getattr(instance, field))
+
+
+def validate_JSON_instance(validator, instance):
+    error = best_match(validator.iter_errors(instance))
+
+    if error is not None:
+        msg = _('JSON is invalid according to schema. Error: %(error)s')
+        params = dict(error=error.message)
+        raise ValidationError(msg, params=params)
+
+
+def validate_cached_JSON_instance(model_instance, field, instance):
+    validator = get_validator(model_instance, field)
+    validate_JSON_instance(validator, instance)
+
+
+def invalidate_validators(model_instance):
+    validator_cache.invalidate(
+        model_instance._meta.label_lower,
+        model_instance.pk)
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+class PostgreSQLOnlyMixin:
+    """Apply a schema operation only when running on PostgreSQL.
+
+    The migration state is always updated, so models may declare
+    PostgreSQL specific indexes while the app still migrates on other
+    backends used for development.
+    """
+
+    def allowed(self, schema_editor):
+        return schema_editor.connection.vendor == 'postgresql'
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if self.allowed(schema_editor):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if self.allowed(schema_editor):
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class PostgreSQLAddIndex(PostgreSQLOnlyMixin, migrations.AddIndex):
+    pass
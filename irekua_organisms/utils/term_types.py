@@ -0,0 +1,104 @@
+import time
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from irekua_database.models import Term
+
+
+CACHE_KEY = 'irekua_organisms:allowed_term_types:{}:{}'
+DEFAULT_TIMEOUT = 60.0
+
+
+_allowed_term_types = {}
+_lock = threading.Lock()
+
+
+def get_local_timeout():
+    return getattr(
+        settings,
+        'IREKUA_ORGANISMS_TERM_TYPES_TIMEOUT',
+        DEFAULT_TIMEOUT)
+
+
+def get_allowed_term_types(instance):
+    """Return the set of term type ids allowed by an organism or capture type.
+
+    Sets are kept in the Django cache named by the
+    IREKUA_ORGANISMS_CONFIG_CACHE setting when it is set, so that every
+    process sees invalidations made by the others. Otherwise they are
+    kept in process memory for at most
+    IREKUA_ORGANISMS_TERM_TYPES_TIMEOUT seconds, which bounds how long
+    other processes may use the previous term types.
+    """
+    from irekua_organisms.snapshots import get_shared_cache
+
+    key = CACHE_KEY.format(instance._meta.label_lower, instance.pk)
+    shared_cache = get_shared_cache()
+
+    if shared_cache is not None:
+        allowed = shared_cache.get(key)
+    else:
+        with _lock:
+            allowed, expires_at = _allowed_term_types.get(key, (None, None))
+
+        if allowed is not None and expires_at <= time.monotonic():
+            allowed = None
+
+    if allowed is not None:
+        return allowed
+
+    allowed = frozenset(instance.term_types.values_list('id', flat=True))
+
+    if shared_cache is not None:
+        shared_cache.set(key, allowed, timeout=None)
+    else:
+        with _lock:
+            _allowed_term_types[key] = (allowed, time.monotonic() + get_local_timeout())
+
+    return allowed
+
+
+def invalidate_allowed_term_types(model, pks):
+    from irekua_organisms.snapshots import get_shared_cache
+
+    keys = [CACHE_KEY.format(model._meta.label_lower, pk) for pk in pks]
+
+    with _lock:
+        for key in keys:
+            _allowed_term_types.pop(key, None)
+
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete_many(keys)
+
+
+def get_disallowed_terms(instance, terms):
+    """Return the terms whose type is not allowed by the given type.
+
+    Terms can be given as instances or primary keys. All terms given by
+    primary key are fetched, together with their types, in a single
+    query. Raises ValidationError if any of them does not exist.
+    """
+    allowed = get_allowed_term_types(instance)
+
+    loaded = [term for term in terms if isinstance(term, Term)]
+    term_ids = [term for term in terms if not isinstance(term, Term)]
+
+    if term_ids:
+        fetched = list(
+            Term.objects
+            .filter(id__in=term_ids)
+            .select_related('term_type'))
+
+        missing = set(term_ids).difference(term.pk for term in fetched)
+        if missing:
+            msg = _('Terms %(terms)s do not exist')
+            params = dict(terms=', '.join(str(pk) for pk in sorted(missing)))
+            raise ValidationError(msg % params)
+
+        loaded.extend(fetched)
+
+    return [term for term in loaded if term.term_type_id not in allowed]
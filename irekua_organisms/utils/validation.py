@@ -0,0 +1,79 @@
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.utils.translation import gettext_lazy as _
+
+from irekua_organisms.utils.json_schemas import validator_cache
+from irekua_organisms.utils.json_schemas import validate_JSON_instance
+
+
+ORGANISM_TYPE = 'irekua_organisms.organismtype'
+ORGANISM_TYPE_LINK = 'irekua_organisms.collectiontypeorganismtype'
+CAPTURE_TYPE_LINK = 'irekua_organisms.collectiontypeorganismcapturetype'
+
+
+# Plain stand-in for an organism or capture type, holding only what is
+# needed to validate records against it.
+TypeSchema = namedtuple('TypeSchema', ['pk', 'name', 'schema'])
+
+
+def validate_schema_instance(model, pk, schema, instance):
+    validator = validator_cache.get(model, pk, schema)
+    validate_JSON_instance(validator, instance)
+
+
+def validate_identification_info(organism_type, id_info):
+    try:
+        validate_schema_instance(
+            ORGANISM_TYPE,
+            organism_type.pk,
+            organism_type.schema,
+            id_info)
+    except ValidationError as error:
+        msg = _(
+            'Invalid identification information for organism '
+            'type %(type)s. Error: %(error)s')
+        params = dict(type=organism_type.name, error=', '.join(error.messages))
+        raise ValidationError(msg, params=params)
+
+
+def validate_organism_metadata(type_link, organism_type, metadata):
+    try:
+        validate_schema_instance(
+            ORGANISM_TYPE_LINK,
+            type_link.id,
+            type_link.metadata_schema,
+            metadata)
+    except ValidationError as error:
+        msg = _(
+            'Invalid additional metadata for organism '
+            'type %(type)s. Error: %(error)s')
+        params = dict(type=organism_type.name, error=', '.join(error.messages))
+        raise ValidationError(msg, params=params)
+
+
+def validate_capture_metadata(type_link, capture_type, metadata):
+    try:
+        validate_schema_instance(
+            CAPTURE_TYPE_LINK,
+            type_link.id,
+            type_link.metadata_schema,
+            metadata)
+    except ValidationError as error:
+        msg = _(
+            'Invalid additional metadata for organism capture '
+            'type %(type)s. Error: %(error)s')
+        params = dict(type=capture_type.name, error=', '.join(error.messages))
+        raise ValidationError(msg, params=params)
+
+
+def get_error_messages(error):
+    """Return the messages of a validation error keyed by field."""
+    if not isinstance(error, ValidationError):
+        error = ValidationError(error)
+
+    if hasattr(error, 'error_dict'):
+        return error.message_dict
+
+    return {NON_FIELD_ERRORS: error.messages}